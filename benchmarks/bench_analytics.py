@@ -0,0 +1,64 @@
+"""Compare the vectorized and pure Python replay analytics.
+
+Run from the repository root (the vectorized path needs numpy):
+
+    python benchmarks/bench_analytics.py [--players 2] [--rounds 10] [--steps 2000] [--duels 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_memory import replay_datas  # noqa: E402
+
+from geoguessr_async.analytics import np, replay_metrics  # noqa: E402
+from geoguessr_async.models import GeoguessrDuelData, GeoguessrDuelReplayColumns  # noqa: E402
+
+
+def build_duel(players: int, rounds: int, steps: int) -> GeoguessrDuelData:
+    """Build a duel whose replays are already parsed in columns."""
+    duel = GeoguessrDuelData(
+        {
+            "gameId": "bench",
+            "currentRoundNumber": rounds,
+            "teams": [{"players": [{"playerId": f"p{i}"}]} for i in range(players)],
+        }
+    )
+    datas = replay_datas(steps)
+    duel.replays = {playerId: [GeoguessrDuelReplayColumns(datas) for _ in range(rounds)] for playerId in duel.playersId}
+    return duel
+
+
+def timed(duels: list[GeoguessrDuelData], vectorized: bool) -> float:
+    start = time.perf_counter()
+    for duel in duels:
+        replay_metrics(duel, vectorized=vectorized)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--steps", type=int, default=2000, help="Steps per replay")
+    parser.add_argument("--duels", type=int, default=20)
+    args = parser.parse_args()
+
+    duels = [build_duel(args.players, args.rounds, args.steps) for _ in range(args.duels)]
+    totalSteps = args.duels * args.players * args.rounds * args.steps
+    print(f"duels: {args.duels}, steps: {totalSteps}")
+    python = timed(duels, vectorized=False)
+    print(f"pure Python:  {python:.3f} s ({totalSteps / python / 1e6:.2f} M steps/s)")
+    if np is None:
+        print("numpy is not installed, skipping the vectorized path")
+        return
+    vectorized = timed(duels, vectorized=True)
+    print(f"numpy:        {vectorized:.3f} s ({totalSteps / vectorized / 1e6:.2f} M steps/s)")
+    print(f"speedup:      {python / vectorized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare the timestamp parsing of gu.datetime_or_none with the former strptime parsing.
+
+Run from the repository root:
+
+    python benchmarks/bench_datetime.py [--number 200000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import geoguessr_async.geo_utils as gu  # noqa: E402
+
+TIMESTAMPS = ["2024-05-01T12:30:00.123Z", "2024-05-01T12:30:00.1234567Z", "2024-05-01T12:30:00.123456+00:00"]
+
+
+def strptime_parse(value: str) -> datetime:
+    """The parsing used before, which drops the fraction and the time zone."""
+    return datetime.strptime(value.split(".")[0], "%Y-%m-%dT%H:%M:%S")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000, help="Parses per timestamp format")
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}, {args.number} parses per format")
+    for timestamp in TIMESTAMPS:
+        before = timeit.timeit(lambda: strptime_parse(timestamp), number=args.number)
+        after = timeit.timeit(lambda: gu.datetime_or_none(timestamp), number=args.number)
+        print(
+            f"{timestamp:<32} strptime {before / args.number * 1e6:6.2f} us   "
+            f"datetime_or_none {after / args.number * 1e6:6.2f} us   {before / after:5.1f}x"
+        )
+        print(f"{'':<32} -> {gu.datetime_or_none(timestamp)!r}")
+    normalized = "2024-05-01T12:30:00.1234567Z"
+    fallback = timeit.timeit(lambda: datetime.fromisoformat(gu._normalize_iso(normalized)), number=args.number)
+    print(f"normalized fallback (Python < 3.11 path): {fallback / args.number * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
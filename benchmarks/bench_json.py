@@ -0,0 +1,40 @@
+"""Compare the JSON backends decoding a duel replay body.
+
+Run from the repository root:
+
+    python benchmarks/bench_json.py [--steps 2000] [--number 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_memory import replay_datas  # noqa: E402
+
+from geoguessr_async import json_backend  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=2000, help="Number of replay steps in the body")
+    parser.add_argument("--number", type=int, default=200, help="Decodes per backend")
+    args = parser.parse_args()
+
+    body = json.dumps(replay_datas(args.steps)).encode()
+    print(f"body: {len(body) / 1024:.0f} KiB, {args.number} decodes per backend")
+    # The former path: aiohttp's r.json() decodes the bytes to str, then json.loads parses it
+    baseline = timeit.timeit(lambda: json.loads(body.decode("utf-8")), number=args.number)
+    print(f"{'json (via str)':<16} {baseline / args.number * 1e3:7.2f} ms")
+    for backend in json_backend.available_backends():
+        loads = json_backend.get_loads(backend)
+        assert loads(body) == json.loads(body)
+        elapsed = timeit.timeit(lambda: loads(body), number=args.number)
+        print(f"{backend:<16} {elapsed / args.number * 1e3:7.2f} ms   {baseline / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
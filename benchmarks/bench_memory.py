@@ -0,0 +1,101 @@
+"""Measure the memory used by parsed duel replays.
+
+The models are compared with unslotted copies of the replay step and payload classes, whose
+instances hold their attributes in a per-instance __dict__ as the models did before __slots__.
+
+Run from the repository root:
+
+    python benchmarks/bench_memory.py [--steps 100000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from geoguessr_async.models import (  # noqa: E402
+    REPLAY_PAYLOAD_TYPES,
+    GeoguessrDuelReplay,
+    GeoguessrDuelReplayColumns,
+)
+
+STEP_TEMPLATES = [
+    {"type": "PanoPosition", "payload": {"lat": 48.85, "lng": 2.35, "panoId": "pano"}},
+    {"type": "PanoPov", "payload": {"heading": 120.5, "pitch": -3.2}},
+    {"type": "PanoZoom", "payload": {"zoom": 1.5}},
+    {"type": "MapZoom", "payload": {"zoom": 4}},
+    {"type": "MapPosition", "payload": {"lat": 45.1, "lng": 3.2}},
+    {"type": "PinPosition", "payload": {"lat": 45.0, "lng": 3.0}},
+    {"type": "Timer", "payload": {"time": 15}},
+    {"type": "MapDisplay", "payload": {"isActive": True, "isSticky": False, "size": 2}},
+    {"type": "GuessWithLatLng", "payload": {"lat": 45.0, "lng": 3.0}},
+]
+
+
+def unslotted(cls: type) -> type:
+    """Copy a model class without __slots__, so that its instances store their attributes in a __dict__."""
+    return type(f"Unslotted{cls.__name__}", (), {"__init__": cls.__init__})
+
+
+UNSLOTTED_PAYLOAD_TYPES = {stepType: unslotted(payloadType) for stepType, payloadType in REPLAY_PAYLOAD_TYPES.items()}
+
+
+class UnslottedReplayStep:
+    """GeoguessrDuelReplayStep without __slots__, the baseline of the comparison."""
+
+    def __init__(self, datas: dict) -> None:
+        self.time = datetime.fromtimestamp(float(datas.get("time")) / 1000, tz=timezone.utc)
+        self.type = GeoguessrDuelReplay.Type(datas.get("type"))
+        payloadType = UNSLOTTED_PAYLOAD_TYPES.get(self.type)
+        self.payload = None if payloadType is None else payloadType(datas.get("payload") or {})
+
+
+class UnslottedReplay:
+    """GeoguessrDuelReplay without __slots__, built of UnslottedReplayStep objects."""
+
+    def __init__(self, datas: list) -> None:
+        self.datas = [UnslottedReplayStep(step) for step in datas]
+
+
+def replay_datas(steps: int) -> list[dict]:
+    """Build the raw JSON of a replay with `steps` steps cycling over every step type."""
+    return [{"time": 1700000000000 + i * 250, **STEP_TEMPLATES[i % len(STEP_TEMPLATES)]} for i in range(steps)]
+
+
+def measure(steps: int, replayType: type = GeoguessrDuelReplay) -> tuple[int, int]:
+    """Parse a replay and measure the memory held by the parsed objects.
+
+    Returns:
+        tuple[int, int]: The bytes allocated by the parsed replay and its peak during parsing.
+    """
+    datas = replay_datas(steps)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    replay = replayType(datas)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(replay.datas) == steps
+    return current - before, peak - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=100_000, help="Number of replay steps to parse")
+    args = parser.parse_args()
+
+    print(f"replay steps: {args.steps}")
+    for replayType in (UnslottedReplay, GeoguessrDuelReplay, GeoguessrDuelReplayColumns):
+        allocated, peak = measure(args.steps, replayType)
+        print(f"{replayType.__name__}:")
+        print(f"    allocated:           {allocated / 1024 / 1024:.1f} MiB")
+        print(f"    peak while parsing:  {peak / 1024 / 1024:.1f} MiB")
+        print(f"    bytes per step:      {allocated / args.steps:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare the vectorized and pure Python re-scoring of guesses.
+
+Run from the repository root (the vectorized path needs numpy):
+
+    python benchmarks/bench_scoring.py [--guesses 50000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import geoguessr_async.geo_utils as gu  # noqa: E402
+
+WORLD_MAX_ERROR_DISTANCE = 14916862
+
+
+def random_points(count: int) -> list[dict]:
+    """Build random locations in the raw {'lat', 'lng'} form of the API."""
+    return [{"lat": random.uniform(-80, 80), "lng": random.uniform(-180, 180)} for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guesses", type=int, default=50_000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    guesses = random_points(args.guesses)
+    locations = random_points(args.guesses)
+    print(f"guesses: {args.guesses}")
+
+    start = time.perf_counter()
+    python = gu.score_batch(guesses, locations, WORLD_MAX_ERROR_DISTANCE, vectorized=False)
+    pythonTime = time.perf_counter() - start
+    print(f"pure Python:  {pythonTime:.3f} s")
+    if gu.np is None:
+        print("numpy is not installed, skipping the vectorized path")
+        return
+    start = time.perf_counter()
+    vectorized = gu.score_batch(guesses, locations, WORLD_MAX_ERROR_DISTANCE, vectorized=True)
+    vectorizedTime = time.perf_counter() - start
+    print(f"numpy:        {vectorizedTime:.3f} s")
+    print(f"speedup:      {pythonTime / vectorizedTime:.1f}x")
+    print(f"same scores:  {python == vectorized}")
+
+    # Points already held as columns, as in a GeoguessrDuelReplayColumns, skip the per-point extraction
+    guessColumns = tuple(gu.np.array([point[key] for point in guesses]) for key in ("lat", "lng"))
+    locationColumns = tuple(gu.np.array([point[key] for point in locations]) for key in ("lat", "lng"))
+    start = time.perf_counter()
+    columns = gu.score_batch(guessColumns, locationColumns, WORLD_MAX_ERROR_DISTANCE, vectorized=True)
+    columnsTime = time.perf_counter() - start
+    print(f"columns:      {columnsTime:.3f} s")
+    print(f"speedup:      {pythonTime / columnsTime:.1f}x")
+    print(f"same scores:  {python == columns}")
+
+
+if __name__ == "__main__":
+    main()
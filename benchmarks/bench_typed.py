@@ -0,0 +1,86 @@
+"""Compare building duel replays from dicts with the typed msgspec decoding of geoguessr_async.schemas.
+
+The decoding is timed on a body in memory, then through the client: get_duel_info against the local
+mock API server, with and without typedReplays, so the client fetcher and the HTTP round trips count.
+
+Run from the repository root:
+
+    python benchmarks/bench_typed.py [--steps 20000] [--number 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_memory import replay_datas  # noqa: E402
+
+import geoguessr_async.geo_utils as gu  # noqa: E402
+from geoguessr_async import Geoguessr, json_backend, schemas  # noqa: E402
+from geoguessr_async.models import GeoguessrDuelReplay, GeoguessrDuelReplayColumns  # noqa: E402
+from tests.mock_server import MockFixtures, MockGeoguessrServer  # noqa: E402
+
+
+async def bench_client(steps: int, number: int) -> None:
+    """Time get_duel_info on a one round duel whose two replays have `steps` steps each."""
+    fixtures = MockFixtures(roundCount=1, replaySteps=steps)
+    # Serve stored responses, so the server does not rebuild the replays for each request
+    duel = fixtures.duel("duel")
+    fixtures.recorded["/api/duels/duel"] = duel
+    for playerId in fixtures.duel_players("duel"):
+        fixtures.recorded[f"/api/replays/{playerId}/duel/1"] = fixtures.replay(playerId, "duel", 1)
+    async with MockGeoguessrServer(fixtures) as server:
+        plain = Geoguessr("benchmark", baseUrls=server.base_urls())
+        typed = Geoguessr("benchmark", baseUrls=server.base_urls(), typedReplays=True)
+        for columnar in (False, True):
+            timings = {}
+            for name, client in (("from dicts", plain), ("typed", typed)):
+                await client.get_duel_info("duel", columnarReplays=columnar)  # Warm up the connections
+                start = time.perf_counter()
+                for _ in range(number):
+                    await client.get_duel_info("duel", columnarReplays=columnar)
+                timings[name] = (time.perf_counter() - start) / number
+            before, after = timings["from dicts"], timings["typed"]
+            print(f"get_duel_info, {'GeoguessrDuelReplayColumns' if columnar else 'GeoguessrDuelReplay'}:")
+            print(f"    from dicts:  {before * 1e3:7.1f} ms")
+            print(f"    typed:       {after * 1e3:7.1f} ms   {before / after:4.1f}x")
+        await plain.close()
+        await typed.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=20_000, help="Number of replay steps in the body")
+    parser.add_argument("--number", type=int, default=10, help="Decodes per path")
+    args = parser.parse_args()
+
+    body = json.dumps(replay_datas(args.steps)).encode()
+    print(f"replay steps: {args.steps}, body: {len(body) / 1024:.0f} KiB")
+    for name, fromDicts, typed in (
+        (
+            "GeoguessrDuelReplay",
+            lambda: GeoguessrDuelReplay(gu.decode_big_numbers(json_backend.loads(body))),
+            lambda: schemas.decode_replay(body),
+        ),
+        (
+            "GeoguessrDuelReplayColumns",
+            lambda: GeoguessrDuelReplayColumns(gu.decode_big_numbers(json_backend.loads(body))),
+            lambda: schemas.decode_replay_columns(body),
+        ),
+    ):
+        assert fromDicts().to_tree() == typed().to_tree()
+        before = timeit.timeit(fromDicts, number=args.number) / args.number
+        after = timeit.timeit(typed, number=args.number) / args.number
+        print(f"{name}:")
+        print(f"    from dicts:  {before * 1e3:7.1f} ms")
+        print(f"    typed:       {after * 1e3:7.1f} ms   {before / after:4.1f}x")
+    asyncio.run(bench_client(args.steps, args.number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Fixtures of the pytest-benchmark suite.
+
+Run from the repository root, with `pip install geoguessr_async[bench]`:
+
+    python -m pytest benchmarks --benchmark-only [--benchmark-autosave] [--benchmark-compare]
+
+The fixtures come from the mock API server of the tests, sized like large real responses.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from geoguessr_async import Geoguessr  # noqa: E402
+from tests.mock_server import MockFixtures, MockGeoguessrServer  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def fixtures() -> MockFixtures:
+    """Fixtures sized like large responses: long duels and replays, full leaderboards and clubs, a long feed."""
+    return MockFixtures(feedEntries=5000, highscores=500, roundCount=20, replaySteps=500, clubMembers=500)
+
+
+class LiveClient:
+    """A client and the mock server it talks to, running on their own event loop."""
+
+    def __init__(self, fixtures: MockFixtures) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.server = MockGeoguessrServer(fixtures)
+        self.loop.run_until_complete(self.server.start())
+        self.geoguessr = Geoguessr("benchmark", baseUrls=self.server.base_urls())
+
+    def run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def close(self) -> None:
+        self.run(self.geoguessr.close())
+        self.run(self.server.close())
+        self.loop.close()
+
+
+@pytest.fixture(scope="module")
+def live(fixtures: MockFixtures):
+    client = LiveClient(fixtures)
+    yield client
+    client.close()
@@ -0,0 +1,114 @@
+"""Load test the client against the local mock API server, reporting throughput and tail latency.
+
+Run from the repository root:
+
+    python benchmarks/load_test.py [--scenario mixed] [--calls 500] [--concurrency 50]
+        [--latency 0.02] [--error-rate 0.01] [--rate-limit-rate 0.02]
+
+Every call uses a different resource, so the cache and the request coalescing never hide a request.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from geoguessr_async import Geoguessr  # noqa: E402
+from geoguessr_async.instrumentation import HistogramExporter  # noqa: E402
+from geoguessr_async.ratelimit import RetryPolicy  # noqa: E402
+from tests.mock_server import MockFixtures, MockGeoguessrServer  # noqa: E402
+
+SCENARIOS = {
+    "club": lambda geoguessr, i: geoguessr.get_club_info(f"club-{i}"),
+    "user": lambda geoguessr, i: geoguessr.get_user_infos(f"user-{i}", withStats=False),
+    "challenge": lambda geoguessr, i: geoguessr.get_challenge_score(f"https://www.geoguessr.com/challenge/c{i}"),
+    "duel": lambda geoguessr, i: geoguessr.get_duel_info(f"duel-{i}"),
+}
+
+
+def scenario_call(scenario: str, geoguessr: Geoguessr, i: int):
+    if scenario == "mixed":
+        scenario = list(SCENARIOS)[i % len(SCENARIOS)]
+    return SCENARIOS[scenario](geoguessr, i)
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    fixtures = MockFixtures(highscores=args.highscores, replaySteps=args.replay_steps)
+    latency = (args.latency / 2, args.latency * 1.5) if args.latency else 0.0
+    server = MockGeoguessrServer(
+        fixtures, latency=latency, errorRate=args.error_rate, rateLimitRate=args.rate_limit_rate, seed=args.seed
+    )
+    await server.start()
+    exporter = HistogramExporter()
+    geoguessr = Geoguessr(
+        "load_test",
+        baseUrls=server.base_urls(),
+        retryPolicy=RetryPolicy(maxRetries=args.retries, baseDelay=0.01),
+        requestHooks=[exporter],
+    )
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    failures: dict[str, int] = {}
+
+    async def call(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await scenario_call(args.scenario, geoguessr, i)
+            except Exception as e:
+                failures[type(e).__name__] = failures.get(type(e).__name__, 0) + 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    try:
+        await scenario_call(args.scenario, geoguessr, -1)  # Warm up the connection pool
+        server.requests.clear()
+        server.statuses.clear()
+        exporter.reset()
+        start = time.perf_counter()
+        await asyncio.gather(*(call(i) for i in range(args.calls)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await geoguessr.close()
+        await server.close()
+
+    print(f"scenario {args.scenario}: {args.calls} calls, concurrency {args.concurrency}, {elapsed:.2f}s")
+    print(f"throughput: {args.calls / elapsed:.1f} calls/s, {len(server.requests) / elapsed:.1f} HTTP requests/s")
+    if latencies:
+        print(
+            f"latency: mean {statistics.mean(latencies) * 1e3:.1f} ms, "
+            + ", ".join(f"p{q} {percentile(latencies, q) * 1e3:.1f} ms" for q in (50, 95, 99))
+        )
+    print(f"server statuses: {dict(sorted(server.statuses.items()))}")
+    if failures:
+        print(f"failed calls: {failures}")
+    print()
+    print(exporter.report())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=[*SCENARIOS, "mixed"], default="mixed", help="The client call to load")
+    parser.add_argument("--calls", type=int, default=500, help="Number of client calls")
+    parser.add_argument("--concurrency", type=int, default=50, help="Client calls running at once")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mean server latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with HTTP 429")
+    parser.add_argument("--retries", type=int, default=4, help="Retries of the client's retry policy")
+    parser.add_argument("--highscores", type=int, default=120, help="Results of each challenge leaderboard")
+    parser.add_argument("--replay-steps", type=int, default=200, help="Steps of each duel replay")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the latency and fault draws")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
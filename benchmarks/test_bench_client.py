@@ -0,0 +1,32 @@
+"""End-to-end benchmarks of the client against the local mock API server.
+
+The responses go over HTTP on localhost without latency, so these measure the client: requests,
+decoding, pagination and model building. The cache is disabled and every round requests the API.
+"""
+
+
+def test_ranked_duel_activity(benchmark, live):
+    """Fetch and filter a 5000 entry feed, 5 pages."""
+
+    def ranked_duels():
+        live.geoguessr.activities = None
+        return live.run(live.geoguessr.get_ranked_duel_activities())
+
+    duels = benchmark.pedantic(ranked_duels, rounds=10, warmup_rounds=1)
+    assert len(duels) == 1667
+
+
+def test_challenge_score(benchmark, live):
+    """Fetch a 500 result leaderboard, 20 pages."""
+    results = benchmark.pedantic(
+        lambda: live.run(live.geoguessr.get_challenge_score("https://www.geoguessr.com/challenge/bench")),
+        rounds=10,
+        warmup_rounds=1,
+    )
+    assert len(results) == 500
+
+
+def test_duel_info(benchmark, live):
+    """Fetch a 20 round duel and its 40 replays of 500 steps."""
+    duel = benchmark.pedantic(lambda: live.run(live.geoguessr.get_duel_info("duel-bench")), rounds=10, warmup_rounds=1)
+    assert len(duel.replays["duel-bench-p1"]) == 20
@@ -0,0 +1,61 @@
+"""Benchmarks of the model constructors and of their text rendering."""
+
+import io
+
+import pytest
+
+from geoguessr_async.models import GeoguessrChallengeResult, GeoguessrClub, GeoguessrDuelData, GeoguessrStats
+
+
+@pytest.fixture(scope="module")
+def duel(fixtures):
+    return fixtures.duel("duel-bench")
+
+
+@pytest.fixture(scope="module")
+def highscores(fixtures):
+    return fixtures.highscores_page("challenge-bench", 100, None)["items"]
+
+
+def test_duel_data(benchmark, duel):
+    result = benchmark(GeoguessrDuelData, duel)
+    assert len(result.rounds) == 20
+
+
+def test_challenge_results(benchmark, highscores):
+    results = benchmark(lambda: [GeoguessrChallengeResult(item) for item in highscores])
+    assert len(results) == 100
+
+
+def test_stats(benchmark, fixtures):
+    stats = benchmark(GeoguessrStats, fixtures.stats("user"))
+    assert stats.perfectRounds == 17
+
+
+def test_stats_all_fields(benchmark, fixtures):
+    """Build the stats and every sub-object, as rendering or exporting them does."""
+    datas = fixtures.stats("user")
+    result = benchmark(lambda: GeoguessrStats(datas).to_dict())
+    assert result["perfectRounds"] == 17
+
+
+def test_club(benchmark, fixtures):
+    club = benchmark(GeoguessrClub, fixtures.club("club-bench"))
+    assert len(club.members) == 500
+
+
+def test_duel_to_tree(benchmark, duel):
+    model = GeoguessrDuelData(duel)
+    tree = benchmark(model.to_tree)
+    assert tree
+
+
+def test_club_to_tree(benchmark, fixtures):
+    model = GeoguessrClub(fixtures.club("club-bench"))
+    tree = benchmark(model.to_tree)
+    assert tree
+
+
+def test_duel_write_tree(benchmark, duel):
+    model = GeoguessrDuelData(duel)
+    benchmark(lambda: model.write_tree(io.StringIO()))
@@ -0,0 +1,231 @@
+import math
+from typing import Optional, Union
+
+import geoguessr_async.geo_utils as gu
+from geoguessr_async.models import (
+    GeoguessrDuelData,
+    GeoguessrDuelReplay,
+    GeoguessrDuelReplayColumns,
+    GeoguessrStr,
+)
+
+np = gu.np  # numpy is an optional dependency, the pure Python path is used without it
+
+_CODES = GeoguessrDuelReplayColumns.TYPE_CODES
+_PANO_POSITION = _CODES[GeoguessrDuelReplay.Type.PANOPOSITION]
+_PANO_POV = _CODES[GeoguessrDuelReplay.Type.PANOPOV]
+_PANO_ZOOM = _CODES[GeoguessrDuelReplay.Type.PANOZOOM]
+_MAP_ZOOM = _CODES[GeoguessrDuelReplay.Type.MAPZOOM]
+_GUESS = _CODES[GeoguessrDuelReplay.Type.GUESSWITHLATLNG]
+
+
+class GeoguessrReplayMetrics(GeoguessrStr):
+    """Metrics of the replay of one player in one round of a duel.
+
+    Attributes:
+        playerId (str): The player of the replay.
+        roundNumber (int): The round of the replay, starting at 1.
+        steps (int): The number of steps of the replay.
+        movementDistance (float): The distance walked between consecutive panoramas, in meters.
+        timeToGuess (Optional[float]): Seconds from the start of the round to the first guess, None if the
+            player did not guess. The round starts at its startTime, or at the first step of the replay when
+            the duel does not give it.
+        panCount (int): The number of camera moves (PanoPov steps).
+        zoomCount (int): The number of panorama zooms (PanoZoom steps).
+        mapZoomCount (int): The number of map zooms (MapZoom steps).
+        maxMapZoom (Optional[float]): The highest map zoom level reached, None without map zoom.
+        meanMapZoom (Optional[float]): The mean map zoom level of the MapZoom steps, None without map zoom.
+    """
+
+    __slots__ = (
+        "playerId",
+        "roundNumber",
+        "steps",
+        "movementDistance",
+        "timeToGuess",
+        "panCount",
+        "zoomCount",
+        "mapZoomCount",
+        "maxMapZoom",
+        "meanMapZoom",
+    )
+
+    def __init__(
+        self,
+        playerId: str,
+        roundNumber: int,
+        steps: int,
+        movementDistance: float,
+        timeToGuess: Optional[float],
+        panCount: int,
+        zoomCount: int,
+        mapZoomCount: int,
+        maxMapZoom: Optional[float],
+        meanMapZoom: Optional[float],
+    ) -> None:
+        self.playerId: str = playerId
+        self.roundNumber: int = roundNumber
+        self.steps: int = steps
+        self.movementDistance: float = movementDistance
+        self.timeToGuess: Optional[float] = timeToGuess
+        self.panCount: int = panCount
+        self.zoomCount: int = zoomCount
+        self.mapZoomCount: int = mapZoomCount
+        self.maxMapZoom: Optional[float] = maxMapZoom
+        self.meanMapZoom: Optional[float] = meanMapZoom
+
+
+def replay_metrics(duel: GeoguessrDuelData, vectorized: Optional[bool] = None) -> list[GeoguessrReplayMetrics]:
+    """Compute the metrics of every replay of a duel.
+
+    With numpy, the replays of all players and rounds are concatenated and every metric is
+    computed in one vectorized pass over the columns. Without numpy, each replay is scanned in
+    Python. Both give the same results.
+
+    Args:
+        duel (GeoguessrDuelData): A duel whose replays were fetched, in columns or as step objects.
+        vectorized (Optional[bool]): Force the numpy path (True) or the pure Python one (False).
+            Defaults to None (numpy when it is installed).
+
+    Returns:
+        list[GeoguessrReplayMetrics]: One entry per player and round with a replay, in player then round order.
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    elif vectorized and np is None:
+        raise ImportError("numpy is required for vectorized replay analytics")
+
+    # Start of each round in epoch milliseconds, the unit of the replay times
+    roundStarts: dict[int, int] = {}
+    for roundIndex, duelRound in enumerate(duel.rounds or []):
+        if duelRound.startTime is not None:
+            roundNumber = duelRound.roundNumber if duelRound.roundNumber is not None else roundIndex + 1
+            roundStarts[roundNumber] = round(duelRound.startTime.timestamp() * 1000)
+
+    keys: list[tuple[str, int]] = []
+    replays: list[GeoguessrDuelReplayColumns] = []
+    for playerId, playerReplays in (duel.replays or {}).items():
+        for roundIndex, replay in enumerate(playerReplays):
+            if replay is None:
+                continue
+            keys.append((playerId, roundIndex + 1))
+            replays.append(_as_columns(replay))
+    starts = [roundStarts.get(roundNumber) for _, roundNumber in keys]
+
+    if vectorized:
+        return _metrics_numpy(keys, replays, starts)
+    return [
+        _metrics_python(playerId, roundNumber, replay, start)
+        for (playerId, roundNumber), replay, start in zip(keys, replays, starts)
+    ]
+
+
+def _as_columns(replay: Union[GeoguessrDuelReplay, GeoguessrDuelReplayColumns]) -> GeoguessrDuelReplayColumns:
+    if isinstance(replay, GeoguessrDuelReplayColumns):
+        return replay
+    return GeoguessrDuelReplayColumns.from_replay(replay)
+
+
+def _metrics_python(
+    playerId: str, roundNumber: int, replay: GeoguessrDuelReplayColumns, start: Optional[int]
+) -> GeoguessrReplayMetrics:
+    movementDistance = 0.0
+    previous: Optional[tuple[float, float]] = None
+    firstGuess: Optional[int] = None
+    panCount = zoomCount = 0
+    mapZooms: list[float] = []
+    for i, code in enumerate(replay.types):
+        if code == _PANO_POSITION:
+            position = (replay.lat[i], replay.lng[i])
+            if previous is not None:
+                distance = gu.haversine(*previous, *position)
+                if not math.isnan(distance):
+                    movementDistance += distance
+            previous = position
+        elif code == _PANO_POV:
+            panCount += 1
+        elif code == _PANO_ZOOM:
+            zoomCount += 1
+        elif code == _MAP_ZOOM:
+            mapZooms.append(replay.zoom[i])
+        elif code == _GUESS and firstGuess is None:
+            firstGuess = replay.times[i]
+
+    mapZoomCount = len(mapZooms)
+    mapZooms = [zoom for zoom in mapZooms if not math.isnan(zoom)]
+    return GeoguessrReplayMetrics(
+        playerId,
+        roundNumber,
+        len(replay),
+        movementDistance,
+        None if firstGuess is None else (firstGuess - (min(replay.times) if start is None else start)) / 1000,
+        panCount,
+        zoomCount,
+        mapZoomCount,
+        max(mapZooms) if mapZooms else None,
+        sum(mapZooms) / len(mapZooms) if mapZooms else None,
+    )
+
+
+def _metrics_numpy(
+    keys: list[tuple[str, int]], replays: list[GeoguessrDuelReplayColumns], roundStarts: list[Optional[int]]
+) -> list[GeoguessrReplayMetrics]:
+    count = len(replays)
+    if count == 0:
+        return []
+    lengths = np.array([len(replay) for replay in replays], dtype=np.int64)
+    # Replay index of every step of the concatenated columns
+    segments = np.repeat(np.arange(count), lengths)
+    times = np.concatenate([np.frombuffer(replay.times, dtype=np.int64) for replay in replays])
+    types = np.concatenate([np.frombuffer(replay.types, dtype=np.int8) for replay in replays])
+    lat = np.concatenate([np.frombuffer(replay.lat, dtype=np.float64) for replay in replays])
+    lng = np.concatenate([np.frombuffer(replay.lng, dtype=np.float64) for replay in replays])
+    zoom = np.concatenate([np.frombuffer(replay.zoom, dtype=np.float64) for replay in replays])
+
+    # Distance between consecutive panoramas of the same replay
+    positions = types == _PANO_POSITION
+    posSegments = segments[positions]
+    posLat = lat[positions]
+    posLng = lng[positions]
+    distances = gu.haversine_arrays(posLat[:-1], posLng[:-1], posLat[1:], posLng[1:])
+    sameReplay = posSegments[:-1] == posSegments[1:]
+    movement = np.bincount(posSegments[:-1][sameReplay], weights=np.nan_to_num(distances[sameReplay]), minlength=count)
+
+    # First guess relative to the start of the round, or to the first step of the replay when it is unknown
+    starts = np.full(count, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(starts, segments, times)
+    known = np.array([start is not None for start in roundStarts], dtype=bool)
+    starts[known] = [start for start in roundStarts if start is not None]
+    guesses = types == _GUESS
+    firstGuesses = np.full(count, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(firstGuesses, segments[guesses], times[guesses])
+
+    mapZooms = types == _MAP_ZOOM
+    zoomValues = zoom[mapZooms]
+    zoomSegments = segments[mapZooms]
+    validZoom = ~np.isnan(zoomValues)
+    zoomSums = np.bincount(zoomSegments[validZoom], weights=zoomValues[validZoom], minlength=count)
+    validZoomCounts = np.bincount(zoomSegments[validZoom], minlength=count)
+    maxZooms = np.full(count, -np.inf)
+    np.maximum.at(maxZooms, zoomSegments[validZoom], zoomValues[validZoom])
+
+    panCounts = np.bincount(segments[types == _PANO_POV], minlength=count)
+    panoZoomCounts = np.bincount(segments[types == _PANO_ZOOM], minlength=count)
+    mapZoomCounts = np.bincount(zoomSegments, minlength=count)
+
+    noGuess = np.iinfo(np.int64).max
+    return [
+        GeoguessrReplayMetrics(
+            playerId,
+            roundNumber,
+            int(lengths[i]),
+            float(movement[i]),
+            None if firstGuesses[i] == noGuess else float(firstGuesses[i] - starts[i]) / 1000,
+            int(panCounts[i]),
+            int(panoZoomCounts[i]),
+            int(mapZoomCounts[i]),
+            float(maxZooms[i]) if validZoomCounts[i] else None,
+            float(zoomSums[i] / validZoomCounts[i]) if validZoomCounts[i] else None,
+        )
+        for i, (playerId, roundNumber) in enumerate(keys)
+    ]
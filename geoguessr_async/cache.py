@@ -0,0 +1,349 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from geoguessr_async.fetcher import Endpoint
+
+MISSING = object()
+"""Sentinel returned by the caches when a key is absent or expired."""
+
+DEFAULT_TTLS: dict[str, Optional[float]] = {
+    Endpoint.USER: 300,
+    Endpoint.USER_STATS: 300,
+    Endpoint.USER_ELO: 300,
+    Endpoint.CHALLENGE: 3600,
+    Endpoint.MAP: 3600,
+    Endpoint.MAP_SEARCH: 3600,
+    Endpoint.CLUB: 300,
+    # Only finished duels and their replays are stored, and those never change
+    Endpoint.DUEL: None,
+    Endpoint.REPLAY: None,
+}
+"""Default time to live in seconds per endpoint. None means no expiry; endpoints not listed are never cached."""
+
+
+class CacheBackend:
+    """Base class of the storages used by ResponseCache.
+
+    A backend maps string keys to decoded JSON values, each with an optional expiry.
+    """
+
+    def get(self, key: str) -> Any:
+        """Get a value.
+
+        Args:
+            key (str): The key of the value.
+
+        Returns:
+            Any: The stored value, or MISSING if the key is absent or expired.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """Store a value.
+
+        Args:
+            key (str): The key of the value.
+            value (Any): The decoded JSON value to store.
+            ttl (Optional[float]): Time to live in seconds. None means the value never expires.
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove every value."""
+        raise NotImplementedError
+
+    async def get_async(self, key: str) -> Any:
+        """Get a value from the event loop, see get.
+
+        Backends doing blocking I/O override it to run the lookup off the loop.
+        """
+        return self.get(key)
+
+    async def set_async(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """Store a value from the event loop, see set.
+
+        Backends doing blocking I/O override it to run the write off the loop.
+        """
+        self.set(key, value, ttl)
+
+
+class MemoryCache(CacheBackend):
+    """In-memory backend bounded in size, evicting the least recently used values first.
+
+    Values are stored as-is, so callers must not mutate the objects they get back.
+    """
+
+    def __init__(self, maxSize: int = 1024) -> None:
+        """Initialize MemoryCache.
+
+        Args:
+            maxSize (int): The maximum number of values kept in memory. Defaults to 1024.
+        """
+        if maxSize < 1:
+            raise ValueError(f"maxSize must be at least 1, got {maxSize}")
+        self.maxSize: int = maxSize
+        self._entries: OrderedDict[str, tuple[Optional[float], Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        expiresAt, value = entry
+        if expiresAt is not None and expiresAt <= time.monotonic():
+            del self._entries[key]
+            return MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        self._entries[key] = (None if ttl is None else time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxSize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(CacheBackend):
+    """On-disk backend storing values as JSON in a SQLite database.
+
+    It survives restarts, so immutable documents such as finished duels and their replays are
+    not fetched again by a new process. Expiry uses wall-clock time.
+
+    The database runs in WAL mode and writes are batched: they are kept in memory, where lookups
+    see them, and committed together once `batchSize` of them are pending or `flushInterval`
+    seconds have passed since the last commit. Writes still pending when the process dies are lost,
+    call flush or close to commit them. From the event loop, the client goes through get_async and
+    set_async, which run the queries on a dedicated thread so the loop is never blocked on disk I/O.
+    """
+
+    def __init__(self, path: str = "geoguessr_cache.sqlite3", batchSize: int = 64, flushInterval: float = 1.0) -> None:
+        """Initialize SQLiteCache.
+
+        Args:
+            path (str): Path of the database file, created if needed. Defaults to 'geoguessr_cache.sqlite3'.
+            batchSize (int): Number of pending writes committed together. Defaults to 64.
+            flushInterval (float): Maximum time in seconds a write stays pending, checked on each write.
+                Defaults to 1.0.
+        """
+        if batchSize < 1:
+            raise ValueError(f"batchSize must be at least 1, got {batchSize}")
+        self.path: str = path
+        self.batchSize: int = batchSize
+        self.flushInterval: float = flushInterval
+        # Pending writes by key: the value and its expiry, or None for a deletion
+        self._pending: dict[str, Optional[tuple[str, Optional[float]]]] = {}
+        self._lastFlush: float = time.monotonic()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="geoguessr-sqlite-cache")
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            if key in self._pending:
+                row = self._pending[key]
+            else:
+                row = self._connection.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return MISSING
+            value, expiresAt = row
+            if expiresAt is not None and expiresAt <= time.time():
+                self._write(key, None)
+                return MISSING
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        row = (json.dumps(value), None if ttl is None else time.time() + ttl)
+        with self._lock:
+            self._write(key, row)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._write(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._connection.execute("DELETE FROM cache")
+            self._connection.commit()
+
+    async def get_async(self, key: str) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.get, key)
+
+    async def set_async(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.set, key, value, ttl)
+
+    def _write(self, key: str, row: Optional[tuple[str, Optional[float]]]) -> None:
+        # Called with the lock held
+        self._pending[key] = row
+        if len(self._pending) >= self.batchSize or time.monotonic() - self._lastFlush >= self.flushInterval:
+            self._flush()
+
+    def _flush(self) -> None:
+        # Called with the lock held
+        if self._pending:
+            writes = [(key, *row) for key, row in self._pending.items() if row is not None]
+            deletions = [(key,) for key, row in self._pending.items() if row is None]
+            if writes:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)", writes
+                )
+            if deletions:
+                self._connection.executemany("DELETE FROM cache WHERE key = ?", deletions)
+            self._connection.commit()
+            self._pending.clear()
+        self._lastFlush = time.monotonic()
+
+    def flush(self) -> None:
+        """Commit the pending writes to the database."""
+        with self._lock:
+            self._flush()
+
+    def purge_expired(self) -> int:
+        """Remove the expired values from the database.
+
+        Returns:
+            int: The number of removed values.
+        """
+        with self._lock:
+            self._flush()
+            cursor = self._connection.execute(
+                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            )
+            self._connection.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Commit the pending writes and close the database connection."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._flush()
+            self._connection.close()
+
+
+class ResponseCache:
+    """Caches decoded API responses with a time to live per endpoint and hit/miss counters.
+
+    Attributes:
+        backend (CacheBackend): The storage of the cached values.
+        ttls (dict[str, Optional[float]]): Time to live in seconds per endpoint template.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to go to the network.
+        endpointStats (dict[str, dict[str, int]]): Hits and misses per endpoint template.
+    """
+
+    def __init__(
+        self, backend: Optional[CacheBackend] = None, ttls: Optional[dict[str, Optional[float]]] = None
+    ) -> None:
+        """Initialize ResponseCache.
+
+        Args:
+            backend (Optional[CacheBackend]): The storage to use. Defaults to a MemoryCache.
+            ttls (Optional[dict[str, Optional[float]]]): Time to live overrides per endpoint template,
+                merged over DEFAULT_TTLS. A time to live of 0 disables caching for the endpoint.
+        """
+        self.backend: CacheBackend = backend if backend is not None else MemoryCache()
+        self.ttls: dict[str, Optional[float]] = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits: int = 0
+        self.misses: int = 0
+        self.endpointStats: dict[str, dict[str, int]] = {}
+
+    def is_cached(self, endpoint: str) -> bool:
+        """Whether responses of an endpoint are cached."""
+        return endpoint in self.ttls and self.ttls[endpoint] != 0
+
+    def get(self, endpoint: str, url: str) -> Any:
+        """Look up the response of a URL.
+
+        Args:
+            endpoint (str): The endpoint template of the URL.
+            url (str): The requested URL.
+
+        Returns:
+            Any: The cached value, or MISSING.
+        """
+        if not self.is_cached(endpoint):
+            return MISSING
+        return self.__count(endpoint, self.backend.get(url))
+
+    async def get_async(self, endpoint: str, url: str) -> Any:
+        """Look up the response of a URL from the event loop, without blocking it on the backend.
+
+        Args:
+            endpoint (str): The endpoint template of the URL.
+            url (str): The requested URL.
+
+        Returns:
+            Any: The cached value, or MISSING.
+        """
+        if not self.is_cached(endpoint):
+            return MISSING
+        return self.__count(endpoint, await self.backend.get_async(url))
+
+    def __count(self, endpoint: str, value: Any) -> Any:
+        stats = self.endpointStats.setdefault(endpoint, {"hits": 0, "misses": 0})
+        if value is MISSING:
+            self.misses += 1
+            stats["misses"] += 1
+        else:
+            self.hits += 1
+            stats["hits"] += 1
+        return value
+
+    def set(self, endpoint: str, url: str, value: Any) -> None:
+        """Store the response of a URL if its endpoint is cached.
+
+        Args:
+            endpoint (str): The endpoint template of the URL.
+            url (str): The requested URL.
+            value (Any): The decoded JSON response.
+        """
+        if self.is_cached(endpoint):
+            self.backend.set(url, value, self.ttls[endpoint])
+
+    async def set_async(self, endpoint: str, url: str, value: Any) -> None:
+        """Store the response of a URL from the event loop, without blocking it on the backend.
+
+        Args:
+            endpoint (str): The endpoint template of the URL.
+            url (str): The requested URL.
+            value (Any): The decoded JSON response.
+        """
+        if self.is_cached(endpoint):
+            await self.backend.set_async(url, value, self.ttls[endpoint])
+
+    @property
+    def hitRatio(self) -> float:
+        """The share of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        """Remove every cached value and reset the counters."""
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+        self.endpointStats = {}
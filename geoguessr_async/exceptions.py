@@ -0,0 +1,31 @@
+from typing import Optional
+
+
+class GeoguessrHTTPError(Exception):
+    """Raised when the Geoguessr API answers with an error status.
+
+    Attributes:
+        status (int): The HTTP status of the response.
+        url (str): The requested URL.
+    """
+
+    def __init__(self, status: int, url: str, message: Optional[str] = None) -> None:
+        self.status: int = status
+        self.url: str = url
+        super().__init__(message or f"Geoguessr API returned HTTP {status} for {url}")
+
+
+class GeoguessrRateLimitError(GeoguessrHTTPError):
+    """Raised when a request is still rate limited (HTTP 429) after the retries of the client's RetryPolicy.
+
+    Attributes:
+        retryAfter (Optional[str]): The Retry-After header of the last response, if any.
+    """
+
+    def __init__(self, status: int, url: str, retryAfter: Optional[str] = None) -> None:
+        self.retryAfter: Optional[str] = retryAfter
+        super().__init__(status, url, f"Geoguessr API rate limit still exceeded for {url}")
+
+
+class GeoguessrAuthError(GeoguessrHTTPError):
+    """Raised when the API rejects the NCFA cookie of the client (HTTP 401 or 403)."""
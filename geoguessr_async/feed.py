@@ -0,0 +1,72 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Optional
+
+import geoguessr_async.geo_utils as gu
+
+
+class GeoguessrFeedCursor:
+    """Remembers how far the private activity feed has been synced.
+
+    The feed is returned newest first. A sync walks it from the top and stops at the newest entry
+    of the previous sync. If a sync is interrupted, the pagination token of the next page is kept
+    so that the following sync resumes where it stopped instead of starting over.
+
+    Attributes:
+        newestTime (Optional[str]): Time of the newest entry of the last completed sync.
+        pendingNewestTime (Optional[str]): Time of the newest entry of the sync in progress.
+        paginationToken (Optional[str]): Token of the next page of the sync in progress.
+        path (Optional[str]): File the cursor is saved to, if any.
+    """
+
+    def __init__(
+        self,
+        newestTime: Optional[str] = None,
+        pendingNewestTime: Optional[str] = None,
+        paginationToken: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        self.newestTime: Optional[str] = newestTime
+        self.pendingNewestTime: Optional[str] = pendingNewestTime
+        self.paginationToken: Optional[str] = paginationToken
+        self.path: Optional[str] = path
+
+    @classmethod
+    def load(cls, path: str) -> "GeoguessrFeedCursor":
+        """Load a cursor from a JSON file, or start a new one bound to that file if it does not exist.
+
+        Args:
+            path (str): The path of the cursor file.
+
+        Returns:
+            GeoguessrFeedCursor: The loaded cursor.
+        """
+        if not os.path.exists(path):
+            return cls(path=path)
+        with open(path, encoding="utf-8") as f:
+            datas = json.load(f)
+        return cls(datas.get("newestTime"), datas.get("pendingNewestTime"), datas.get("paginationToken"), path)
+
+    def save(self) -> None:
+        """Write the cursor to its file, if it has one. The file is replaced atomically."""
+        if self.path is None:
+            return
+        tmpPath = f"{self.path}.tmp"
+        with open(tmpPath, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "newestTime": self.newestTime,
+                    "pendingNewestTime": self.pendingNewestTime,
+                    "paginationToken": self.paginationToken,
+                },
+                f,
+            )
+        os.replace(tmpPath, self.path)
+
+    def is_seen(self, entry: dict[str, Any]) -> bool:
+        """Whether a feed entry was already returned by a completed sync."""
+        if self.newestTime is None:
+            return False
+        entryTime: Optional[datetime] = gu.datetime_or_none(entry.get("time"))
+        return entryTime is not None and entryTime <= gu.datetime_or_none(self.newestTime)
@@ -0,0 +1,217 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Iterable, Optional, Union
+from urllib import parse
+
+import aiohttp
+
+from geoguessr_async import json_backend
+from geoguessr_async.exceptions import GeoguessrAuthError, GeoguessrHTTPError
+from geoguessr_async.instrumentation import RequestEvent, RequestHook, emit
+from geoguessr_async.json_backend import JsonLoads
+
+Fetcher = Callable[[str], Awaitable[Any]]
+
+
+class Endpoint:
+    """Templates of the API endpoints called by the client, used to key caching per endpoint."""
+
+    PROFILE = "/api/v3/profiles"
+    FEED = "/api/v4/feed/private"
+    FRIENDS = "/api/v3/social/friends/summary"
+    USER = "/api/v3/users/{userId}"
+    USER_ELO = "/api/v4/ranked-system/progress/{userId}"
+    USER_STATS = "/api/v4/stats/users/{userId}"
+    CHALLENGES = "/api/v3/challenges"
+    CHALLENGE = "/api/v3/challenges/{challengeToken}"
+    GAME = "/api/v3/games/{gameToken}"
+    HIGHSCORES = "/api/v3/results/highscores/{challengeToken}"
+    MAP = "/api/maps/{mapId}"
+    MAP_SEARCH = "/api/v3/search/map"
+    DUEL = "/api/duels/{duelToken}"
+    REPLAY = "/api/replays/{playerId}/{gameId}/{roundNumber}"
+    CLUB = "/api/v4/clubs/{clubId}"
+
+
+class ApiResponse:
+    """Represents a decoded response of the Geoguessr API.
+
+    Attributes:
+        url (str): The requested URL.
+        status (int): The HTTP status of the response.
+        data (Any): The decoded JSON body, or None if the body is not JSON.
+        contentType (Optional[str]): The Content-Type header of the response.
+        fromCache (bool): Whether the response was served by the client cache.
+    """
+
+    def __init__(
+        self, url: str, status: int, data: Any, contentType: Optional[str] = None, fromCache: bool = False
+    ) -> None:
+        self.url: str = url
+        self.status: int = status
+        self.data: Any = data
+        self.contentType: Optional[str] = contentType
+        self.fromCache: bool = fromCache
+
+    @property
+    def isJson(self) -> bool:
+        """Whether the response declares a JSON body."""
+        return self.contentType is not None and "application/json" in self.contentType
+
+    def raise_for_status(self) -> None:
+        """Raise GeoguessrHTTPError, or GeoguessrAuthError for 401 and 403, if the response has an error status."""
+        if self.status in (401, 403):
+            raise GeoguessrAuthError(self.status, self.url)
+        if self.status >= 400:
+            raise GeoguessrHTTPError(self.status, self.url)
+
+
+class FetchResult:
+    """Represents the outcome of a single request made by the fetch engine.
+
+    Attributes:
+        url (str): The requested URL.
+        data (Any): The decoded JSON body, or None if the request failed.
+        elapsed (float): Time spent on the request, in seconds.
+        error (Optional[BaseException]): The exception raised by the request, if any.
+    """
+
+    def __init__(self, url: str, data: Any = None, elapsed: float = 0.0, error: Optional[BaseException] = None) -> None:
+        self.url: str = url
+        self.data: Any = data
+        self.elapsed: float = elapsed
+        self.error: Optional[BaseException] = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the request succeeded."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"failed: {self.error!r}"
+        return f"<FetchResult {self.url} {self.elapsed * 1000:.1f}ms {status}>"
+
+
+def session_fetcher(
+    session: aiohttp.ClientSession,
+    decode: Optional[Callable[[Any], Any]] = None,
+    loads: JsonLoads = json_backend.loads,
+    hooks: Iterable[RequestHook] = (),
+    endpoint: Optional[str] = None,
+) -> Fetcher:
+    """Build a fetcher that GETs a URL with the given session and decodes the JSON body.
+
+    Args:
+        session (aiohttp.ClientSession): The session used to send the requests.
+        decode (Optional[Callable[[Any], Any]]): A transformation applied to each decoded body,
+            such as `geo_utils.decode_big_numbers`. Defaults to None.
+        loads (JsonLoads): The function decoding the body bytes. Defaults to the fastest installed JSON backend.
+        hooks (Iterable[RequestHook]): Called with a RequestEvent for every request. Defaults to none.
+        endpoint (Optional[str]): The endpoint template reported to the hooks. Defaults to None (the URL path).
+
+    Returns:
+        Fetcher: An async callable taking a URL and returning the decoded JSON.
+    """
+    hooks = list(hooks)
+
+    def report(
+        url: str, status: Optional[int], body: bytes, start: float, error: Optional[BaseException] = None
+    ) -> None:
+        if hooks:
+            template = endpoint or parse.urlsplit(url).path
+            emit(hooks, RequestEvent("GET", url, template, status, len(body), time.perf_counter() - start, error=error))
+
+    async def fetch(url: str) -> Any:
+        start = time.perf_counter()
+        status = None
+        try:
+            async with session.get(url) as r:
+                status = r.status
+                r.raise_for_status()
+                body = await r.read()
+        except Exception as e:
+            report(url, status, b"", start, e)
+            raise
+        report(url, status, body, start)
+        data = loads(body)
+        return data if decode is None else decode(data)
+
+    return fetch
+
+
+async def fetch_one(url: str, fetcher: Fetcher, semaphore: Optional[asyncio.Semaphore] = None) -> FetchResult:
+    """Fetch a single URL, timing the request and capturing any error.
+
+    Args:
+        url (str): The URL to fetch.
+        fetcher (Fetcher): The async callable used to fetch the URL.
+        semaphore (Optional[asyncio.Semaphore]): Bounds the number of requests in flight. Defaults to None.
+
+    Returns:
+        FetchResult: The outcome of the request. Never raises, except on cancellation.
+    """
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(1)
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            data = await fetcher(url)
+        except Exception as e:
+            return FetchResult(url, elapsed=time.perf_counter() - start, error=e)
+        return FetchResult(url, data=data, elapsed=time.perf_counter() - start)
+
+
+async def fetch_all(
+    urls: list[str], fetcher: Fetcher, concurrency: Union[int, asyncio.Semaphore] = 8
+) -> list[FetchResult]:
+    """Fetch many URLs concurrently with a bounded number of requests in flight.
+
+    Args:
+        urls (list[str]): The URLs to fetch.
+        fetcher (Fetcher): The async callable used to fetch each URL.
+        concurrency (Union[int, asyncio.Semaphore]): The maximum number of requests in flight,
+            or a semaphore shared with other fetches. Defaults to 8.
+
+    Returns:
+        list[FetchResult]: One result per URL, in the same order as `urls`.
+    """
+    if isinstance(concurrency, int):
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        concurrency = asyncio.Semaphore(concurrency)
+    return list(await asyncio.gather(*(fetch_one(url, fetcher, concurrency) for url in urls)))
+
+
+class DuelFetchResult:
+    """Represents the outcome of fetching one duel and its replays in a bulk ingestion.
+
+    Attributes:
+        duelUrl (str): The duel URL or token as given by the caller.
+        data (Optional[GeoguessrDuelData]): The parsed duel, or None if it could not be fetched.
+        elapsed (float): Time spent fetching the duel and its replays, in seconds.
+        error (Optional[BaseException]): The exception that prevented the duel from being fetched, if any.
+        replayResults (list[FetchResult]): The outcome of every replay request of the duel.
+    """
+
+    def __init__(
+        self,
+        duelUrl: str,
+        data: Any = None,
+        elapsed: float = 0.0,
+        error: Optional[BaseException] = None,
+        replayResults: Optional[list[FetchResult]] = None,
+    ) -> None:
+        self.duelUrl: str = duelUrl
+        self.data: Any = data
+        self.elapsed: float = elapsed
+        self.error: Optional[BaseException] = error
+        self.replayResults: list[FetchResult] = replayResults or []
+
+    @property
+    def ok(self) -> bool:
+        """Whether the duel was fetched and parsed."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"failed: {self.error!r}"
+        return f"<DuelFetchResult {self.duelUrl} {self.elapsed * 1000:.1f}ms {status}>"
@@ -1,5 +1,18 @@
+import math
+from array import array
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency, the batch functions fall back to pure Python
+    np = None
+
+EARTH_RADIUS_METERS = 6371008.8
+"""Mean radius of the Earth, in meters."""
+
+MAX_SCORE = 5000
+"""Score of a perfect guess in a GeoGuessr round."""
 
 
 def flatten_dict(d: dict[Any, Any], parentKey: str = "", separator: str = ""):
@@ -91,7 +104,10 @@ def float_or_none(value: Any) -> Optional[float]:
 
 def datetime_or_none(value: Any) -> Optional[datetime]:
     """
-    Safely convert a value to datetime, returning None if conversion fails.
+    Safely convert an ISO 8601 timestamp to datetime, returning None if conversion fails.
+
+    The fractional seconds and the time zone are kept, so API timestamps such as
+    '2024-05-01T12:30:00.1234567Z' give an aware datetime in UTC.
 
     Args:
         value (Any): The value to convert to datetime.
@@ -99,7 +115,266 @@ def datetime_or_none(value: Any) -> Optional[datetime]:
     Returns:
         Optional[datetime]: The converted datetime value, or None if conversion fails.
     """
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str):
+        return None
     try:
-        return datetime.strptime(value.split(".")[0], "%Y-%m-%dT%H:%M:%S")
-    except (ValueError, TypeError):
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    # Before Python 3.11, fromisoformat rejects 'Z' and fractions that are not 3 or 6 digits long
+    try:
+        return datetime.fromisoformat(_normalize_iso(value))
+    except ValueError:
         return None
+
+
+def _normalize_iso(value: str) -> str:
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    dot = value.find(".")
+    if dot == -1:
+        return value
+    end = dot + 1
+    while end < len(value) and value[end].isdigit():
+        end += 1
+    return value[: dot + 1] + value[dot + 1 : end][:6].ljust(6, "0") + value[end:]
+
+
+def big_number_to_float(value: Any) -> float:
+    """
+    Convert a number of a duel response, which may be in the {"type": "Big Number", "value": "..."} format, to float.
+
+    Args:
+        value (Any): The number or the Big Number object.
+
+    Returns:
+        float: The converted value, or 0.0 if it is not a number.
+    """
+    if type(value) is float:  # Already decoded by decode_big_numbers
+        return value
+    if isinstance(value, dict) and value.get("type") == "Big Number":
+        return float(str(value.get("value", "0")).replace("n", ""))
+    if isinstance(value, (int, float)):
+        return float(value)
+    return 0.0
+
+
+def decode_big_numbers(tree: Any) -> Any:
+    """
+    Replace every {"type": "Big Number"} object of a decoded JSON document by its float value, in one walk.
+
+    The document is modified in place, which lets the models read plain floats afterwards.
+
+    Args:
+        tree (Any): The decoded JSON document.
+
+    Returns:
+        Any: The document, or the float value if the document itself is a Big Number.
+    """
+    if isinstance(tree, dict) and tree.get("type") == "Big Number":
+        return big_number_to_float(tree)
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node) if isinstance(node, list) else ()
+        for key, value in items:
+            if isinstance(value, dict):
+                if value.get("type") == "Big Number":
+                    node[key] = big_number_to_float(value)
+                else:
+                    stack.append(value)
+            elif isinstance(value, list):
+                stack.append(value)
+    return tree
+
+
+def coordinates_of(point: Any) -> tuple[float, float]:
+    """
+    Get the latitude and longitude of a location or a guess.
+
+    Args:
+        point (Any): A model with `lat` and `lng` (or `long`) attributes, such as GeoguessrDuelPlayerGuess,
+            GeoguessrPlayerGuesses, GeoguessrChallengeRound or GeoguessrDuelPanorama, a dict with `lat`
+            and `lng` keys, or a (lat, lng) pair.
+
+    Returns:
+        tuple[float, float]: The latitude and longitude in degrees, NaN when missing.
+    """
+    if isinstance(point, dict):
+        lat, lng = point.get("lat"), point.get("lng", point.get("long"))
+    elif isinstance(point, (tuple, list)):
+        lat, lng = point
+    else:
+        lat = getattr(point, "lat", None)
+        lng = getattr(point, "lng", None)
+        if lng is None:
+            lng = getattr(point, "long", None)
+    lat, lng = float_or_none(lat), float_or_none(lng)
+    return (math.nan if lat is None else lat, math.nan if lng is None else lng)
+
+
+def haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Compute the great-circle distance between two points.
+
+    Args:
+        lat1 (float): Latitude of the first point, in degrees.
+        lng1 (float): Longitude of the first point, in degrees.
+        lat2 (float): Latitude of the second point, in degrees.
+        lng2 (float): Longitude of the second point, in degrees.
+
+    Returns:
+        float: The distance in meters, NaN if a coordinate is NaN.
+    """
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    if a > 1:  # Rounding error on antipodal points; NaN is kept
+        a = 1.0
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
+
+
+def haversine_arrays(lat1: Any, lng1: Any, lat2: Any, lng2: Any) -> Any:
+    """
+    Compute the great-circle distances between arrays of points with numpy.
+
+    Args:
+        lat1 (numpy.ndarray): Latitudes of the first points, in degrees.
+        lng1 (numpy.ndarray): Longitudes of the first points, in degrees.
+        lat2 (numpy.ndarray): Latitudes of the second points, in degrees.
+        lng2 (numpy.ndarray): Longitudes of the second points, in degrees.
+
+    Returns:
+        numpy.ndarray: The distances in meters, NaN where a coordinate is NaN.
+    """
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(values, dtype=np.float64)) for values in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def geoguessr_score(distance: float, maxErrorDistance: float) -> int:
+    """
+    Compute the GeoGuessr score of a guess, 5000 * exp(-10 * distance / maxErrorDistance).
+
+    Args:
+        distance (float): The distance between the guess and the location, in meters.
+        maxErrorDistance (float): The `maxErrorDistance` of the map, in meters.
+
+    Returns:
+        int: The score between 0 and 5000, 0 if the distance is NaN.
+
+    Raises:
+        ValueError: If maxErrorDistance is not positive.
+    """
+    _check_max_error_distance(maxErrorDistance)
+    if math.isnan(distance):
+        return 0
+    return round(MAX_SCORE * math.exp(-10 * distance / maxErrorDistance))
+
+
+def haversine_batch(guesses: Sequence[Any], locations: Sequence[Any], vectorized: Optional[bool] = None) -> list[float]:
+    """
+    Compute the distances between guesses and their true locations, pair by pair.
+
+    Args:
+        guesses (Sequence[Any]): The guesses, as objects in any form accepted by `coordinates_of`, as an (n, 2)
+            numpy array of latitudes and longitudes, or as a (lats, lngs) tuple of numpy or `array.array` columns,
+            such as the `lat` and `lng` of a GeoguessrDuelReplayColumns. Arrays and columns are used without
+            extracting each point.
+        locations (Sequence[Any]): The true locations, in the same order, in any form accepted for the guesses.
+        vectorized (Optional[bool]): Force the numpy path (True) or the pure Python one (False).
+            Defaults to None (numpy when it is installed).
+
+    Returns:
+        list[float]: The distances in meters, NaN where a coordinate is missing.
+    """
+    if _use_numpy(vectorized):
+        return _distances_array(guesses, locations).tolist()
+    guessPairs, locationPairs = _coordinate_pairs(guesses), _coordinate_pairs(locations)
+    _check_lengths(guessPairs, locationPairs)
+    return [haversine(*guess, *location) for guess, location in zip(guessPairs, locationPairs)]
+
+
+def score_batch(
+    guesses: Sequence[Any], locations: Sequence[Any], maxErrorDistance: float, vectorized: Optional[bool] = None
+) -> list[int]:
+    """
+    Compute the GeoGuessr scores of guesses against their true locations, pair by pair.
+
+    Args:
+        guesses (Sequence[Any]): The guesses, as objects in any form accepted by `coordinates_of`, as an (n, 2)
+            numpy array of latitudes and longitudes, or as a (lats, lngs) tuple of numpy or `array.array` columns,
+            such as the `lat` and `lng` of a GeoguessrDuelReplayColumns. Arrays and columns are used without
+            extracting each point.
+        locations (Sequence[Any]): The true locations, in the same order, in any form accepted for the guesses.
+        maxErrorDistance (float): The `maxErrorDistance` of the map, in meters.
+        vectorized (Optional[bool]): Force the numpy path (True) or the pure Python one (False).
+            Defaults to None (numpy when it is installed).
+
+    Returns:
+        list[int]: The scores between 0 and 5000, 0 where a coordinate is missing.
+
+    Raises:
+        ValueError: If maxErrorDistance is not positive, or if guesses and locations differ in length.
+    """
+    _check_max_error_distance(maxErrorDistance)
+    if not _use_numpy(vectorized):
+        return [geoguessr_score(distance, maxErrorDistance) for distance in haversine_batch(guesses, locations, False)]
+    scores = MAX_SCORE * np.exp(-10 * _distances_array(guesses, locations) / maxErrorDistance)
+    return np.rint(np.nan_to_num(scores)).astype(np.int64).tolist()
+
+
+def _use_numpy(vectorized: Optional[bool]) -> bool:
+    if vectorized and np is None:
+        raise ImportError("numpy is required for the vectorized path")
+    return np is not None if vectorized is None else vectorized
+
+
+def _check_lengths(guesses: Sequence[Any], locations: Sequence[Any]) -> None:
+    if len(guesses) != len(locations):
+        raise ValueError(f"Got {len(guesses)} guesses for {len(locations)} locations")
+
+
+def _check_max_error_distance(maxErrorDistance: float) -> None:
+    if not maxErrorDistance > 0:  # Also rejects NaN
+        raise ValueError(f"maxErrorDistance must be positive, got {maxErrorDistance}")
+
+
+def _is_columns(points: Any) -> bool:
+    columnTypes = (array,) if np is None else (array, np.ndarray)
+    return isinstance(points, tuple) and len(points) == 2 and all(isinstance(column, columnTypes) for column in points)
+
+
+def _coordinate_pairs(points: Any) -> Sequence[tuple[float, float]]:
+    if _is_columns(points):
+        return list(zip(*points))
+    if np is not None and isinstance(points, np.ndarray):
+        return [coordinates_of(point) for point in _points_array(points).tolist()]
+    return [coordinates_of(point) for point in points]
+
+
+def _points_array(points: Any) -> Any:
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError(f"Expected an (n, 2) array of latitudes and longitudes, got shape {points.shape}")
+    return points
+
+
+def _coordinate_columns(points: Any) -> tuple[Any, Any]:
+    if _is_columns(points):
+        lats, lngs = (np.asarray(column, dtype=np.float64) for column in points)
+        if lats.shape != lngs.shape:
+            raise ValueError(f"Got {len(lats)} latitudes for {len(lngs)} longitudes")
+        return lats, lngs
+    if not isinstance(points, np.ndarray):  # Fall back to extracting each point
+        points = np.array([coordinates_of(point) for point in points], dtype=np.float64).reshape(-1, 2)
+    points = _points_array(points)
+    return points[:, 0], points[:, 1]
+
+
+def _distances_array(guesses: Any, locations: Any) -> Any:
+    guessLats, guessLngs = _coordinate_columns(guesses)
+    locationLats, locationLngs = _coordinate_columns(locations)
+    _check_lengths(guessLats, locationLats)
+    return haversine_arrays(guessLats, guessLngs, locationLats, locationLngs)
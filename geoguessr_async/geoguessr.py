@@ -1,14 +1,22 @@
 import asyncio
-import json
 import logging
-from datetime import datetime
-from typing import Optional
+import time
+import warnings
+from typing import Any, AsyncIterator, Callable, Iterable, Optional, Union
 from urllib import parse
 
 import aiohttp
 
+import geoguessr_async.geo_utils as gu
+from geoguessr_async.cache import MISSING, MemoryCache, ResponseCache, SQLiteCache
+from geoguessr_async.exceptions import GeoguessrAuthError, GeoguessrHTTPError, GeoguessrRateLimitError
+from geoguessr_async.feed import GeoguessrFeedCursor
+from geoguessr_async.fetcher import ApiResponse, DuelFetchResult, Endpoint, Fetcher, fetch_one
+from geoguessr_async.instrumentation import RequestEvent, RequestHook, emit
+from geoguessr_async.json_backend import JsonLoads, get_loads
 from geoguessr_async.models import (
     GeoguessrActivities,
+    GeoguessrActivity,
     GeoguessrChallenge,
     GeoguessrChallengeResult,
     GeoguessrClub,
@@ -18,22 +26,105 @@ from geoguessr_async.models import (
     GeoguessrStats,
     GeoguessrUserELO,
 )
+from geoguessr_async.ratelimit import RateLimiter, RetryPolicy, TokenBucket
 
 logger = logging.getLogger(__name__)
 
+HIGHSCORES_PAGE_SIZE = 26
+
 
 class Geoguessr:
     """Represents a geoguessr connection that connects to the Geoguessr API.
     This class is used to interact with the Geoguess API/
     """
 
-    def __init__(self, ncfa) -> None:
+    def __init__(
+        self,
+        ncfa,
+        cache: Optional[ResponseCache] = None,
+        rateLimiter: Optional[RateLimiter] = None,
+        retryPolicy: Optional[RetryPolicy] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        connectionLimit: int = 100,
+        connectionLimitPerHost: int = 0,
+        keepaliveTimeout: float = 15.0,
+        dnsCacheTtl: Optional[int] = 10,
+        timeout: Optional[Union[float, aiohttp.ClientTimeout]] = None,
+        coalesceRequests: bool = True,
+        jsonLoads: Optional[Union[str, JsonLoads]] = None,
+        typedReplays: bool = False,
+        baseUrls: Optional[dict[str, str]] = None,
+        requestHooks: Optional[Iterable[RequestHook]] = None,
+    ) -> None:
+        """Initialize Geoguessr.
+
+        The connection options are used when the client creates its own session. To share one
+        connection pool between several clients, for example one per account, give them the same
+        `connector`: each client keeps its own session and cookie, and none of them closes the connector.
+
+        Args:
+            ncfa (str): The `_ncfa` cookie of the account used to call the API.
+            cache (Optional[ResponseCache]): Cache of the API responses, disabled if None. Defaults to None.
+            rateLimiter (Optional[RateLimiter]): Throttles the requests per host, disabled if None. Defaults to None.
+            retryPolicy (Optional[RetryPolicy]): Retries rate limited and failed requests, disabled if None. With a
+                policy, a request still rate limited or failing with a server error after its retries raises
+                GeoguessrRateLimitError or GeoguessrHTTPError; without one, the response is returned as is.
+                Defaults to None.
+            session (Optional[aiohttp.ClientSession]): A session owned by the caller, used instead of creating one.
+                It is never closed by the client. Defaults to None.
+            connector (Optional[aiohttp.BaseConnector]): A connector owned by the caller, used by the session
+                the client creates. It is never closed by the client. Defaults to None.
+            connectionLimit (int): The maximum number of open connections, 0 for no limit. Defaults to 100.
+            connectionLimitPerHost (int): The maximum number of open connections per host, 0 for no limit.
+                Defaults to 0.
+            keepaliveTimeout (float): How long idle connections are kept open, in seconds. Defaults to 15.
+            dnsCacheTtl (Optional[int]): How long resolved addresses are cached, in seconds. None caches them
+                forever. Defaults to 10.
+            timeout (Optional[Union[float, aiohttp.ClientTimeout]]): The total timeout of a request in seconds,
+                or an aiohttp.ClientTimeout. Defaults to None (aiohttp's default of 5 minutes).
+            coalesceRequests (bool): Whether concurrent GET requests for the same URL share a single
+                request. Defaults to True.
+            jsonLoads (Optional[Union[str, JsonLoads]]): The function decoding the response bodies from bytes,
+                or the name of a backend: 'orjson', 'msgspec' or 'json'. Defaults to None (the fastest installed).
+            typedReplays (bool): Whether duel replays are built through their msgspec schemas, which is faster
+                and gives the same models. The replay bodies are then decoded from their bytes by the schemas, and
+                only decoded to JSON when a cache stores them. Requires msgspec. Defaults to False.
+            baseUrls (Optional[dict[str, str]]): Origins the requests are sent to instead of the API ones, such as
+                {"https://www.geoguessr.com": "http://127.0.0.1:8080"} to target a local test server. The cache
+                and the rate limiter still see the API URLs. Defaults to None.
+            requestHooks (Optional[Iterable[RequestHook]]): Called with a RequestEvent after every request and cache
+                hit, such as a HistogramExporter or a PrometheusExporter. Defaults to None.
+        """
         self._ncfa = ncfa
+        self.cache = cache
+        self.rateLimiter = rateLimiter
+        self.retryPolicy = retryPolicy
         self.headers = {
             "Content-Type": "application/json",
             "cookie": f"_ncfa={self._ncfa }",
         }
-        self._session = None
+        self._session = session
+        self._ownsSession = session is None
+        self._sessionLoop: Optional[asyncio.AbstractEventLoop] = None
+        self._connector = connector
+        self._connectorOptions = {
+            "limit": connectionLimit,
+            "limit_per_host": connectionLimitPerHost,
+            "keepalive_timeout": keepaliveTimeout,
+            "ttl_dns_cache": dnsCacheTtl,
+        }
+        self._timeout = aiohttp.ClientTimeout(total=timeout) if isinstance(timeout, (int, float)) else timeout
+        self.authFailures = 0
+        self.coalesceRequests = coalesceRequests
+        self.jsonLoads: JsonLoads = jsonLoads if callable(jsonLoads) else get_loads(jsonLoads)
+        self.typedReplays = typedReplays
+        self.baseUrls: dict[str, str] = {
+            origin.rstrip("/"): base.rstrip("/") for origin, base in (baseUrls or {}).items()
+        }
+        self.requestHooks: list[RequestHook] = list(requestHooks or [])
+        self.coalescedRequests = 0
+        self._inFlight: dict[tuple[str, str, bool], asyncio.Task] = {}
         self.me = None
         self.meStats = None
         self.friends = None
@@ -45,7 +136,16 @@ class Geoguessr:
     async def session(self) -> aiohttp.ClientSession:
         """Get or create the aiohttp ClientSession."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(headers=self.headers)
+            if not self._ownsSession:
+                raise RuntimeError("The session given to Geoguessr has been closed by its owner.")
+            sessionOptions = {} if self._timeout is None else {"timeout": self._timeout}
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=self._connector or aiohttp.TCPConnector(**self._connectorOptions),
+                connector_owner=self._connector is None,
+                **sessionOptions,
+            )
+            self._sessionLoop = asyncio.get_running_loop()
         return self._session
 
     @property
@@ -53,68 +153,317 @@ class Geoguessr:
         """Get the NCFA token."""
         return self._ncfa
 
-    async def get_all_my_infos(self):
+    async def _get(
+        self,
+        url: str,
+        endpoint: str,
+        cacheIf: Optional[Callable[[Any], bool]] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+        raw: bool = False,
+    ) -> ApiResponse:
+        """Send a GET request to the API, going through the cache if one is configured.
+
+        Concurrent calls for the same URL share one request: the first call starts it and the others
+        wait for its response. A cancelled caller does not cancel the request of the others.
+
+        Args:
+            url (str): The URL to request.
+            endpoint (str): The endpoint template of the URL, see Endpoint.
+            cacheIf (Optional[Callable[[Any], bool]]): Tells whether a decoded response may be cached.
+                Defaults to None (every successful JSON response of a cached endpoint is stored).
+            decode (Optional[Callable[[Any], Any]]): A transformation applied once to the decoded JSON of a
+                successful response, before it is cached, such as `gu.decode_big_numbers`. Defaults to None.
+            raw (bool): Whether a response from the API keeps its undecoded body as data, for callers decoding the
+                bytes themselves. The body is then only decoded, and given to `decode`, to be cached. A response
+                from the cache holds the decoded JSON either way. Defaults to False.
+
+        Returns:
+            ApiResponse: The decoded response.
+        """
+        if self.cache is not None:
+            start = time.perf_counter()
+            cached = await self.cache.get_async(endpoint, url)
+            if cached is not MISSING:
+                self.__report("GET", url, endpoint, 200, 0, start, 0, cacheHit=True)
+                return ApiResponse(url, 200, cached, "application/json", fromCache=True)
+
+        if not self.coalesceRequests:
+            return await self.__fetch_and_cache(url, endpoint, cacheIf, decode, raw)
+
+        key = ("GET", url, raw)
+        task = self._inFlight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.__fetch_and_cache(url, endpoint, cacheIf, decode, raw))
+            self._inFlight[key] = task
+            task.add_done_callback(lambda done: self.__forget_in_flight(key, done))
+        else:
+            self.coalescedRequests += 1
+        return await asyncio.shield(task)
+
+    def __forget_in_flight(self, key: tuple[str, str, bool], task: asyncio.Task) -> None:
+        if self._inFlight.get(key) is task:
+            del self._inFlight[key]
+        # Mark the error as retrieved, in case every caller was cancelled before the request ended
+        if not task.cancelled():
+            task.exception()
+
+    async def __fetch_and_cache(
+        self,
+        url: str,
+        endpoint: str,
+        cacheIf: Optional[Callable[[Any], bool]] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+        raw: bool = False,
+    ) -> ApiResponse:
+        response = await self._request("GET", url, endpoint, raw=raw)
+        if response.status != 200 or not response.isJson:
+            return response
+        if raw:
+            # The caller decodes the bytes itself, they are only decoded here to be cached
+            if self.cache is None:
+                return response
+            try:
+                data = self.jsonLoads(response.data)
+            except ValueError:
+                return response
+        else:
+            data = response.data
+        if decode is not None:
+            data = decode(data)
+        if not raw:
+            response.data = data
+
+        if self.cache is not None and (cacheIf is None or cacheIf(data)):
+            await self.cache.set_async(endpoint, url, data)
+        return response
+
+    async def _request(
+        self, method: str, url: str, endpoint: Optional[str] = None, raw: bool = False, **kwargs
+    ) -> ApiResponse:
+        """Send a request to the API, throttled by the rate limiter and retried according to the retry policy.
+
+        The request hooks are called once the request ends, with its retries counted in one event.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to request.
+            endpoint (Optional[str]): The endpoint template of the URL reported to the request hooks, see Endpoint.
+                Defaults to None (the URL path).
+            raw (bool): Whether the response keeps its undecoded body as data. Defaults to False.
+            **kwargs: Extra arguments given to `aiohttp.ClientSession.request`.
+
+        Raises:
+            GeoguessrRateLimitError: If a retry policy is set and the request is still rate limited after the
+                allowed retries.
+            GeoguessrHTTPError: If a retry policy is set and the server still answers with a server error after
+                the allowed retries.
+
+        Returns:
+            ApiResponse: The decoded response.
+        """
+        requestUrl = self.__route(url)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            if self.rateLimiter is not None:
+                await self.rateLimiter.acquire(url)
+            try:
+                # The headers are sent with each request since the session may be shared with other clients
+                async with (await self.session).request(method, requestUrl, headers=self.headers, **kwargs) as r:
+                    body = await r.read()
+                    status = r.status
+                    contentType = r.headers.get("Content-Type")
+                    retryAfter = r.headers.get("Retry-After")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if self.retryPolicy is None or not self.retryPolicy.should_retry(method, attempt):
+                    self.__report(method, url, endpoint, None, 0, start, attempt, error=e)
+                    raise
+                delay = self.retryPolicy.delay(attempt)
+                logger.debug("%s %s failed (%r), retrying in %.2fs", method, url, e, delay)
+            else:
+                if self.retryPolicy is None or not self.retryPolicy.should_retry(method, attempt, status):
+                    break
+                delay = self.retryPolicy.delay(attempt, retryAfter)
+                if status == 429 and self.rateLimiter is not None:  # Slow down every request to this host
+                    self.rateLimiter.bucket(url).block_for(delay)
+                logger.debug("%s %s returned HTTP %s, retrying in %.2fs", method, url, status, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        self.__report(method, url, endpoint, status, len(body), start, attempt)
+        if status in (401, 403):
+            self.authFailures += 1
+        # Without a retry policy, error responses are returned like any other, as callers always got them
+        if self.retryPolicy is not None:
+            if status == 429:
+                raise GeoguessrRateLimitError(status, url, retryAfter)
+            if status >= 500:
+                raise GeoguessrHTTPError(status, url)
+        if raw:
+            data = body
+        else:
+            try:
+                data = self.jsonLoads(body) if body else None
+            except ValueError:
+                data = None
+        return ApiResponse(url, status, data, contentType)
+
+    def __report(
+        self,
+        method: str,
+        url: str,
+        endpoint: Optional[str],
+        status: Optional[int],
+        responseBytes: int,
+        start: float,
+        retries: int,
+        cacheHit: bool = False,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        if self.requestHooks:
+            event = RequestEvent(
+                method,
+                url,
+                endpoint or parse.urlsplit(url).path,
+                status,
+                responseBytes,
+                time.perf_counter() - start,
+                retries,
+                cacheHit,
+                error,
+            )
+            emit(self.requestHooks, event)
+
+    def __route(self, url: str) -> str:
+        for origin, base in self.baseUrls.items():
+            if url.startswith(origin) and url[len(origin) : len(origin) + 1] in ("/", "?", ""):
+                return base + url[len(origin) :]
+        return url
+
+    async def _get_json(
+        self,
+        url: str,
+        endpoint: str,
+        cacheIf: Optional[Callable[[Any], bool]] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+        raw: bool = False,
+    ) -> Any:
+        """Send a GET request to the API and return the decoded body, raising GeoguessrHTTPError on error statuses."""
+        response = await self._get(url, endpoint, cacheIf, decode, raw)
+        response.raise_for_status()
+        return response.data
+
+    async def is_authenticated(self) -> bool:
+        """Check that the NCFA cookie of the client is accepted by the API.
+
+        Returns:
+            bool: False if the API rejects the cookie, True otherwise.
+        """
+        r = await self._get("https://www.geoguessr.com/api/v3/profiles/", Endpoint.PROFILE)
+        return r.status not in (401, 403)
+
+    async def get_all_my_infos(self, withFriends: bool = True, withActivities: bool = True, withElo: bool = True):
         """
         Retrieves all the necessary information for the current user.
 
         This function sends a GET request to the Geoguessr API to retrieve the user's profile information
         using the provided session. It then extracts the user's ID from the response and stores it in the
-        'id' attribute of the class. The function also calls the 'get_user_infos' method to retrieve the
-        user's detailed information, the 'get_user_stats' method to retrieve the user's stats, and the
-        '__get_my_friends_list' method to retrieve the user's friends list.
+        'id' attribute of the class. Once the ID is known, the user's detailed information, stats, friends
+        list, activities and ELO are retrieved concurrently. The stats are fetched once and attached to
+        the profile.
 
         Parameters:
             self (object): The instance of the class that the method is called on.
+            withFriends (bool): Whether to retrieve the friends list. Defaults to True.
+            withActivities (bool): Whether to retrieve the whole activity feed, the slowest part. Defaults to True.
+            withElo (bool): Whether to retrieve the ELO. Defaults to True.
 
         Returns:
             None
         """
-        async with (await self.session).get("https://www.geoguessr.com/api/v3/profiles/") as r:
-            self.meId = (await r.json())["user"]["id"]
-        self.me = await self.get_user_infos(self.meId)
-        self.meStats = await self.get_user_stats(self.meId)
-        self.friends = await self.__get_my_friends_list()
-        self.activities = await self.__get_activities()
-        self.meElo = await self.get_user_elo(self.meId)
+        self.meId = (await self._get("https://www.geoguessr.com/api/v3/profiles/", Endpoint.PROFILE)).data["user"]["id"]
+        jobs = {"me": self.get_user_infos(self.meId, withStats=False), "meStats": self.get_user_stats(self.meId)}
+        if withFriends:
+            jobs["friends"] = self.__get_my_friends_list()
+        if withActivities:
+            jobs["activities"] = self.__get_activities()
+        if withElo:
+            jobs["meElo"] = self.get_user_elo(self.meId)
+        for name, result in zip(jobs, await asyncio.gather(*jobs.values())):
+            setattr(self, name, result)
+        if self.me is not None:
+            self.me.add_stats(self.meStats)
 
     async def __get_activities(self):
+        return GeoguessrActivities([entry async for entry in self.iter_activities()])
 
-        async with (await self.session).get("https://geoguessr.com/api/v4/feed/private") as r:
-            js = await r.json()
+    async def iter_activities(
+        self, cursor: Optional[GeoguessrFeedCursor] = None, pageSize: int = 1000
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream the entries of the private activity feed, newest first.
 
-        entries = js["entries"]
-        paginationToken = js["paginationToken"]
+        Without a cursor the whole feed is streamed. With a cursor only the entries newer than the
+        previous sync are streamed, and the cursor is updated (and saved, if it has a file) after
+        each page, so an interrupted sync resumes from its last page.
 
-        while paginationToken is not None:
-            link = f"https://geoguessr.com/api/v4/feed/private?count=1000&paginationToken={paginationToken}"
-            async with (await self.session).get(link) as r:
-                js = await r.json()
+        Args:
+            cursor (Optional[GeoguessrFeedCursor]): The sync state to resume from and update. Defaults to None.
+            pageSize (int): The number of entries requested per page. Defaults to 1000.
 
-            entries += js["entries"]
+        Yields:
+            dict: The raw feed entries.
+        """
+        paginationToken = cursor.paginationToken if cursor is not None else None
+        while True:
+            link = f"https://geoguessr.com/api/v4/feed/private?count={pageSize}"
+            if paginationToken is not None:
+                link += f"&paginationToken={parse.quote(paginationToken, safe='')}"
+            js = (await self._get(link, Endpoint.FEED)).data
+            entries = js["entries"]
             paginationToken = js["paginationToken"]
-        return GeoguessrActivities(entries)
 
-    async def __get_my_friends_list(self):
-        async with (await self.session).get(
-            "https://www.geoguessr.com/api/v3/social/friends/summary?page=0&fast=true"
-        ) as r:
-            js = await r.json()
-            return {friend["nick"]: friend["userId"] for friend in js["friends"]}
+            if cursor is not None and cursor.pendingNewestTime is None and entries:
+                cursor.pendingNewestTime = entries[0].get("time")
+
+            for entry in entries:
+                if cursor is not None and cursor.is_seen(entry):
+                    paginationToken = None
+                    break
+                yield entry
 
-    async def get_user_infos(self, userId: str) -> Optional[GeoguessrProfile]:
+            if cursor is not None:
+                if paginationToken is None:  # Sync complete
+                    cursor.newestTime = cursor.pendingNewestTime or cursor.newestTime
+                    cursor.pendingNewestTime = None
+                cursor.paginationToken = paginationToken
+                cursor.save()
+            if paginationToken is None:
+                return
+
+    async def __get_my_friends_list(self):
+        js = (
+            await self._get(
+                "https://www.geoguessr.com/api/v3/social/friends/summary?page=0&fast=true", Endpoint.FRIENDS
+            )
+        ).data
+        return {friend["nick"]: friend["userId"] for friend in js["friends"]}
+
+    async def get_user_infos(self, userId: str, withStats: bool = True) -> Optional[GeoguessrProfile]:
         """Give you all Geoguessr profile information about a player with the player's id
 
         Args:
             userId (str): The Geoguessr Id of the player you want the informations of
+            withStats (bool): Whether to fetch the player's stats and add them to the profile. Defaults to True.
 
         Returns:
             GeoguessrProfile: All the informations about the player's profile
         """
-        async with (await self.session).get(f"https://www.geoguessr.com/api/v3/users/{userId}") as r:
-            if r.status == 200:
-                user = GeoguessrProfile(await r.json())
+        r = await self._get(f"https://www.geoguessr.com/api/v3/users/{userId}", Endpoint.USER)
+        if r.status == 200:
+            user = GeoguessrProfile(r.data)
+            if withStats:
                 user.add_stats(await self.get_user_stats(user.id))
-                return user
+            return user
 
     async def get_user_elo(self, userId: str) -> Optional[GeoguessrUserELO]:
         """Get the different ELOs of a player with geoguessr ID as input
@@ -128,13 +477,10 @@ class Geoguessr:
         """
 
         try:
-            async with (await self.session).get(
-                f"https://www.geoguessr.com/api/v4/ranked-system/progress/{userId}"
-            ) as r:
-                contentType = r.headers.get("Content-Type")
-                if contentType and "application/json" in contentType:
-                    return GeoguessrUserELO(await r.json())
-                raise ValueError("Content-Type for JSON response not acceptable.")
+            r = await self._get(f"https://www.geoguessr.com/api/v4/ranked-system/progress/{userId}", Endpoint.USER_ELO)
+            if r.isJson:
+                return GeoguessrUserELO(r.data)
+            raise ValueError("Content-Type for JSON response not acceptable.")
         except Exception:
             print("The player doesn't have his Geoguessr ELO stats page initialised, only a 'global ELO'.")
 
@@ -148,8 +494,8 @@ class Geoguessr:
             GeoguessrStats: All the stats about the player's profile
         """
 
-        async with (await self.session).get(f"https://www.geoguessr.com/api/v4/stats/users/{userId}") as r:
-            return GeoguessrStats(await r.json())
+        r = await self._get(f"https://www.geoguessr.com/api/v4/stats/users/{userId}", Endpoint.USER_STATS)
+        return GeoguessrStats(r.data)
 
     async def play_challenge(self, challengeUrl: str):
         """Play a challenge with your account (5 guesses are in 0,0 coordinates by default)
@@ -159,21 +505,23 @@ class Geoguessr:
         """
         challengeToken = challengeUrl.split("/")[-1] if "/" in challengeUrl else challengeUrl
         for i in range(5):
-            async with (await self.session).post(
-                f"https://www.geoguessr.com/api/v3/challenges/{challengeToken}",
-                json={},
-            ) as r:
-                js = await r.json()
-                gameToken = js["token"]
+            js = (
+                await self._request(
+                    "POST", f"https://www.geoguessr.com/api/v3/challenges/{challengeToken}", Endpoint.CHALLENGE, json={}
+                )
+            ).data
+            gameToken = js["token"]
             await self.__play_round(gameToken, i)
 
     async def __play_round(self, gameToken: str, roundNumber: int):
         requestData = {"token": gameToken, "lat": 0, "lng": 0, "timedOut": True}
 
-        # Discard the response object
-        _ = await (await self.session).post(f"https://www.geoguessr.com/api/v3/games/{gameToken}", json=requestData)
+        # Discard the responses
+        await self._request(
+            "POST", f"https://www.geoguessr.com/api/v3/games/{gameToken}", Endpoint.GAME, json=requestData
+        )
         if roundNumber != 4:
-            _ = await (await self.session).get(f"https://www.geoguessr.com/api/v3/games/{gameToken}?client=web")
+            await self._request("GET", f"https://www.geoguessr.com/api/v3/games/{gameToken}?client=web", Endpoint.GAME)
 
     async def get_challenge_score(self, challengeUrl: str, minRounds: Optional[int] = None):
         """Get scores on a standard challenge
@@ -185,6 +533,30 @@ class Geoguessr:
         Returns:
             list[GeoguessrScore]: A list of different scores for the challenge
         """
+        return [result async for result in self.iter_challenge_score(challengeUrl, minRounds)]
+
+    async def iter_challenge_score(
+        self,
+        challengeUrl: str,
+        minRounds: Optional[int] = None,
+        pageSize: int = HIGHSCORES_PAGE_SIZE,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[GeoguessrChallengeResult]:
+        """Stream the scores of a standard challenge, page by page
+
+        The next highscores page is requested as soon as the current one arrives, so parsing and
+        consuming the results overlaps with the network.
+
+        Args:
+            challenge_url (str): The URL of the challenge you want to get results of
+            minRounds (Optional[int]): The minimum number of rounds to consider. Defaults to None (all rounds).
+            pageSize (int): The number of results requested per page. If the server refuses a larger
+                page size, the default one is used. Defaults to 26.
+            limit (Optional[int]): Stop after this many results. Defaults to None (all results).
+
+        Yields:
+            GeoguessrChallengeResult: The score of each player, in leaderboard order
+        """
         challengeToken = challengeUrl.split("/")[-1] if "/" in challengeUrl else challengeUrl
 
         challengeInfo = await self.get_challenge_infos(challengeToken)
@@ -194,30 +566,49 @@ class Geoguessr:
             minRounds = roundCount
         elif minRounds > roundCount:
             raise ValueError(f"minRounds ({minRounds}) cannot be greater than roundCount ({roundCount})")
+        if limit is not None and limit <= 0:
+            return
 
-        link = f"https://geoguessr.com/api/v3/results/highscores/{challengeToken}?friends=false&limit=26&minRounds={minRounds}"
-        async with (await self.session).get(link) as r:
-            js = await r.json()
+        def page_link(paginationToken: Optional[str] = None) -> str:
+            link = f"https://geoguessr.com/api/v3/results/highscores/{challengeToken}?friends=false&limit={pageSize}&minRounds={minRounds}"
+            if paginationToken is not None:
+                link += f"&paginationToken={parse.quote(paginationToken)}"
+            return link
+
+        r = await self._get(page_link(), Endpoint.HIGHSCORES)
+        if r.status != 200 and pageSize != HIGHSCORES_PAGE_SIZE:  # Page size refused by the server
+            pageSize = HIGHSCORES_PAGE_SIZE
+            r = await self._get(page_link(), Endpoint.HIGHSCORES)
 
         if r.status != 200:  # Map not already played
             await self.play_challenge(challengeUrl)
-            async with (await self.session).get(link) as r:
-                js = await r.json()
-
-        results = js["items"]
-        paginationToken = js["paginationToken"]
-
-        while paginationToken is not None:
-            link = f"https://geoguessr.com/api/v3/results/highscores/{challengeToken}?friends=false&limit=26&minRounds={minRounds}&paginationToken={parse.quote(paginationToken)}"
-            async with (await self.session).get(link) as r:
-                js = await r.json()
+            r = await self._get(page_link(), Endpoint.HIGHSCORES)
+        js = r.data
 
-            results += js["items"]
+        count = 0
+        while True:
+            items = js["items"]
             paginationToken = js["paginationToken"]
+            logger.debug("Retrieved challenge scores page: %s", items)
 
-        logger.debug("Retrieved challenge scores: %s", results)
-
-        return [GeoguessrChallengeResult(result) for result in results]
+            nextPage = None
+            if paginationToken is not None and (limit is None or count + len(items) < limit):
+                nextPage = asyncio.ensure_future(self._get(page_link(paginationToken), Endpoint.HIGHSCORES))
+            pageConsumed = False
+            try:
+                for item in items:
+                    yield GeoguessrChallengeResult(item)
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+                pageConsumed = True
+            finally:
+                if nextPage is not None and not pageConsumed:  # The caller stopped early
+                    nextPage.cancel()
+
+            if nextPage is None:
+                return
+            js = (await nextPage).data
 
     async def get_challenge_infos(self, challengeUrl: str):
         """Get informations about a challenge
@@ -230,8 +621,11 @@ class Geoguessr:
         """
         challengeToken = challengeUrl.split("/")[-1] if "/" in challengeUrl else challengeUrl
 
-        async with (await self.session).get(f"https://www.geoguessr.com/api/v3/challenges/{challengeToken}") as r:
-            js = await r.json()
+        js = dict(
+            (await self._get(f"https://www.geoguessr.com/api/v3/challenges/{challengeToken}", Endpoint.CHALLENGE)).data
+        )
+        # Work on copies, the decoded response may be shared with the cache
+        js["challenge"] = dict(js["challenge"])
 
         seconds = js["challenge"]["timeLimit"]
 
@@ -265,11 +659,11 @@ class Geoguessr:
             GeoguessrMap: All infos about the map
         """
         mapToken = mapUrl.split("/")[-1] if "/" in mapUrl else mapUrl
-        async with (await self.session).get(f"https://www.geoguessr.com/api/maps/{mapToken}") as r:
-            js = await r.json()
+        # Work on a copy, the decoded response may be shared with the cache
+        js = dict((await self._get(f"https://www.geoguessr.com/api/maps/{mapToken}", Endpoint.MAP)).data)
         try:
-            async with (await self.session).get(f"https://www.geoguessr.com/api/v3/search/map?q={mapToken}") as r:
-                js["coordinateCount"] = (await r.json())[0]["coordinateCount"]
+            r = await self._get(f"https://www.geoguessr.com/api/v3/search/map?q={mapToken}", Endpoint.MAP_SEARCH)
+            js["coordinateCount"] = r.data[0]["coordinateCount"]
         except Exception:
             js["coordinateCount"] = 0
 
@@ -314,8 +708,7 @@ class Geoguessr:
             "rounds": numRounds,
         }
 
-        async with (await self.session).post(url, json=data) as response:
-            js = await response.json()
+        js = (await self._request("POST", url, Endpoint.CHALLENGES, json=data)).data
 
         challengeToken = js["token"]
         challengeLink = f"https://www.geoguessr.com/challenge/{challengeToken}"
@@ -325,26 +718,111 @@ class Geoguessr:
 
         return challengeLink
 
-    async def get_duel_info(self, duelUrl: str):
+    async def get_duel_info(self, duelUrl: str, replayConcurrency: int = 8, columnarReplays: bool = False):
         """
         Gets information about a duel.
 
         Parameters:
             duel_url (str): The URL of the duel to get information about.
+            replayConcurrency (int, optional): The maximum number of replay requests in flight. Defaults to 8.
+            columnarReplays (bool, optional): Whether to store the replays as compact GeoguessrDuelReplayColumns.
+                Defaults to False.
 
         Returns:
             GeoguessrDuel: An object containing information about the duel.
         """
-        duelToken = duelUrl.split("/")[-2] if "/" in duelUrl else duelUrl
-        async with (await self.session).get(f"https://game-server.geoguessr.com/api/duels/{duelToken}") as r:
-            js = await r.json()
+        duelToken = self.__duel_token(duelUrl)
+        js = (
+            await self._get(
+                f"https://game-server.geoguessr.com/api/duels/{duelToken}",
+                Endpoint.DUEL,
+                self.__is_finished_duel,
+                gu.decode_big_numbers,
+            )
+        ).data
 
         data = GeoguessrDuelData(js)
 
-        await data.set_replays(await self.session)
+        await data.set_replays(
+            await self.session, replayConcurrency, self.__replay_fetcher(data), columnarReplays, self.typedReplays
+        )
 
         return data
 
+    async def get_duels_bulk(
+        self, duelUrls: Iterable[str], concurrency: int = 16, columnarReplays: bool = False
+    ) -> AsyncIterator[DuelFetchResult]:
+        """
+        Gets information about many duels, streaming the results as they complete.
+
+        The duel documents and all of their replays are fetched through one shared budget of
+        `concurrency` requests in flight. A duel that cannot be fetched or parsed is yielded with
+        its error instead of raising, so one broken duel does not stop the others.
+
+        Parameters:
+            duelUrls (Iterable[str]): The URLs or tokens of the duels to get information about.
+            concurrency (int, optional): The maximum number of requests in flight. Defaults to 16.
+            columnarReplays (bool, optional): Whether to store the replays as compact GeoguessrDuelReplayColumns.
+                Defaults to False.
+
+        Yields:
+            DuelFetchResult: The outcome of each duel, in completion order.
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        requestSlots = asyncio.Semaphore(concurrency)
+        # Bound the duels in progress too, so replays of started duels are not queued behind every duel document
+        duelSlots = asyncio.Semaphore(concurrency)
+
+        async def fetch_duel(duelUrl: str) -> DuelFetchResult:
+            async with duelSlots:
+                return await self.__fetch_duel(duelUrl, requestSlots, columnarReplays)
+
+        tasks = [asyncio.ensure_future(fetch_duel(duelUrl)) for duelUrl in duelUrls]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def __fetch_duel(
+        self, duelUrl: str, semaphore: asyncio.Semaphore, columnarReplays: bool = False
+    ) -> DuelFetchResult:
+        start = time.perf_counter()
+        link = f"https://game-server.geoguessr.com/api/duels/{self.__duel_token(duelUrl)}"
+        result = await fetch_one(
+            link,
+            lambda url: self._get_json(url, Endpoint.DUEL, self.__is_finished_duel, gu.decode_big_numbers),
+            semaphore,
+        )
+        if not result.ok:
+            return DuelFetchResult(duelUrl, elapsed=time.perf_counter() - start, error=result.error)
+        try:
+            data = GeoguessrDuelData(result.data)
+            replayResults = await data.set_replays(
+                await self.session, semaphore, self.__replay_fetcher(data), columnarReplays, self.typedReplays
+            )
+        except Exception as e:
+            return DuelFetchResult(duelUrl, elapsed=time.perf_counter() - start, error=e)
+        return DuelFetchResult(duelUrl, data, time.perf_counter() - start, replayResults=replayResults)
+
+    def __replay_fetcher(self, duel: GeoguessrDuelData) -> Fetcher:
+        # Replays of an ongoing duel may still be incomplete, only those of finished duels are cached
+        finished = duel.status == "Finished"
+        # Typed replays are decoded by their schema straight from the body bytes, or from the cached JSON
+        return lambda url: self._get_json(
+            url, Endpoint.REPLAY, lambda _: finished, gu.decode_big_numbers, raw=self.typedReplays
+        )
+
+    @staticmethod
+    def __is_finished_duel(js: Any) -> bool:
+        return isinstance(js, dict) and js.get("status") == "Finished"
+
+    @staticmethod
+    def __duel_token(duelUrl: str) -> str:
+        return duelUrl.split("/")[-2] if "/" in duelUrl else duelUrl
+
     async def get_club_info(self, clubId: str):
         """
         Gets information about a club.
@@ -355,52 +833,53 @@ class Geoguessr:
         Returns:
             GeoguessrClub: An object containing information about the club.
         """
-        async with (await self.session).get(f"https://www.geoguessr.com/api/v4/clubs/{clubId}") as r:
-            js = await r.json()
+        js = (await self._get(f"https://www.geoguessr.com/api/v4/clubs/{clubId}", Endpoint.CLUB)).data
 
         return GeoguessrClub(js)
 
+    async def get_ranked_duel_activities(self) -> list[GeoguessrActivity]:
+        """
+        Gets the ranked duel activities of the feed, newest first.
+
+        The feed is fetched on the first call only. The activities are the indexed entries of
+        `self.activities`, so repeated calls do no formatting.
+
+        Returns:
+            list[GeoguessrActivity]: The ranked duels, with their time as a datetime and their game id.
+        """
+        if not self.activities:
+            self.activities = await self.__get_activities()
+        return self.activities.ranked_duels()
+
     async def get_ranked_duel_activity(self):
         """
         Gets a list of ranked duel activities.
 
+        Deprecated: use get_ranked_duel_activities, which returns the activities with datetimes
+        instead of formatting every entry on each call.
+
         Returns:
             list: A list of tuples, containing the time of the duel in the format '%d-%m-%Y %H:%M:%S' and the URL of the duel.
         """
-        if not self.activities:
-            self.activities = await self.__get_activities()
-        duelList = []
-        for entry in self.activities.entries:
-            if entry.get("payload") is not None:
-                payload = json.loads(entry["payload"])
-                if entry["type"] == 6 and payload["gameMode"] == "Duels":  # Single Ranked Duel
-                    time = datetime.strptime(entry["time"][:19], "%Y-%m-%dT%H:%M:%S").strftime("%d-%m-%Y %H:%M:%S")
-                    gameURL = f'https://www.geoguessr.com/duels/{payload["gameId"]}/summary'
-                    duelList.append((time, gameURL))
-                elif entry["type"] == 7 and isinstance(payload, list):  # List of ranked
-                    for game in payload:
-                        if game["type"] == 6 and game["payload"]["gameMode"] == "Duels":  # Type 6 = Ranked
-                            time = datetime.strptime(game["time"][:19], "%Y-%m-%dT%H:%M:%S").strftime(
-                                "%d-%m-%Y %H:%M:%S"
-                            )
-                            gameURL = f'https://www.geoguessr.com/duels/{game["payload"]["gameId"]}/summary'
-                            duelList.append((time, gameURL))
-                else:
-                    pass
-        return duelList
+        warnings.warn(
+            "get_ranked_duel_activity is deprecated, use get_ranked_duel_activities",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return [
+            (activity.time.strftime("%d-%m-%Y %H:%M:%S"), f"https://www.geoguessr.com/duels/{activity.gameId}/summary")
+            for activity in await self.get_ranked_duel_activities()
+        ]
 
     async def close(self):
-        """Explicitly close the session."""
-        if self._session and not self._session.closed:
+        """Explicitly close the session, unless it is owned by the caller."""
+        if self._ownsSession and self._session and not self._session.closed:
             await self._session.close()
 
     def __del__(self):
-        if self._session and not self._session.closed:
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    loop.create_task(self._session.close())
-                else:
-                    asyncio.run(self._session.close())
-            except (RuntimeError, asyncio.CancelledError):
-                pass
+        # Only a session created by this client is closed, and only on the loop it was created in
+        if not getattr(self, "_ownsSession", False) or not self._session or self._session.closed:
+            return
+        loop = self._sessionLoop
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            loop.create_task(self._session.close())
@@ -0,0 +1,329 @@
+import bisect
+import logging
+import math
+from typing import Any, Callable, Iterable, Optional
+
+try:
+    import prometheus_client
+except ImportError:  # prometheus_client is optional, only needed by PrometheusExporter
+    prometheus_client = None
+
+try:
+    from opentelemetry import metrics as otel_metrics
+except ImportError:  # opentelemetry is optional, only needed by OpenTelemetryExporter
+    otel_metrics = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+"""Default upper bounds of the latency histograms, in seconds, as used by Prometheus."""
+
+
+class RequestEvent:
+    """Represents one HTTP call made by the client, reported to the request hooks.
+
+    Attributes:
+        method (str): The HTTP method.
+        url (str): The requested API URL.
+        endpoint (str): The endpoint template of the URL, see Endpoint, or the URL path if it has none.
+        status (Optional[int]): The HTTP status of the last attempt, None if no response was received.
+        responseBytes (int): The size of the response body, 0 for a cache hit.
+        latency (float): Time from the first attempt to the end of the response body, retries included, in seconds.
+        retries (int): The number of attempts after the first one.
+        cacheHit (bool): Whether the response was served by the client cache without a request.
+        error (Optional[BaseException]): The exception that ended the call, if any.
+    """
+
+    __slots__ = ("method", "url", "endpoint", "status", "responseBytes", "latency", "retries", "cacheHit", "error")
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        status: Optional[int],
+        responseBytes: int = 0,
+        latency: float = 0.0,
+        retries: int = 0,
+        cacheHit: bool = False,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self.method: str = method
+        self.url: str = url
+        self.endpoint: str = endpoint
+        self.status: Optional[int] = status
+        self.responseBytes: int = responseBytes
+        self.latency: float = latency
+        self.retries: int = retries
+        self.cacheHit: bool = cacheHit
+        self.error: Optional[BaseException] = error
+
+    def __repr__(self) -> str:
+        source = "cache" if self.cacheHit else f"HTTP {self.status}"
+        return f"<RequestEvent {self.method} {self.endpoint} {source} {self.latency * 1000:.1f}ms>"
+
+
+RequestHook = Callable[[RequestEvent], None]
+"""Called with every RequestEvent. It runs on the event loop, so it must be quick and must not block."""
+
+
+def emit(hooks: Iterable[RequestHook], event: RequestEvent) -> None:
+    """Report an event to hooks. A failing hook is logged and never fails the request."""
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            logger.exception("Request hook %r failed", hook)
+
+
+def _status_label(event: RequestEvent) -> str:
+    return "error" if event.status is None else str(event.status)
+
+
+class Histogram:
+    """A histogram with fixed buckets, of constant size whatever the number of values.
+
+    Attributes:
+        bounds (tuple[float, ...]): The upper bounds of the buckets, ascending. A last bucket holds the larger values.
+        counts (list[int]): The number of values per bucket.
+        count (int): The number of values.
+        total (float): The sum of the values.
+        max (float): The largest value, 0 without values.
+    """
+
+    def __init__(self, bounds: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.bounds: tuple[float, ...] = tuple(sorted(bounds))
+        self.counts: list[int] = [0] * (len(self.bounds) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        """The mean of the values, NaN without values."""
+        return self.total / self.count if self.count else math.nan
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile, interpolating linearly inside its bucket.
+
+        Args:
+            q (float): The quantile, between 0 and 1, such as 0.99 for the p99.
+
+        Returns:
+            float: The estimate, NaN without values. Values past the last bound are estimated up to the max.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"q must be between 0 and 1, got {q}")
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for i, bucketCount in enumerate(self.counts):
+            if bucketCount and seen + bucketCount >= rank:
+                low = self.bounds[i - 1] if i else 0.0
+                high = self.bounds[i] if i < len(self.bounds) else max(self.max, low)
+                return min(low + (high - low) * (rank - seen) / bucketCount, self.max)
+            seen += bucketCount
+        return self.max
+
+
+class HistogramExporter:
+    """Request hook keeping in-process latency histograms and counters per endpoint.
+
+    Cache hits are counted apart and kept out of the latency histograms, so these only describe
+    requests that reached the API.
+
+    Attributes:
+        latencies (dict[tuple[str, str], Histogram]): Latency of the requests per method and endpoint.
+        statuses (dict[tuple[str, str], dict[Optional[int], int]]): Number of calls per method, endpoint and status.
+        responseBytes (dict[tuple[str, str], int]): Bytes received per method and endpoint.
+        retries (dict[tuple[str, str], int]): Retries per method and endpoint.
+        cacheHits (dict[tuple[str, str], int]): Cache hits per method and endpoint.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        """Initialize HistogramExporter.
+
+        Args:
+            buckets (Iterable[float]): The upper bounds of the latency buckets, in seconds. Defaults to DEFAULT_BUCKETS.
+        """
+        self.buckets: tuple[float, ...] = tuple(buckets)
+        self.latencies: dict[tuple[str, str], Histogram] = {}
+        self.statuses: dict[tuple[str, str], dict[Optional[int], int]] = {}
+        self.responseBytes: dict[tuple[str, str], int] = {}
+        self.retries: dict[tuple[str, str], int] = {}
+        self.cacheHits: dict[tuple[str, str], int] = {}
+
+    def __call__(self, event: RequestEvent) -> None:
+        key = (event.method, event.endpoint)
+        if event.cacheHit:
+            self.cacheHits[key] = self.cacheHits.get(key, 0) + 1
+            return
+        histogram = self.latencies.get(key)
+        if histogram is None:
+            histogram = self.latencies[key] = Histogram(self.buckets)
+        histogram.observe(event.latency)
+        statuses = self.statuses.setdefault(key, {})
+        statuses[event.status] = statuses.get(event.status, 0) + 1
+        self.responseBytes[key] = self.responseBytes.get(key, 0) + event.responseBytes
+        self.retries[key] = self.retries.get(key, 0) + event.retries
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Summarize the calls per endpoint, slowest total time first.
+
+        Returns:
+            list[dict[str, Any]]: One row per method and endpoint, with the number of requests and cache hits,
+                the mean, p50, p95, p99 and max latency in seconds, the bytes received, the retries and the
+                calls per status.
+        """
+        rows = []
+        for key in set(self.latencies) | set(self.cacheHits):
+            histogram = self.latencies.get(key, Histogram(self.buckets))
+            rows.append(
+                {
+                    "method": key[0],
+                    "endpoint": key[1],
+                    "requests": histogram.count,
+                    "cacheHits": self.cacheHits.get(key, 0),
+                    "totalTime": histogram.total,
+                    "mean": histogram.mean,
+                    "p50": histogram.quantile(0.5),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                    "max": histogram.max,
+                    "responseBytes": self.responseBytes.get(key, 0),
+                    "retries": self.retries.get(key, 0),
+                    "statuses": dict(self.statuses.get(key, {})),
+                }
+            )
+        return sorted(rows, key=lambda row: row["totalTime"], reverse=True)
+
+    def report(self) -> str:
+        """Format the summary as a text table, latencies in milliseconds."""
+        lines = [
+            f"{'endpoint':<52} {'requests':>8} {'cached':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'KiB':>9} {'retries':>7}"
+        ]
+        for row in self.summary():
+            lines.append(
+                f"{row['method'] + ' ' + row['endpoint']:<52} {row['requests']:>8} {row['cacheHits']:>6} "
+                f"{row['p50'] * 1000:>8.1f} {row['p95'] * 1000:>8.1f} {row['p99'] * 1000:>8.1f} "
+                f"{row['responseBytes'] / 1024:>9.1f} {row['retries']:>7}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Forget every recorded call."""
+        self.latencies.clear()
+        self.statuses.clear()
+        self.responseBytes.clear()
+        self.retries.clear()
+        self.cacheHits.clear()
+
+
+class PrometheusExporter:
+    """Request hook recording the calls as Prometheus metrics, labelled by method, endpoint and status.
+
+    Metrics:
+        geoguessr_request_duration_seconds (histogram): Latency of the requests that reached the API.
+        geoguessr_response_bytes_total (counter): Bytes received.
+        geoguessr_request_retries_total (counter): Retries.
+        geoguessr_cache_hits_total (counter): Responses served by the client cache, labelled by method and endpoint.
+
+    Requires prometheus_client: `pip install geoguessr_async[prometheus]`.
+    """
+
+    def __init__(
+        self, registry: Any = None, namespace: str = "geoguessr", buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> None:
+        """Initialize PrometheusExporter.
+
+        Args:
+            registry (Any): The prometheus_client CollectorRegistry of the metrics. Defaults to None (the global one).
+            namespace (str): The prefix of the metric names. Defaults to 'geoguessr'.
+            buckets (Iterable[float]): The upper bounds of the latency buckets, in seconds. Defaults to DEFAULT_BUCKETS.
+
+        Raises:
+            ImportError: If prometheus_client is not installed.
+        """
+        if prometheus_client is None:
+            raise ImportError("prometheus_client is required, install geoguessr_async[prometheus]")
+        options = {"namespace": namespace}
+        if registry is not None:
+            options["registry"] = registry
+        labels = ("method", "endpoint", "status")
+        self.duration = prometheus_client.Histogram(
+            "request_duration_seconds", "Latency of the Geoguessr API requests", labels, buckets=buckets, **options
+        )
+        self.responseBytes = prometheus_client.Counter(
+            "response_bytes", "Bytes received from the Geoguessr API", labels, **options
+        )
+        self.retries = prometheus_client.Counter(
+            "request_retries", "Retries of the Geoguessr API requests", labels, **options
+        )
+        self.cacheHits = prometheus_client.Counter(
+            "cache_hits", "Geoguessr API responses served by the client cache", ("method", "endpoint"), **options
+        )
+
+    def __call__(self, event: RequestEvent) -> None:
+        if event.cacheHit:
+            self.cacheHits.labels(event.method, event.endpoint).inc()
+            return
+        labels = (event.method, event.endpoint, _status_label(event))
+        self.duration.labels(*labels).observe(event.latency)
+        self.responseBytes.labels(*labels).inc(event.responseBytes)
+        if event.retries:
+            self.retries.labels(*labels).inc(event.retries)
+
+
+class OpenTelemetryExporter:
+    """Request hook recording the calls as OpenTelemetry metrics, with method, endpoint and status attributes.
+
+    Instruments:
+        geoguessr.request.duration (histogram, s): Latency of the requests that reached the API.
+        geoguessr.response.size (counter, By): Bytes received.
+        geoguessr.request.retries (counter): Retries.
+        geoguessr.cache.hits (counter): Responses served by the client cache.
+
+    Requires the OpenTelemetry API: `pip install geoguessr_async[opentelemetry]`. The metrics are
+    exported by the MeterProvider configured by the application, through the OpenTelemetry SDK.
+    """
+
+    def __init__(self, meterProvider: Any = None) -> None:
+        """Initialize OpenTelemetryExporter.
+
+        Args:
+            meterProvider (Any): The MeterProvider of the instruments. Defaults to None (the global one).
+
+        Raises:
+            ImportError: If opentelemetry-api is not installed.
+        """
+        if otel_metrics is None:
+            raise ImportError("opentelemetry-api is required, install geoguessr_async[opentelemetry]")
+        meter = otel_metrics.get_meter("geoguessr_async", meter_provider=meterProvider)
+        self.duration = meter.create_histogram(
+            "geoguessr.request.duration", unit="s", description="Latency of the Geoguessr API requests"
+        )
+        self.responseSize = meter.create_counter(
+            "geoguessr.response.size", unit="By", description="Bytes received from the Geoguessr API"
+        )
+        self.retries = meter.create_counter("geoguessr.request.retries", description="Retries of the requests")
+        self.cacheHits = meter.create_counter(
+            "geoguessr.cache.hits", description="Geoguessr API responses served by the client cache"
+        )
+
+    def __call__(self, event: RequestEvent) -> None:
+        if event.cacheHit:
+            self.cacheHits.add(1, {"method": event.method, "endpoint": event.endpoint})
+            return
+        attributes = {"method": event.method, "endpoint": event.endpoint, "status": _status_label(event)}
+        self.duration.record(event.latency, attributes)
+        self.responseSize.add(event.responseBytes, attributes)
+        if event.retries:
+            self.retries.add(event.retries, attributes)
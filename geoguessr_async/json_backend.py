@@ -0,0 +1,85 @@
+import json
+from typing import Any, Callable, Optional, Union
+
+JsonLoads = Callable[[Union[bytes, str]], Any]
+"""Decodes a JSON document given as bytes or str. Raises ValueError on invalid JSON."""
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec is optional
+    msgspec = None
+
+BACKENDS = ("orjson", "msgspec", "json")
+"""The supported JSON backends, fastest first."""
+
+
+def _msgspec_loads() -> JsonLoads:
+    decoder = msgspec.json.Decoder()
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return loads
+
+
+def available_backends() -> list[str]:
+    """Get the JSON backends that can be used, fastest first."""
+    return [name for name, module in zip(BACKENDS, (orjson, msgspec, json)) if module is not None]
+
+
+def get_loads(backend: Optional[str] = None) -> JsonLoads:
+    """Get the loads function of a JSON backend.
+
+    Every backend decodes bytes directly, so response bodies need not be decoded to str first.
+
+    Args:
+        backend (Optional[str]): 'orjson', 'msgspec' or 'json'. Defaults to None (the fastest installed one).
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the backend is not installed.
+
+    Returns:
+        JsonLoads: The loads function.
+    """
+    if backend is None:
+        backend = available_backends()[0]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {backend!r}, expected one of {BACKENDS}")
+    if backend == "orjson":
+        if orjson is None:
+            raise ImportError("The 'orjson' JSON backend is not installed")
+        return orjson.loads
+    if backend == "msgspec":
+        if msgspec is None:
+            raise ImportError("The 'msgspec' JSON backend is not installed")
+        return _msgspec_loads()
+    return json.loads
+
+
+loads: JsonLoads = get_loads()
+"""The loads function of the fastest installed backend."""
+
+
+def dumps(obj: Any) -> str:
+    """Encode a JSON document to str with the fastest installed backend.
+
+    Args:
+        obj (Any): The document, made of dicts with str keys, lists and JSON scalars.
+
+    Returns:
+        str: The compact JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    if msgspec is not None:
+        return msgspec.json.encode(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
@@ -1,13 +1,36 @@
-from datetime import datetime
+import asyncio
+import functools
+import math
+from array import array
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Optional, Union
+from typing import IO, Any, Iterable, Iterator, Optional, Union
 
 import aiohttp
 
 import geoguessr_async.geo_utils as gu
+from geoguessr_async import json_backend
+from geoguessr_async.fetcher import Endpoint, Fetcher, FetchResult, fetch_all, session_fetcher
+from geoguessr_async.instrumentation import RequestHook
 
 
 class GeoguessrStr:
+    """Base class of the models.
+
+    The models declare their attributes in `__slots__` instead of storing them in a per-instance
+    `__dict__`, which keeps large collections such as replays compact.
+    """
+
+    __slots__ = ()
+
+    def _iter_fields(self) -> Iterator[tuple[str, Any]]:
+        """Yield the name and value of the attributes set on the object, in declaration order."""
+        for name in _field_names(type(self)):
+            try:
+                yield name, getattr(self, name)
+            except AttributeError:  # Attributes only set in some cases, such as GeoguessrTime
+                continue
+
     def to_tree(self, indent=0):
         """Convert the object to a tree-like string representation.
 
@@ -17,130 +40,230 @@ class GeoguessrStr:
         Returns:
             str: Tree-like string representation of the object.
         """
-        lines = []
+        return "\n".join(self.iter_tree(indent))
+
+    def iter_tree(self, indent: int = 0) -> Iterator[str]:
+        """Yield the lines of `to_tree` one by one, without building the nested strings.
 
-        for name, value in self.__dict__.items():
+        Args:
+            indent (int): Number of spaces to indent each level. Defaults to 0.
+
+        Yields:
+            str: The lines of the tree, without line breaks.
+        """
+        for name, value in self._iter_fields():
+            if name.startswith("_"):  # Private caches are not part of the data
+                continue
             attrSpaces = "    " * indent
 
             if isinstance(value, (int, float, str, bool, type(None))):
-                lines.append(f"{attrSpaces}{name} ({value.__class__.__name__}) = {value!r}")
+                yield f"{attrSpaces}{name} ({value.__class__.__name__}) = {value!r}"
 
             elif hasattr(value, "to_tree"):
-                lines.append(f"{attrSpaces}{name} ({value.__class__.__name__}):")
-                lines.append(value.to_tree(indent + 2))
+                yield f"{attrSpaces}{name} ({value.__class__.__name__}):"
+                yield from _nested_tree(value, indent + 2)
 
             elif isinstance(value, list):
-                lines.append(f"{attrSpaces}{name} ({value.__class__.__name__}):")
-                for item in value:
+                # An empty list prints nothing, not even its name
+                for i, item in enumerate(value):
+                    if i == 0:
+                        yield f"{attrSpaces}{name} ({value.__class__.__name__}):"
+                    else:
+                        yield f"{'    ' * (indent + 1)}--"
                     if hasattr(item, "to_tree"):
-                        lines.append(item.to_tree(indent + 2))
+                        yield from _nested_tree(item, indent + 2)
                     else:
-                        lines.append(f"{'    ' * (indent + 2)}{item!r}")
-                    lines.append(f"{'    ' * (indent + 1)}--")
-                lines.pop()
+                        yield f"{'    ' * (indent + 2)}{item!r}"
 
             elif isinstance(value, dict):
-                lines.append(f"{attrSpaces}{name} ({value.__class__.__name__}):")
+                yield f"{attrSpaces}{name} ({value.__class__.__name__}):"
                 for key, item in value.items():
                     if hasattr(item, "to_tree"):
-                        lines.append(f"{'    ' * (indent + 2)}{key!r}:")
-                        lines.append(item.to_tree(indent + 3))
+                        yield f"{'    ' * (indent + 2)}{key!r}:"
+                        yield from _nested_tree(item, indent + 3)
                     elif isinstance(item, list):
-                        lines.append(f"{'    ' * (indent + 2)}{key!r} ({item.__class__.__name__}):")
+                        yield f"{'    ' * (indent + 2)}{key!r} ({item.__class__.__name__}):"
                         for listItem in item:
                             if hasattr(listItem, "to_tree"):
-                                lines.append(listItem.to_tree(indent + 3))
+                                yield from _nested_tree(listItem, indent + 3)
                             else:
-                                lines.append(f"{'    ' * (indent + 3)}{listItem!r}")
+                                yield f"{'    ' * (indent + 3)}{listItem!r}"
                     else:
-                        lines.append(f"{'    ' * (indent + 2)}{key!r} = {item!r}")
+                        yield f"{'    ' * (indent + 2)}{key!r} = {item!r}"
 
             else:
-                lines.append(f"{attrSpaces}{name} ({value.__class__.__name__}) = {value!r}")
+                yield f"{attrSpaces}{name} ({value.__class__.__name__}) = {value!r}"
 
-        return "\n".join(lines)
+    def write_tree(self, file: IO[str], indent: int = 0) -> None:
+        """Write `to_tree` to a text file line by line, so that the whole tree is never held in memory.
+
+        Args:
+            file (IO[str]): The file-like object written to, such as an open log file or `sys.stdout`.
+            indent (int): Number of spaces to indent each level. Defaults to 0.
+        """
+        lines = self.iter_tree(indent)
+        for line in lines:
+            file.write(line)
+            break
+        for line in lines:
+            file.write("\n")
+            file.write(line)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the object to a dict of JSON types, in one walk over the models.
+
+        Nested models become dicts, enums their value, datetimes ISO 8601 strings and arrays lists.
+
+        Returns:
+            dict[str, Any]: The public attributes of the object.
+        """
+        return {name: _to_json_type(value) for name, value in self._iter_fields() if not name.startswith("_")}
+
+    def to_json(self) -> str:
+        """Convert the object to a JSON document with the fastest installed JSON backend.
+
+        Returns:
+            str: The JSON of `to_dict`.
+        """
+        return json_backend.dumps(self.to_dict())
 
     def __str__(self):
         return self.to_tree()
 
 
+def _nested_tree(value: Any, indent: int) -> Iterator[str]:
+    """Yield the lines of a nested object, or one empty line if it has none, as its joined `to_tree` would."""
+    if not isinstance(value, GeoguessrStr):
+        yield value.to_tree(indent)
+        return
+    empty = True
+    for line in value.iter_tree(indent):
+        empty = False
+        yield line
+    if empty:
+        yield ""
+
+
+def _to_json_type(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, GeoguessrStr):
+        return value.to_dict()
+    if isinstance(value, (list, tuple, array)):
+        return [_to_json_type(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_json_type(item) for key, item in value.items()}
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type) -> tuple[str, ...]:
+    """Get the lazy attributes and the slots of a model class and its bases, base classes first."""
+    names: list[str] = []
+    for klass in reversed(cls.__mro__):
+        names.extend(name for name, value in klass.__dict__.items() if isinstance(value, LazyModel))
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return tuple(names)
+
+
+class LazyModel:
+    """An attribute of a model built from the raw data of its parent on first access, then cached.
+
+    The parent keeps its raw data in a `_datas` slot and the built attributes in a `_lazy` dict slot.
+    Lazy attributes come before the slots of their class in `to_tree`.
+
+    Args:
+        modelType (Union[type, str]): The model built from the raw data, or its name in this module
+            when it is defined further down.
+        key (Optional[str]): The key of the raw data in the parent's data. Defaults to None (the attribute name).
+    """
+
+    def __init__(self, modelType: Union[type, str], key: Optional[str] = None) -> None:
+        self.modelType = modelType
+        self.key = key
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        if self.key is None:
+            self.key = name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        try:
+            return instance._lazy[self.name]
+        except KeyError:
+            if isinstance(self.modelType, str):
+                self.modelType = globals()[self.modelType]
+            value = instance._lazy[self.name] = self.modelType(instance._datas.get(self.key, {}))
+            return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance._lazy[self.name] = value
+
+
 class GeoguessrStats(GeoguessrStr):
     """Represents Geoguessr user statistics.
 
+    The sub-objects, such as `duels` or `battleRoyaleDistance`, are built from the raw data on first
+    access and then cached, so reading one of them does not build the others.
+
     Attributes:
-        battleRoyaleRankRank (int): Battle Royale rank.
-        battleRoyaleRankRating (int): Battle Royale rating.
-        # ... other stats attributes
+        quickplayFlawlessVictories (Optional[int]): Number of flawless quickplay victories.
+        perfectRounds (Optional[int]): Number of perfect rounds.
+        duels (GeoguessrStatsDuels): Duels statistics, like the other sub-objects declared below.
     """
 
+    # Ranked Team Duels
+    rankedTeamDuelsStandard = LazyModel("GeoguessrStatsRankedTeamDuelsStandard")
+    rankedTeamDuelsNoMove = LazyModel("GeoguessrStatsRankedTeamDuelsNoMove")
+    rankedTeamDuelsNmpz = LazyModel("GeoguessrStatsRankedTeamDuelsNmpz")
+    rankedTeamDuelsTotal = LazyModel("GeoguessrStatsRankedTeamDuelsTotal")
+
+    # Battle Royale
+    battleRoyaleDistance = LazyModel("GeoguessrStatsBattleRoyaleDistance")
+    battleRoyaleCountry = LazyModel("GeoguessrStatsBattleRoyaleCountry")
+    battleRoyaleMedals = LazyModel("GeoguessrStatsBattleRoyaleMedals")
+
+    # Competitive
+    competitiveCityStreaks = LazyModel("GeoguessrStatsCompetitiveCityStreaks")
+    competitiveStreaksMedals = LazyModel("GeoguessrStatsCompetitiveStreaksMedals")
+
+    # Duels
+    duels = LazyModel("GeoguessrStatsDuels")
+    duelsNoMove = LazyModel("GeoguessrStatsDuelsNoMove")
+    duelsNmpz = LazyModel("GeoguessrStatsDuelsNmpz")
+    duelsTotal = LazyModel("GeoguessrStatsDuelsTotal")
+    duelsMedals = LazyModel("GeoguessrStatsDuelsMedals")
+
+    # Unranked Duels
+    unrankedDuels = LazyModel("GeoguessrStatsUnrankedDuels")
+    unrankedDuelsNoMove = LazyModel("GeoguessrStatsUnrankedDuelsNoMove")
+    unrankedDuelsNmpz = LazyModel("GeoguessrStatsUnrankedDuelsNmpz")
+    unrankedDuelsTotal = LazyModel("GeoguessrStatsUnrankedDuelsTotal")
+
+    # Progression & Stats
+    lifeTimeXpProgression = LazyModel("GeoguessrStatsLifeTimeXpProgression")
+    totalMedals = LazyModel("GeoguessrStatsTotalMedals")
+    teamDuels = LazyModel("GeoguessrStatsTeamDuels")
+    teamDuelsQuickplay = LazyModel("GeoguessrStatsTeamDuelsQuickplay")
+    party = LazyModel("GeoguessrStatsParty")
+
+    __slots__ = ("_datas", "_lazy", "quickplayFlawlessVictories", "perfectRounds")
+
     def __init__(self, datas: dict) -> None:
         """Initialize GeoguessrStats.
 
         Args:
             datas (dict): Raw stats data from API.
         """
-        # Ranked Team Duels
-        self.rankedTeamDuelsStandard: GeoguessrStatsRankedTeamDuelsStandard = GeoguessrStatsRankedTeamDuelsStandard(
-            datas.get("rankedTeamDuelsStandard", {})
-        )
-        self.rankedTeamDuelsNoMove: GeoguessrStatsRankedTeamDuelsNoMove = GeoguessrStatsRankedTeamDuelsNoMove(
-            datas.get("rankedTeamDuelsNoMove", {})
-        )
-        self.rankedTeamDuelsNmpz: GeoguessrStatsRankedTeamDuelsNmpz = GeoguessrStatsRankedTeamDuelsNmpz(
-            datas.get("rankedTeamDuelsNmpz", {})
-        )
-        self.rankedTeamDuelsTotal: GeoguessrStatsRankedTeamDuelsTotal = GeoguessrStatsRankedTeamDuelsTotal(
-            datas.get("rankedTeamDuelsTotal", {})
-        )
-
-        # Battle Royale
-        self.battleRoyaleDistance: GeoguessrStatsBattleRoyaleDistance = GeoguessrStatsBattleRoyaleDistance(
-            datas.get("battleRoyaleDistance", {})
-        )
-        self.battleRoyaleCountry: GeoguessrStatsBattleRoyaleCountry = GeoguessrStatsBattleRoyaleCountry(
-            datas.get("battleRoyaleCountry", {})
-        )
-        self.battleRoyaleMedals: GeoguessrStatsBattleRoyaleMedals = GeoguessrStatsBattleRoyaleMedals(
-            datas.get("battleRoyaleMedals", {})
-        )
-
-        # Competitive
-        self.competitiveCityStreaks: GeoguessrStatsCompetitiveCityStreaks = GeoguessrStatsCompetitiveCityStreaks(
-            datas.get("competitiveCityStreaks", {})
-        )
-        self.competitiveStreaksMedals: GeoguessrStatsCompetitiveStreaksMedals = GeoguessrStatsCompetitiveStreaksMedals(
-            datas.get("competitiveStreaksMedals", {})
-        )
-
-        # Duels
-        self.duels: GeoguessrStatsDuels = GeoguessrStatsDuels(datas.get("duels", {}))
-        self.duelsNoMove: GeoguessrStatsDuelsNoMove = GeoguessrStatsDuelsNoMove(datas.get("duelsNoMove", {}))
-        self.duelsNmpz: GeoguessrStatsDuelsNmpz = GeoguessrStatsDuelsNmpz(datas.get("duelsNmpz", {}))
-        self.duelsTotal: GeoguessrStatsDuelsTotal = GeoguessrStatsDuelsTotal(datas.get("duelsTotal", {}))
-        self.duelsMedals: GeoguessrStatsDuelsMedals = GeoguessrStatsDuelsMedals(datas.get("duelsMedals", {}))
-
-        # Unranked Duels
-        self.unrankedDuels: GeoguessrStatsUnrankedDuels = GeoguessrStatsUnrankedDuels(datas.get("unrankedDuels", {}))
-        self.unrankedDuelsNoMove: GeoguessrStatsUnrankedDuelsNoMove = GeoguessrStatsUnrankedDuelsNoMove(
-            datas.get("unrankedDuelsNoMove", {})
-        )
-        self.unrankedDuelsNmpz: GeoguessrStatsUnrankedDuelsNmpz = GeoguessrStatsUnrankedDuelsNmpz(
-            datas.get("unrankedDuelsNmpz", {})
-        )
-        self.unrankedDuelsTotal: GeoguessrStatsUnrankedDuelsTotal = GeoguessrStatsUnrankedDuelsTotal(
-            datas.get("unrankedDuelsTotal", {})
-        )
-
-        # Progression & Stats
-        self.lifeTimeXpProgression: GeoguessrStatsLifeTimeXpProgression = GeoguessrStatsLifeTimeXpProgression(
-            datas.get("lifeTimeXpProgression", {})
-        )
-        self.totalMedals: GeoguessrStatsTotalMedals = GeoguessrStatsTotalMedals(datas.get("totalMedals", {}))
-        self.teamDuels: GeoguessrStatsTeamDuels = GeoguessrStatsTeamDuels(datas.get("teamDuels", {}))
-        self.teamDuelsQuickplay: GeoguessrStatsTeamDuelsQuickplay = GeoguessrStatsTeamDuelsQuickplay(
-            datas.get("teamDuelsQuickplay", {})
-        )
-        self.party: GeoguessrStatsParty = GeoguessrStatsParty(datas.get("party", {}))
+        self._datas: dict = datas
+        self._lazy: dict[str, GeoguessrStr] = {}
 
         # Direct stats
         self.quickplayFlawlessVictories: Optional[int] = gu.int_or_none(datas.get("quickplayFlawlessVictories"))
@@ -148,6 +271,8 @@ class GeoguessrStats(GeoguessrStr):
 
 
 class GeoguessrCompetitionMedals(GeoguessrStr):
+    __slots__ = ("bronze", "silver", "gold", "platinum")
+
     def __init__(self, datas: dict) -> None:
         self.bronze: Optional[int] = gu.int_or_none(datas.get("bronze"))
         self.silver: Optional[int] = gu.int_or_none(datas.get("silver"))
@@ -156,6 +281,8 @@ class GeoguessrCompetitionMedals(GeoguessrStr):
 
 
 class GeoguessrPin(GeoguessrStr):
+    __slots__ = ("url", "anchor", "isDefault", "customImage", "fullBody", "borderUrl")
+
     def __init__(self, datas: dict) -> None:
         print(datas)
         self.url: Optional[str] = gu.str_or_none(datas.get("pin", {}).get("url"))
@@ -167,6 +294,8 @@ class GeoguessrPin(GeoguessrStr):
 
 
 class GeoguessrDivision(GeoguessrStr):
+    __slots__ = ("type", "startRating", "endRating")
+
     def __init__(self, datas: dict) -> None:
         self.type: Optional[int] = gu.int_or_none(datas.get("type"))
         self.startRating: Optional[int] = gu.int_or_none(datas.get("startRating"))
@@ -176,6 +305,8 @@ class GeoguessrDivision(GeoguessrStr):
 class GeoguessrCompetitive(GeoguessrStr):
     """Deprecated"""
 
+    __slots__ = ("elo", "rating", "lastRatingChange", "division", "onLeaderboard")
+
     def __init__(self, datas: dict) -> None:
         self.elo: Optional[int] = gu.int_or_none(datas.get("elo"))
         self.rating: Optional[int] = gu.int_or_none(datas.get("rating"))
@@ -185,6 +316,8 @@ class GeoguessrCompetitive(GeoguessrStr):
 
 
 class GeoguessrLevelProgress(GeoguessrStr):
+    __slots__ = ("level", "xp", "levelXpStart", "nextLevelXp", "nextLevel", "title", "competitionMedals")
+
     def __init__(self, datas: dict) -> None:
         self.level: Optional[int] = gu.int_or_none(datas.get("level"))
         self.xp: Optional[int] = gu.int_or_none(datas.get("xp"))
@@ -205,6 +338,40 @@ class GeoguessrProfile(GeoguessrStr):
         # ... other profile attributes
     """
 
+    __slots__ = (
+        "nick",
+        "createdAt",
+        "isProUser",
+        "type",
+        "isVerified",
+        "pin",
+        "color",
+        "url",
+        "id",
+        "countryCode",
+        "battleRoyaleLevel",
+        "battleRoyaleDivision",
+        "streakProgress",
+        "explorerProgress",
+        "dailyChallengeProgress",
+        "progress",
+        "competitive",
+        "lastNameChange",
+        "lastNickOrCountryChange",
+        "isBanned",
+        "chatBan",
+        "nameChangeAvailableAt",
+        "avatarUrl",
+        "isBotUser",
+        "suspendedUntil",
+        "wallet",
+        "flair",
+        "isCreator",
+        "isAppAnonymous",
+        "steamUserType",
+        "stats",
+    )
+
     def __init__(self, datas: dict) -> None:
         """Initialize GeoguessrProfile.
 
@@ -212,7 +379,7 @@ class GeoguessrProfile(GeoguessrStr):
             datas (dict): Raw profile data from API.
         """
         self.nick: str = gu.str_or_none(datas.get("nick"))
-        self.createdAt: datetime = datetime.strptime(datas.get("created").split(".")[0], "%Y-%m-%dT%H:%M:%S")
+        self.createdAt: datetime = gu.datetime_or_none(datas.get("created"))
         self.isProUser: bool = gu.bool_or_none(datas.get("isProUser"))
         self.type: Optional[str] = gu.str_or_none(datas.get("type"))
         self.isVerified: bool = gu.bool_or_none(datas.get("isVerified"))
@@ -230,26 +397,14 @@ class GeoguessrProfile(GeoguessrStr):
         self.competitive: Optional[GeoguessrCompetitive] = (
             GeoguessrCompetitive(datas.get("competitive")) if datas.get("competitive") else None
         )
-        self.lastNameChange: datetime = datetime.strptime(
-            datas.get("lastNameChange").split(".")[0], "%Y-%m-%dT%H:%M:%S"
-        )
-        self.lastNickOrCountryChange: datetime = datetime.strptime(
-            datas.get("lastNickOrCountryChange").split(".")[0], "%Y-%m-%dT%H:%M:%S"
-        )
+        self.lastNameChange: datetime = gu.datetime_or_none(datas.get("lastNameChange"))
+        self.lastNickOrCountryChange: datetime = gu.datetime_or_none(datas.get("lastNickOrCountryChange"))
         self.isBanned: bool = gu.bool_or_none(datas.get("isBanned"))
         self.chatBan: bool = gu.bool_or_none(datas.get("chatBan"))
-        self.nameChangeAvailableAt: Optional[datetime] = (
-            datetime.strptime(datas.get("nameChangeAvailableAt").split(".")[0], "%Y-%m-%dT%H:%M:%S")
-            if datas.get("nameChangeAvailableAt")
-            else None
-        )
+        self.nameChangeAvailableAt: Optional[datetime] = gu.datetime_or_none(datas.get("nameChangeAvailableAt"))
         self.avatarUrl: Optional[str] = datas.get("avatar", {}).get("fullbodypath")
         self.isBotUser: bool = gu.bool_or_none(datas.get("isBotUser"))
-        self.suspendedUntil: Optional[datetime] = (
-            datetime.strptime(datas.get("suspendedUntil").split(".")[0], "%Y-%m-%dT%H:%M:%S")
-            if datas.get("suspendedUntil")
-            else None
-        )
+        self.suspendedUntil: Optional[datetime] = gu.datetime_or_none(datas.get("suspendedUntil"))
         self.wallet: Optional[int] = gu.int_or_none(datas.get("wallet"))
         self.flair: Optional[int] = gu.int_or_none(datas.get("flair"))
         self.isCreator: Optional[bool] = gu.bool_or_none(datas.get("isCreator"))
@@ -272,6 +427,21 @@ class GeoguessrChallenge(GeoguessrStr):
         # ... other challenge attributes
     """
 
+    __slots__ = (
+        "token",
+        "mapSlug",
+        "roundCount",
+        "timeLimit",
+        "movementOptions",
+        "guessMapType",
+        "numberOfParticipants",
+        "gameMode",
+        "challengeType",
+        "streakType",
+        "accessLevel",
+        "locationOrder",
+    )
+
     def __init__(self, datas: dict) -> None:
         """Initialize GeoguessrChallenge.
 
@@ -302,6 +472,8 @@ class GeoguessrChallengeRound(GeoguessrStr):
         # ... other round attributes
     """
 
+    __slots__ = ("number", "lat", "long", "panoId", "heading", "pitch", "zoom", "streakLocationCode", "startTime")
+
     def __init__(self, roundData: dict, roundNumber: Optional[int]) -> None:
         """Initialize GeoguessrChallengeRound.
 
@@ -317,7 +489,7 @@ class GeoguessrChallengeRound(GeoguessrStr):
         self.pitch: float = gu.float_or_none(roundData.get("pitch"))
         self.zoom: float = gu.float_or_none(roundData.get("zoom"))
         self.streakLocationCode: Optional[str] = roundData.get("streakLocationCode")
-        self.startTime: datetime = datetime.strptime(roundData.get("startTime", "").split(".")[0], "%Y-%m-%dT%H:%M:%S")
+        self.startTime: datetime = gu.datetime_or_none(roundData.get("startTime"))
 
 
 class GeoguessrScore(GeoguessrStr):
@@ -329,6 +501,8 @@ class GeoguessrScore(GeoguessrStr):
         percentage (float): Score percentage.
     """
 
+    __slots__ = ("amount", "unit", "percentage")
+
     def __init__(self, scoreData: dict) -> None:
         """Initialize GeoguessrScore.
 
@@ -349,6 +523,8 @@ class GeoguessrDistance(GeoguessrStr):
         miles (float): Distance in miles.
     """
 
+    __slots__ = ("meters", "kilometers", "miles")
+
     def __init__(self, distanceData: dict) -> None:
         """Initialize GeoguessrDistance.
 
@@ -372,6 +548,8 @@ class GeoguessrTime(GeoguessrStr):
         hours (float): Time in hours.
     """
 
+    __slots__ = ("seconds", "minutes", "hours")
+
     def __init__(
         self, seconds: Optional[float] = None, minutes: Optional[float] = None, hours: Optional[float] = None
     ) -> None:
@@ -410,6 +588,23 @@ class GeoguessrPlayerGuesses(GeoguessrStr):
         # ... other guess attributes
     """
 
+    __slots__ = (
+        "number",
+        "lat",
+        "long",
+        "timedOut",
+        "timedOutWithGuess",
+        "skippedRound",
+        "roundScore",
+        "roundScoreInPercentage",
+        "roundScoreInPoints",
+        "distance",
+        "distanceInMeters",
+        "stepsCount",
+        "streakLocationCode",
+        "time",
+    )
+
     def __init__(self, guessData: dict[str, str], roundNumber: Optional[int]) -> None:
         """Initialize GeoguessrPlayerGuesses.
 
@@ -434,6 +629,8 @@ class GeoguessrPlayerGuesses(GeoguessrStr):
 
 
 class GeoguessrGameBounds(GeoguessrStr):
+    __slots__ = ("minLat", "minLng", "maxLat", "maxLng")
+
     def __init__(self, datas: dict) -> None:
         self.minLat: float = gu.float_or_none(datas.get("min", {}).get("lat"))
         self.minLng: float = gu.float_or_none(datas.get("min", {}).get("lng"))
@@ -442,12 +639,16 @@ class GeoguessrGameBounds(GeoguessrStr):
 
 
 class GeoguessrLevel(GeoguessrStr):
+    __slots__ = ("level", "xpStart")
+
     def __init__(self, datas: dict) -> None:
         self.level: int = gu.int_or_none(datas.get("level"))
         self.xpStart: int = gu.int_or_none(datas.get("xpStart"))
 
 
 class GeoguessrXpTitle(GeoguessrStr):
+    __slots__ = ("id", "tierId", "minimumLevel", "name")
+
     def __init__(self, datas: dict) -> None:
         self.id: int = gu.int_or_none(datas.get("id"))
         self.tierId: int = gu.int_or_none(datas.get("tierId"))
@@ -456,6 +657,23 @@ class GeoguessrXpTitle(GeoguessrStr):
 
 
 class GeoguessrScorePlayerInfo(GeoguessrStr):
+    __slots__ = (
+        "isLeader",
+        "id",
+        "nick",
+        "isVerified",
+        "flair",
+        "countryCode",
+        "pinUrl",
+        "xpBeforeChallenge",
+        "xpAfterChallenge",
+        "xpGained",
+        "levelBeforeChallenge",
+        "levelAfterChallenge",
+        "titleBeforeChallenge",
+        "titleAfterChallenge",
+    )
+
     def __init__(self, playerDatas: dict, progressionDatas: dict) -> None:
         self.isLeader: bool = gu.bool_or_none(playerDatas.get("isLeader"))
         self.id: str = gu.str_or_none(playerDatas.get("id"))
@@ -486,6 +704,8 @@ class GeoguessrScorePlayerInfo(GeoguessrStr):
 
 
 class GeoguessrChallengePlayerTotalResult(GeoguessrStr):
+    __slots__ = ("totalScore", "totalDistance", "totalStepsCount", "totalTime", "totalStreak", "guesses")
+
     def __init__(self, datas: dict) -> None:
         self.totalScore: GeoguessrScore = GeoguessrScore(datas.get("totalScore"))
         self.totalDistance: GeoguessrDistance = GeoguessrDistance(datas.get("totalDistance"))
@@ -498,6 +718,21 @@ class GeoguessrChallengePlayerTotalResult(GeoguessrStr):
 
 
 class GeoguessrChallengeResult(GeoguessrStr):
+    __slots__ = (
+        "player",
+        "type",
+        "mode",
+        "state",
+        "roundCount",
+        "streakType",
+        "map",
+        "mapname",
+        "panoramaprovider",
+        "bounds",
+        "rounds",
+        "playerTotalScore",
+    )
+
     def __init__(self, datas: dict) -> None:
         gameDatas: Optional[dict] = datas.get("game")
         if gameDatas is None:
@@ -525,6 +760,8 @@ class GeoguessrChallengeResult(GeoguessrStr):
 
 
 class GeoguessMapAvatar(GeoguessrStr):
+    __slots__ = ("background", "decoration", "ground", "landscape")
+
     def __init__(self, datas: dict) -> None:
         self.background: str = gu.str_or_none(datas.get("background"))
         self.decoration: str = gu.str_or_none(datas.get("decoration"))
@@ -533,6 +770,43 @@ class GeoguessMapAvatar(GeoguessrStr):
 
 
 class GeoguessrMap(GeoguessrStr):
+    __slots__ = (
+        "id",
+        "name",
+        "slug",
+        "description",
+        "url",
+        "playUrl",
+        "published",
+        "banned",
+        "backGround",
+        "bounds",
+        "customCoordinates",
+        "coordinatesCount",
+        "regions",
+        "creator",
+        "createdAt",
+        "updatedAt",
+        "numFinishedGames",
+        "likedByUser",
+        "averageScore",
+        "avatar",
+        "difficulty",
+        "difficultyLevel",
+        "highscore",
+        "deleted",
+        "free",
+        "panoramaprovider",
+        "inExplorerMode",
+        "maxErrorDistance",
+        "likes",
+        "locationSelectionMode",
+        "tags",
+        "collaborators",
+        "flair",
+        "mapSize",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.id: str = gu.str_or_none(datas.get("id"))
         self.name: str = gu.str_or_none(datas.get("name"))
@@ -572,13 +846,45 @@ class GeoguessrMap(GeoguessrStr):
         self.mapSize: Optional[dict] = datas.get("mapSize")
 
 
+class GeoguessrActivity(GeoguessrStr):
+    """Represents one decoded activity of the feed.
+
+    Attributes:
+        type (int): Activity type (6 is a ranked game).
+        time (datetime): Time of the activity.
+        payload (Any): Decoded payload of the activity.
+        gameMode (Optional[str]): Game mode of the activity, such as 'Duels', if any.
+        gameId (Optional[str]): Id of the game of the activity, if any.
+    """
+
+    __slots__ = ("type", "time", "payload", "gameMode", "gameId")
+
+    def __init__(self, datas: dict, payload: Any) -> None:
+        """Initialize GeoguessrActivity.
+
+        Args:
+            datas (dict): Raw activity data from the feed.
+            payload (Any): The already decoded payload of the activity.
+        """
+        self.type: Optional[int] = gu.int_or_none(datas.get("type"))
+        self.time: Optional[datetime] = gu.datetime_or_none(datas.get("time"))
+        self.payload: Any = payload
+        self.gameMode: Optional[str] = payload.get("gameMode") if isinstance(payload, dict) else None
+        self.gameId: Optional[str] = payload.get("gameId") if isinstance(payload, dict) else None
+
+
 class GeoguessrActivities(GeoguessrStr):
     """Represents Geoguessr activities data.
 
+    The raw entries are decoded lazily, once each, into GeoguessrActivity objects indexed by type
+    and game mode. Grouped entries (type 7) are split into one activity per game.
+
     Attributes:
         entries (list): List of activity entries.
     """
 
+    __slots__ = ("entries", "_activities", "_byType", "_byGameMode", "_byTypeAndGameMode", "_indexedCount")
+
     def __init__(self, entries: list) -> None:
         """Initialize GeoguessrActivities.
 
@@ -586,6 +892,62 @@ class GeoguessrActivities(GeoguessrStr):
             entries (list): List of activity entries.
         """
         self.entries = entries
+        self._activities: list[GeoguessrActivity] = []
+        self._byType: dict[Optional[int], list[GeoguessrActivity]] = {}
+        self._byGameMode: dict[Optional[str], list[GeoguessrActivity]] = {}
+        self._byTypeAndGameMode: dict[tuple[Optional[int], Optional[str]], list[GeoguessrActivity]] = {}
+        self._indexedCount = 0
+
+    @property
+    def activities(self) -> list[GeoguessrActivity]:
+        """All decoded activities, in feed order."""
+        self._index()
+        return list(self._activities)
+
+    def filter(self, activityType: Optional[int] = None, gameMode: Optional[str] = None) -> list[GeoguessrActivity]:
+        """Get the decoded activities of a type and/or game mode, in feed order.
+
+        Args:
+            activityType (Optional[int]): The activity type to keep. Defaults to None (any type).
+            gameMode (Optional[str]): The game mode to keep, such as 'Duels'. Defaults to None (any mode).
+
+        Returns:
+            list[GeoguessrActivity]: The matching activities.
+        """
+        self._index()
+        if activityType is None and gameMode is None:
+            return list(self._activities)
+        if gameMode is None:
+            return list(self._byType.get(activityType, []))
+        if activityType is None:
+            return list(self._byGameMode.get(gameMode, []))
+        return list(self._byTypeAndGameMode.get((activityType, gameMode), []))
+
+    def ranked_duels(self) -> list[GeoguessrActivity]:
+        """Get the ranked Duels activities, in feed order."""
+        return self.filter(6, "Duels")
+
+    def _index(self) -> None:
+        # Only the entries added since the last call are decoded
+        for entry in self.entries[self._indexedCount :]:
+            for activity in self._parse_entry(entry):
+                self._activities.append(activity)
+                self._byType.setdefault(activity.type, []).append(activity)
+                self._byGameMode.setdefault(activity.gameMode, []).append(activity)
+                self._byTypeAndGameMode.setdefault((activity.type, activity.gameMode), []).append(activity)
+        self._indexedCount = len(self.entries)
+
+    @staticmethod
+    def _parse_entry(entry: dict) -> list[GeoguessrActivity]:
+        payload = entry.get("payload")
+        if isinstance(payload, str):
+            try:
+                payload = json_backend.loads(payload)
+            except ValueError:
+                pass
+        if entry.get("type") == 7 and isinstance(payload, list):  # List of games
+            return [GeoguessrActivity(game, game.get("payload")) for game in payload]
+        return [GeoguessrActivity(entry, payload)]
 
 
 class GeoguessrUserELO(GeoguessrStr):
@@ -601,6 +963,16 @@ class GeoguessrUserELO(GeoguessrStr):
         gameModeRatingsNomoveduels (int): No-move duels rating.
     """
 
+    __slots__ = (
+        "divisionNumber",
+        "divisionName",
+        "rating",
+        "tier",
+        "gameModeRatingsStandardduels",
+        "gameModeRatingsNmpzduels",
+        "gameModeRatingsNomoveduels",
+    )
+
     def __init__(self, datas: dict) -> None:
         """Initialize GeoguessrUserELO.
 
@@ -620,6 +992,8 @@ class GeoguessrUserELO(GeoguessrStr):
 class GeoguessrStatsRankedTeamDuelsStandard(GeoguessrStr):
     """Represents ranked team duels standard statistics."""
 
+    __slots__ = ("numGamesPlayed", "numWins", "winRatio")
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.numWins: int = gu.int_or_none(datas.get("numWins"))
@@ -629,6 +1003,8 @@ class GeoguessrStatsRankedTeamDuelsStandard(GeoguessrStr):
 class GeoguessrStatsRankedTeamDuelsNoMove(GeoguessrStr):
     """Represents ranked team duels no move statistics."""
 
+    __slots__ = ("numGamesPlayed", "numWins", "winRatio")
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.numWins: int = gu.int_or_none(datas.get("numWins"))
@@ -638,6 +1014,8 @@ class GeoguessrStatsRankedTeamDuelsNoMove(GeoguessrStr):
 class GeoguessrStatsRankedTeamDuelsNmpz(GeoguessrStr):
     """Represents ranked team duels NMPZ statistics."""
 
+    __slots__ = ("numGamesPlayed", "numWins", "winRatio")
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.numWins: int = gu.int_or_none(datas.get("numWins"))
@@ -647,6 +1025,8 @@ class GeoguessrStatsRankedTeamDuelsNmpz(GeoguessrStr):
 class GeoguessrStatsRankedTeamDuelsTotal(GeoguessrStr):
     """Represents ranked team duels total statistics."""
 
+    __slots__ = ("numGamesPlayed", "numWins", "winRatio")
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.numWins: int = gu.int_or_none(datas.get("numWins"))
@@ -656,6 +1036,8 @@ class GeoguessrStatsRankedTeamDuelsTotal(GeoguessrStr):
 class GeoguessrStatsBattleRoyaleDistance(GeoguessrStr):
     """Represents battle royale distance statistics."""
 
+    __slots__ = ("numGamesPlayed", "avgPosition", "numWins", "winRatio", "avgGuessDistance", "numGuesses")
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.avgPosition: float = gu.float_or_none(datas.get("avgPosition"))
@@ -668,6 +1050,8 @@ class GeoguessrStatsBattleRoyaleDistance(GeoguessrStr):
 class GeoguessrStatsBattleRoyaleCountry(GeoguessrStr):
     """Represents battle royale country statistics."""
 
+    __slots__ = ("numGamesPlayed", "avgPosition", "numWins", "winRatio", "numGuesses", "avgCorrectGuesses")
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.avgPosition: float = gu.float_or_none(datas.get("avgPosition"))
@@ -680,6 +1064,8 @@ class GeoguessrStatsBattleRoyaleCountry(GeoguessrStr):
 class GeoguessrStatsBattleRoyaleMedals(GeoguessrStr):
     """Represents battle royale medals statistics."""
 
+    __slots__ = ("medalCountGold", "medalCountSilver", "medalCountBronze")
+
     def __init__(self, datas: dict) -> None:
         self.medalCountGold: int = gu.int_or_none(datas.get("medalCountGold"))
         self.medalCountSilver: int = gu.int_or_none(datas.get("medalCountSilver"))
@@ -689,6 +1075,8 @@ class GeoguessrStatsBattleRoyaleMedals(GeoguessrStr):
 class GeoguessrStatsCompetitiveCityStreaks(GeoguessrStr):
     """Represents competitive city streaks statistics."""
 
+    __slots__ = ("numGamesPlayed", "avgPosition", "numWins", "winRatio", "numGuesses", "avgCorrectGuesses")
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.avgPosition: float = gu.float_or_none(datas.get("avgPosition"))
@@ -701,6 +1089,8 @@ class GeoguessrStatsCompetitiveCityStreaks(GeoguessrStr):
 class GeoguessrStatsCompetitiveStreaksMedals(GeoguessrStr):
     """Represents competitive streaks medals statistics."""
 
+    __slots__ = ("medalCountGold", "medalCountSilver", "medalCountBronze")
+
     def __init__(self, datas: dict) -> None:
         self.medalCountGold: int = gu.int_or_none(datas.get("medalCountGold"))
         self.medalCountSilver: int = gu.int_or_none(datas.get("medalCountSilver"))
@@ -710,6 +1100,16 @@ class GeoguessrStatsCompetitiveStreaksMedals(GeoguessrStr):
 class GeoguessrStatsDuels(GeoguessrStr):
     """Represents duels statistics."""
 
+    __slots__ = (
+        "numGamesPlayed",
+        "avgPosition",
+        "numWins",
+        "winRatio",
+        "avgGuessDistance",
+        "numGuesses",
+        "numFlawlessWins",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.avgPosition: float = gu.float_or_none(datas.get("avgPosition"))
@@ -723,6 +1123,16 @@ class GeoguessrStatsDuels(GeoguessrStr):
 class GeoguessrStatsDuelsNoMove(GeoguessrStr):
     """Represents duels no move statistics."""
 
+    __slots__ = (
+        "numGamesPlayed",
+        "avgPosition",
+        "numWins",
+        "winRatio",
+        "avgGuessDistance",
+        "numGuesses",
+        "numFlawlessWins",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.avgPosition: float = gu.float_or_none(datas.get("avgPosition"))
@@ -736,6 +1146,16 @@ class GeoguessrStatsDuelsNoMove(GeoguessrStr):
 class GeoguessrStatsDuelsNmpz(GeoguessrStr):
     """Represents duels NMPZ statistics."""
 
+    __slots__ = (
+        "numGamesPlayed",
+        "avgPosition",
+        "numWins",
+        "winRatio",
+        "avgGuessDistance",
+        "numGuesses",
+        "numFlawlessWins",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.avgPosition: float = gu.float_or_none(datas.get("avgPosition"))
@@ -749,6 +1169,16 @@ class GeoguessrStatsDuelsNmpz(GeoguessrStr):
 class GeoguessrStatsDuelsTotal(GeoguessrStr):
     """Represents duels total statistics."""
 
+    __slots__ = (
+        "numGamesPlayed",
+        "avgPosition",
+        "numWins",
+        "winRatio",
+        "avgGuessDistance",
+        "numGuesses",
+        "numFlawlessWins",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.avgPosition: float = gu.float_or_none(datas.get("avgPosition"))
@@ -762,6 +1192,8 @@ class GeoguessrStatsDuelsTotal(GeoguessrStr):
 class GeoguessrStatsDuelsMedals(GeoguessrStr):
     """Represents duels medals statistics."""
 
+    __slots__ = ("medalCountGold", "medalCountSilver", "medalCountBronze")
+
     def __init__(self, datas: dict) -> None:
         self.medalCountGold: int = gu.int_or_none(datas.get("medalCountGold"))
         self.medalCountSilver: int = gu.int_or_none(datas.get("medalCountSilver"))
@@ -771,6 +1203,16 @@ class GeoguessrStatsDuelsMedals(GeoguessrStr):
 class GeoguessrStatsUnrankedDuels(GeoguessrStr):
     """Represents unranked duels statistics."""
 
+    __slots__ = (
+        "numGamesPlayed",
+        "avgPosition",
+        "numWins",
+        "winRatio",
+        "avgGuessDistance",
+        "numGuesses",
+        "numFlawlessWins",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.avgPosition: float = gu.float_or_none(datas.get("avgPosition"))
@@ -784,6 +1226,16 @@ class GeoguessrStatsUnrankedDuels(GeoguessrStr):
 class GeoguessrStatsUnrankedDuelsNoMove(GeoguessrStr):
     """Represents unranked duels no move statistics."""
 
+    __slots__ = (
+        "numGamesPlayed",
+        "avgPosition",
+        "numWins",
+        "winRatio",
+        "avgGuessDistance",
+        "numGuesses",
+        "numFlawlessWins",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.avgPosition: float = gu.float_or_none(datas.get("avgPosition"))
@@ -797,6 +1249,16 @@ class GeoguessrStatsUnrankedDuelsNoMove(GeoguessrStr):
 class GeoguessrStatsUnrankedDuelsNmpz(GeoguessrStr):
     """Represents unranked duels NMPZ statistics."""
 
+    __slots__ = (
+        "numGamesPlayed",
+        "avgPosition",
+        "numWins",
+        "winRatio",
+        "avgGuessDistance",
+        "numGuesses",
+        "numFlawlessWins",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.avgPosition: float = gu.float_or_none(datas.get("avgPosition"))
@@ -810,6 +1272,16 @@ class GeoguessrStatsUnrankedDuelsNmpz(GeoguessrStr):
 class GeoguessrStatsUnrankedDuelsTotal(GeoguessrStr):
     """Represents unranked duels total statistics."""
 
+    __slots__ = (
+        "numGamesPlayed",
+        "avgPosition",
+        "numWins",
+        "winRatio",
+        "avgGuessDistance",
+        "numGuesses",
+        "numFlawlessWins",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.avgPosition: float = gu.float_or_none(datas.get("avgPosition"))
@@ -823,6 +1295,8 @@ class GeoguessrStatsUnrankedDuelsTotal(GeoguessrStr):
 class GeoguessrStatsLifeTimeXpProgression(GeoguessrStr):
     """Represents lifetime XP progression statistics."""
 
+    __slots__ = ("xp", "currentLevel", "nextLevel", "currentTitle")
+
     def __init__(self, datas: dict) -> None:
         self.xp: int = gu.int_or_none(datas.get("xp"))
         self.currentLevel: GeoguessrLevel = GeoguessrLevel(datas.get("currentLevel"))
@@ -833,6 +1307,8 @@ class GeoguessrStatsLifeTimeXpProgression(GeoguessrStr):
 class GeoguessrStatsTotalMedals(GeoguessrStr):
     """Represents total medals statistics."""
 
+    __slots__ = ("medalCountGold", "medalCountSilver", "medalCountBronze")
+
     def __init__(self, datas: dict) -> None:
         self.medalCountGold: int = gu.int_or_none(datas.get("medalCountGold"))
         self.medalCountSilver: int = gu.int_or_none(datas.get("medalCountSilver"))
@@ -842,6 +1318,8 @@ class GeoguessrStatsTotalMedals(GeoguessrStr):
 class GeoguessrStatsTeamDuels(GeoguessrStr):
     """Represents team duels statistics."""
 
+    __slots__ = ("numGamesPlayed", "numWins", "winRatio")
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.numWins: int = gu.int_or_none(datas.get("numWins"))
@@ -851,6 +1329,8 @@ class GeoguessrStatsTeamDuels(GeoguessrStr):
 class GeoguessrStatsTeamDuelsQuickplay(GeoguessrStr):
     """Represents team duels quickplay statistics."""
 
+    __slots__ = ("numGamesPlayed", "numWins")
+
     def __init__(self, datas: dict) -> None:
         self.numGamesPlayed: int = gu.int_or_none(datas.get("numGamesPlayed"))
         self.numWins: int = gu.int_or_none(datas.get("numWins"))
@@ -859,6 +1339,25 @@ class GeoguessrStatsTeamDuelsQuickplay(GeoguessrStr):
 class GeoguessrDuelData(GeoguessrStr):
     """Represents complete Geoguessr duel data."""
 
+    __slots__ = (
+        "gameId",
+        "context",
+        "teams",
+        "rounds",
+        "totalRoundCount",
+        "status",
+        "version",
+        "options",
+        "initialHealth",
+        "maxNumberOfRounds",
+        "result",
+        "isPaused",
+        "gameServerNodeId",
+        "tournamentId",
+        "playersId",
+        "replays",
+    )
+
     def __init__(self, datas: dict) -> None:
         """Initialize GeoguessrDuelData.
 
@@ -880,21 +1379,80 @@ class GeoguessrDuelData(GeoguessrStr):
         self.gameServerNodeId: str = gu.str_or_none(datas.get("gameServerNodeId"))
         self.tournamentId: str = gu.str_or_none(datas.get("tournamentId"))
         self.playersId = [player.playerId for team in self.teams for player in team.players]
-        self.replays: Optional[dict[str, list[GeoguessrDuelReplay]]] = {playerId: [] for playerId in self.playersId}
+        self.replays: Optional[dict[str, list[Optional[Union[GeoguessrDuelReplay, GeoguessrDuelReplayColumns]]]]] = {
+            playerId: [] for playerId in self.playersId
+        }
 
-    async def set_replays(self, session: aiohttp.ClientSession) -> None:
-        """Get the replays of the duel."""
-        for playerId in self.playersId:
-            for i in range(self.totalRoundCount):
-                async with session.get(
-                    f"https://game-server.geoguessr.com/api/replays/{playerId}/{self.gameId}/{i+1}"
-                ) as r:
-                    self.replays[playerId].append(GeoguessrDuelReplay(await r.json()))
+    async def set_replays(
+        self,
+        session: aiohttp.ClientSession,
+        concurrency: Union[int, asyncio.Semaphore] = 8,
+        fetcher: Optional[Fetcher] = None,
+        columnar: bool = False,
+        typed: bool = False,
+        hooks: Iterable[RequestHook] = (),
+    ) -> list[FetchResult]:
+        """Get the replays of the duel.
+
+        The replays of every player and round are fetched concurrently. Each player's replays are
+        kept in round order; a round whose replay could not be fetched or parsed is stored as None,
+        with the error on its FetchResult, so that one broken round does not prevent the others from
+        being retrieved.
+
+        Args:
+            session (aiohttp.ClientSession): The session used to fetch the replays.
+            concurrency (Union[int, asyncio.Semaphore]): The maximum number of requests in flight,
+                or a semaphore shared with other fetches. Defaults to 8.
+            fetcher (Optional[Fetcher]): The callable used to fetch each replay URL, such as the client's
+                cached request path. Defaults to None (plain GET requests with `session`).
+            columnar (bool): Whether to store the replays as GeoguessrDuelReplayColumns, which use far less
+                memory than GeoguessrDuelReplay. Defaults to False.
+            typed (bool): Whether to decode the replays through their msgspec schemas (see `schemas`), which
+                is faster and gives the same models. The fetcher may return the raw bodies, decoded directly by
+                the schemas, or decoded JSON. Without a fetcher, the raw bodies are fetched. Requires msgspec.
+                Defaults to False.
+            hooks (Iterable[RequestHook]): Called with a RequestEvent for every replay request sent with `session`.
+                A client fetcher reports to the hooks of its client instead. Defaults to none.
+
+        Returns:
+            list[FetchResult]: The outcome of every replay request, with its duration and error if any.
+        """
+        urls = [
+            f"https://game-server.geoguessr.com/api/replays/{playerId}/{self.gameId}/{i+1}"
+            for playerId in self.playersId
+            for i in range(self.totalRoundCount or 0)
+        ]
+        if typed:
+            # schemas imports this module, so it is only loaded when typed decoding is asked for
+            from geoguessr_async import schemas
+
+            replayType = schemas.decode_replay_columns if columnar else schemas.decode_replay
+            fetcher = fetcher or session_fetcher(
+                session, loads=lambda body: body, hooks=hooks, endpoint=Endpoint.REPLAY
+            )
+        else:
+            replayType = GeoguessrDuelReplayColumns if columnar else GeoguessrDuelReplay
+            fetcher = fetcher or session_fetcher(session, gu.decode_big_numbers, hooks=hooks, endpoint=Endpoint.REPLAY)
+        results = await fetch_all(urls, fetcher, concurrency)
+
+        self.replays = {playerId: [] for playerId in self.playersId}
+        for i, result in enumerate(results):
+            playerId = self.playersId[i // self.totalRoundCount]
+            replay = None
+            if result.ok:
+                try:
+                    replay = replayType(result.data)
+                except Exception as e:  # A malformed replay only loses its round
+                    result.data, result.error = None, e
+            self.replays[playerId].append(replay)
+        return results
 
 
 class GeoguessrDuelReplay(GeoguessrStr):
     """Represente a player replay in a duel."""
 
+    __slots__ = ("datas",)
+
     class Type(Enum):
         """Type of replay."""
 
@@ -913,8 +1471,10 @@ class GeoguessrDuelReplay(GeoguessrStr):
 
 
 class GeoguessrDuelReplayStep(GeoguessrStr):
+    __slots__ = ("time", "type", "payload")
+
     def __init__(self, datas: dict) -> None:
-        self.time: datetime = datetime.fromtimestamp(float(datas.get("time")) / 1000)
+        self.time: datetime = datetime.fromtimestamp(float(datas.get("time")) / 1000, tz=timezone.utc)
         self.type: GeoguessrDuelReplay.Type = GeoguessrDuelReplay.Type(datas.get("type"))
         self.payload: Optional[
             Union[
@@ -928,35 +1488,29 @@ class GeoguessrDuelReplayStep(GeoguessrStr):
                 GeoguessrDuelReplayTimerPayload,
             ]
         ] = None
-        payloadTypes = {
-            GeoguessrDuelReplay.Type.PANOPOSITION: GeoguessrDuelReplayPanoPositionPayload,
-            GeoguessrDuelReplay.Type.PANOPOV: GeoguessrDuelReplayPanoPovPayload,
-            GeoguessrDuelReplay.Type.PANOZOOM: GeoguessrDuelReplayPanoZoomPayload,
-            GeoguessrDuelReplay.Type.MAPZOOM: GeoguessrDuelReplayMapZoomPayload,
-            GeoguessrDuelReplay.Type.MAPPOSITION: GeoguessrDuelReplayMapPositionPayload,
-            GeoguessrDuelReplay.Type.GUESSWITHLATLNG: GeoguessrDuelReplayGuessWithLatLngPayload,
-            GeoguessrDuelReplay.Type.PINPOSITION: GeoguessrDuelReplayPinPositionPayload,
-            GeoguessrDuelReplay.Type.TIMER: GeoguessrDuelReplayTimerPayload,
-            GeoguessrDuelReplay.Type.MAPDISPLAY: GeoguessrDuelReplayMapDisplayPayload,
-        }
-        payloadType = payloadTypes.get(self.type)
+        payloadType = REPLAY_PAYLOAD_TYPES.get(self.type)
 
         if payloadType is not None:
-            self.payload = payloadType(datas.get("payload"))
+            # A null payload gives a payload of None fields, as the typed decoding does
+            self.payload = payloadType(datas.get("payload") or {})
 
 
 class GeoguessrDuelReplayPanoPositionPayload(GeoguessrStr):
     """Represents PanoPosition type payload data."""
 
+    __slots__ = ("lat", "lng", "panoId")
+
     def __init__(self, datas: dict) -> None:
-        self.lat: dict = datas.get("lat")
-        self.lng: dict = datas.get("lng")
+        self.lat: float = datas.get("lat")
+        self.lng: float = datas.get("lng")
         self.panoId: str = gu.str_or_none(datas.get("panoId"))
 
 
 class GeoguessrDuelReplayPanoPovPayload(GeoguessrStr):
     """Represents PanoPov type payload data."""
 
+    __slots__ = ("heading", "pitch")
+
     def __init__(self, datas: dict) -> None:
         self.heading: float = gu.float_or_none(datas.get("heading"))
         self.pitch: float = gu.float_or_none(datas.get("pitch"))
@@ -965,6 +1519,8 @@ class GeoguessrDuelReplayPanoPovPayload(GeoguessrStr):
 class GeoguessrDuelReplayPanoZoomPayload(GeoguessrStr):
     """Represents PanoZoom type payload data."""
 
+    __slots__ = ("zoom",)
+
     def __init__(self, datas: dict) -> None:
         self.zoom: float = gu.float_or_none(datas.get("zoom"))
 
@@ -972,6 +1528,8 @@ class GeoguessrDuelReplayPanoZoomPayload(GeoguessrStr):
 class GeoguessrDuelReplayMapZoomPayload(GeoguessrStr):
     """Represents MapZoom type payload data."""
 
+    __slots__ = ("zoom",)
+
     def __init__(self, datas: dict) -> None:
         self.zoom: int = gu.int_or_none(datas.get("zoom"))
 
@@ -979,6 +1537,8 @@ class GeoguessrDuelReplayMapZoomPayload(GeoguessrStr):
 class GeoguessrDuelReplayMapPositionPayload(GeoguessrStr):
     """Represents MapPosition type payload data."""
 
+    __slots__ = ("lat", "lng")
+
     def __init__(self, datas: dict) -> None:
         self.lat: float = gu.float_or_none(datas.get("lat"))
         self.lng: float = gu.float_or_none(datas.get("lng"))
@@ -987,6 +1547,8 @@ class GeoguessrDuelReplayMapPositionPayload(GeoguessrStr):
 class GeoguessrDuelReplayGuessWithLatLngPayload(GeoguessrStr):
     """Represents GuessWithLatLng type payload data."""
 
+    __slots__ = ("lat", "lng")
+
     def __init__(self, datas: dict) -> None:
         self.lat: float = gu.float_or_none(datas.get("lat"))
         self.lng: float = gu.float_or_none(datas.get("lng"))
@@ -995,6 +1557,8 @@ class GeoguessrDuelReplayGuessWithLatLngPayload(GeoguessrStr):
 class GeoguessrDuelReplayPinPositionPayload(GeoguessrStr):
     """Represents PinPosition type payload data."""
 
+    __slots__ = ("lat", "lng")
+
     def __init__(self, datas: dict) -> None:
         self.lat: float = gu.float_or_none(datas.get("lat"))
         self.lng: float = gu.float_or_none(datas.get("lng"))
@@ -1003,6 +1567,8 @@ class GeoguessrDuelReplayPinPositionPayload(GeoguessrStr):
 class GeoguessrDuelReplayTimerPayload(GeoguessrStr):
     """Represents Timer type payload data."""
 
+    __slots__ = ("time",)
+
     def __init__(self, datas: dict) -> None:
         self.time: int = gu.int_or_none(datas.get("time"))
 
@@ -1010,15 +1576,208 @@ class GeoguessrDuelReplayTimerPayload(GeoguessrStr):
 class GeoguessrDuelReplayMapDisplayPayload(GeoguessrStr):
     """Represents MapDisplay type payload data."""
 
+    __slots__ = ("isActive", "isSticky", "size")
+
     def __init__(self, datas: dict) -> None:
         self.isActive: bool = gu.bool_or_none(datas.get("isActive"))
         self.isSticky: bool = gu.bool_or_none(datas.get("isSticky"))
         self.size: int = gu.int_or_none(datas.get("size"))
 
 
+REPLAY_PAYLOAD_TYPES: dict[GeoguessrDuelReplay.Type, type] = {
+    GeoguessrDuelReplay.Type.PANOPOSITION: GeoguessrDuelReplayPanoPositionPayload,
+    GeoguessrDuelReplay.Type.PANOPOV: GeoguessrDuelReplayPanoPovPayload,
+    GeoguessrDuelReplay.Type.PANOZOOM: GeoguessrDuelReplayPanoZoomPayload,
+    GeoguessrDuelReplay.Type.MAPZOOM: GeoguessrDuelReplayMapZoomPayload,
+    GeoguessrDuelReplay.Type.MAPPOSITION: GeoguessrDuelReplayMapPositionPayload,
+    GeoguessrDuelReplay.Type.GUESSWITHLATLNG: GeoguessrDuelReplayGuessWithLatLngPayload,
+    GeoguessrDuelReplay.Type.PINPOSITION: GeoguessrDuelReplayPinPositionPayload,
+    GeoguessrDuelReplay.Type.TIMER: GeoguessrDuelReplayTimerPayload,
+    GeoguessrDuelReplay.Type.MAPDISPLAY: GeoguessrDuelReplayMapDisplayPayload,
+}
+"""Payload class of each replay step type."""
+
+
+class GeoguessrDuelReplayColumns(GeoguessrStr):
+    """A player replay in a duel stored column by column in typed arrays.
+
+    Each step is a row across the columns. Numeric payload fields that a step type does not have
+    are NaN. GeoguessrDuelReplayStep objects are only built when a step is accessed, so scanning
+    a column, for example with `numpy.frombuffer`, never creates per-step objects.
+
+    Attributes:
+        times (array): Time of each step, in milliseconds since the epoch (int64).
+        types (array): Type code of each step, the index of its type in TYPES (int8).
+        lat (array): Latitude of the position, map position, pin and guess steps (float64).
+        lng (array): Longitude of the position, map position, pin and guess steps (float64).
+        heading (array): Heading of the PanoPov steps (float64).
+        pitch (array): Pitch of the PanoPov steps (float64).
+        zoom (array): Zoom of the PanoZoom and MapZoom steps (float64).
+        timer (array): Time of the Timer steps (float64).
+        size (array): Map size of the MapDisplay steps (float64).
+        isActive (array): Whether the map is shown, for the MapDisplay steps (int8).
+        isSticky (array): Whether the map is pinned open, for the MapDisplay steps (int8).
+        panoIds (list[Optional[str]]): Panorama of the PanoPosition steps, None for the others.
+    """
+
+    TYPES: tuple[GeoguessrDuelReplay.Type, ...] = tuple(GeoguessrDuelReplay.Type)
+    TYPE_CODES: dict[GeoguessrDuelReplay.Type, int] = {stepType: code for code, stepType in enumerate(TYPES)}
+    PAYLOAD_FIELDS: dict[GeoguessrDuelReplay.Type, tuple[str, ...]] = {
+        GeoguessrDuelReplay.Type.PANOPOSITION: ("lat", "lng", "panoId"),
+        GeoguessrDuelReplay.Type.PANOPOV: ("heading", "pitch"),
+        GeoguessrDuelReplay.Type.PANOZOOM: ("zoom",),
+        GeoguessrDuelReplay.Type.MAPZOOM: ("zoom",),
+        GeoguessrDuelReplay.Type.MAPPOSITION: ("lat", "lng"),
+        GeoguessrDuelReplay.Type.GUESSWITHLATLNG: ("lat", "lng"),
+        GeoguessrDuelReplay.Type.PINPOSITION: ("lat", "lng"),
+        GeoguessrDuelReplay.Type.TIMER: ("time",),
+        GeoguessrDuelReplay.Type.MAPDISPLAY: ("isActive", "isSticky", "size"),
+    }
+
+    __slots__ = (
+        "times",
+        "types",
+        "lat",
+        "lng",
+        "heading",
+        "pitch",
+        "zoom",
+        "timer",
+        "size",
+        "isActive",
+        "isSticky",
+        "panoIds",
+    )
+
+    def __init__(self, datas: list) -> None:
+        """Initialize GeoguessrDuelReplayColumns.
+
+        Args:
+            datas (list): Raw replay steps from API.
+        """
+        self.times: array = array("q")
+        self.types: array = array("b")
+        self.lat: array = array("d")
+        self.lng: array = array("d")
+        self.heading: array = array("d")
+        self.pitch: array = array("d")
+        self.zoom: array = array("d")
+        self.timer: array = array("d")
+        self.size: array = array("d")
+        self.isActive: array = array("b")
+        self.isSticky: array = array("b")
+        self.panoIds: list[Optional[str]] = []
+        for step in datas:
+            self.append(step)
+
+    @classmethod
+    def from_replay(cls, replay: GeoguessrDuelReplay) -> "GeoguessrDuelReplayColumns":
+        """Build the columns of a replay parsed as GeoguessrDuelReplayStep objects.
+
+        Args:
+            replay (GeoguessrDuelReplay): The replay to convert.
+
+        Returns:
+            GeoguessrDuelReplayColumns: The same steps, in columns.
+        """
+        columns = cls([])
+        for step in replay.datas:
+            fields = cls.PAYLOAD_FIELDS.get(step.type, ())
+            columns.append(
+                {
+                    "time": round(step.time.timestamp() * 1000),
+                    "type": step.type.value,
+                    "payload": {field: getattr(step.payload, field) for field in fields},
+                }
+            )
+        return columns
+
+    def append(self, step: dict) -> None:
+        """Add a raw replay step at the end of the columns.
+
+        Only the payload fields of the step type are read, as the typed decoding does.
+        """
+        stepType = GeoguessrDuelReplay.Type(step.get("type"))
+        payload = step.get("payload") or {}
+        payload = {field: payload.get(field) for field in self.PAYLOAD_FIELDS.get(stepType, ())}
+        self.times.append(int(float(step.get("time"))))
+        self.types.append(self.TYPE_CODES[stepType])
+        self.lat.append(_float_or_nan(payload.get("lat")))
+        self.lng.append(_float_or_nan(payload.get("lng")))
+        self.heading.append(_float_or_nan(payload.get("heading")))
+        self.pitch.append(_float_or_nan(payload.get("pitch")))
+        self.zoom.append(_float_or_nan(payload.get("zoom")))
+        self.timer.append(_float_or_nan(payload.get("time")))
+        self.size.append(_float_or_nan(payload.get("size")))
+        self.isActive.append(gu.bool_or_none(payload.get("isActive")))
+        self.isSticky.append(gu.bool_or_none(payload.get("isSticky")))
+        self.panoIds.append(payload.get("panoId"))
+
+    def type_at(self, index: int) -> GeoguessrDuelReplay.Type:
+        """Get the type of a step without building it."""
+        return self.TYPES[self.types[index]]
+
+    def payload_at(self, index: int) -> dict:
+        """Get the raw payload of a step, holding only the fields of its type."""
+        columns = {
+            "lat": self.lat,
+            "lng": self.lng,
+            "heading": self.heading,
+            "pitch": self.pitch,
+            "zoom": self.zoom,
+            "time": self.timer,
+            "size": self.size,
+        }
+        payload = {}
+        for field in self.PAYLOAD_FIELDS.get(self.type_at(index), ()):
+            if field == "panoId":
+                payload[field] = self.panoIds[index]
+            elif field in ("isActive", "isSticky"):
+                payload[field] = bool(getattr(self, field)[index])
+            else:
+                value = columns[field][index]
+                payload[field] = None if math.isnan(value) else value
+        return payload
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __getitem__(self, index: int) -> GeoguessrDuelReplayStep:
+        """Build the step at an index."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("replay step index out of range")
+        return GeoguessrDuelReplayStep(
+            {"time": self.times[index], "type": self.type_at(index).value, "payload": self.payload_at(index)}
+        )
+
+    def __iter__(self) -> Iterator[GeoguessrDuelReplayStep]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def datas(self) -> list[GeoguessrDuelReplayStep]:
+        """The steps as GeoguessrDuelReplayStep objects, like GeoguessrDuelReplay.datas. Built on each access."""
+        return list(self)
+
+    def _iter_fields(self) -> Iterator[tuple[str, Any]]:
+        # Printed like a GeoguessrDuelReplay rather than as raw columns
+        yield "datas", self.datas
+
+
+def _float_or_nan(value: Any) -> float:
+    if isinstance(value, dict):  # Big Number not decoded by the fetch
+        value = gu.big_number_to_float(value)
+    value = gu.float_or_none(value)
+    return math.nan if value is None else value
+
+
 class GeoguessrDuelTeam(GeoguessrStr):
     """Represents a team in a duel."""
 
+    __slots__ = ("id", "name", "healthAtEnd", "players", "roundResults", "isMultiplierActive", "multiplierAtEnd")
+
     def __init__(self, datas: dict) -> None:
         self.id: str = gu.str_or_none(datas.get("id"))
         self.name: str = gu.str_or_none(datas.get("name"))
@@ -1034,6 +1793,8 @@ class GeoguessrDuelTeam(GeoguessrStr):
 class GeoguessrDuelPlayer(GeoguessrStr):
     """Represents a player in a duel."""
 
+    __slots__ = ("playerId", "guesses", "rating", "countryCode", "progressChange", "helpRequested", "isSteam")
+
     def __init__(self, datas: dict) -> None:
         self.playerId: str = gu.str_or_none(datas.get("playerId"))
         self.guesses: list[GeoguessrDuelPlayerGuess] = [
@@ -1049,27 +1810,32 @@ class GeoguessrDuelPlayer(GeoguessrStr):
 class GeoguessrDuelPlayerGuess(GeoguessrStr):
     """Represents a player's guess in a duel."""
 
+    __slots__ = ("roundNumber", "lat", "lng", "distance", "created", "isTeamsBestGuessOnRound", "score")
+
     def __init__(self, datas: dict) -> None:
         self.roundNumber: int = gu.int_or_none(datas.get("roundNumber"))
-        self.lat: float = self._parse_big_number(datas.get("lat"))
-        self.lng: float = self._parse_big_number(datas.get("lng"))
-        self.distance: float = self._parse_big_number(datas.get("distance"))
+        self.lat: float = gu.big_number_to_float(datas.get("lat"))
+        self.lng: float = gu.big_number_to_float(datas.get("lng"))
+        self.distance: float = gu.big_number_to_float(datas.get("distance"))
         self.created: datetime = gu.datetime_or_none(datas.get("created"))
         self.isTeamsBestGuessOnRound: bool = gu.bool_or_none(datas.get("isTeamsBestGuessOnRound"))
         self.score: int = gu.int_or_none(datas.get("score"))
 
-    def _parse_big_number(self, value: Any) -> float:
-        """Parse Big Number format or regular number."""
-        if isinstance(value, dict) and value.get("type") == "Big Number":
-            return float(str(value.get("value", "0")).replace("n", ""))
-        elif isinstance(value, (int, float)):
-            return float(value)
-        return 0.0
-
 
 class GeoguessrDuelTeamRoundResult(GeoguessrStr):
     """Represents round result for a team."""
 
+    __slots__ = (
+        "roundNumber",
+        "score",
+        "healthBefore",
+        "healthAfter",
+        "bestGuess",
+        "activeMultiplier",
+        "damageDealt",
+        "multiplier",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.roundNumber: int = gu.int_or_none(datas.get("roundNumber"))
         self.score: int = gu.int_or_none(datas.get("score"))
@@ -1084,6 +1850,18 @@ class GeoguessrDuelTeamRoundResult(GeoguessrStr):
 class GeoguessrDuelRound(GeoguessrStr):
     """Represents a duel round."""
 
+    __slots__ = (
+        "roundNumber",
+        "panorama",
+        "hasProcessedRoundTimeout",
+        "isHealingRound",
+        "multiplier",
+        "damageMultiplier",
+        "startTime",
+        "endTime",
+        "timerStartTime",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.roundNumber: int = gu.int_or_none(datas.get("roundNumber"))
         self.panorama: GeoguessrDuelPanorama = GeoguessrDuelPanorama(datas.get("panorama", {}))
@@ -1099,27 +1877,32 @@ class GeoguessrDuelRound(GeoguessrStr):
 class GeoguessrDuelPanorama(GeoguessrStr):
     """Represents round panorama data."""
 
+    __slots__ = ("panoId", "lat", "lng", "countryCode", "heading", "pitch", "zoom")
+
     def __init__(self, datas: dict) -> None:
         self.panoId: str = gu.str_or_none(datas.get("panoId"))
-        self.lat: float = self._parse_big_number(datas.get("lat"))
-        self.lng: float = self._parse_big_number(datas.get("lng"))
+        self.lat: float = gu.big_number_to_float(datas.get("lat"))
+        self.lng: float = gu.big_number_to_float(datas.get("lng"))
         self.countryCode: str = gu.str_or_none(datas.get("countryCode"))
-        self.heading: float = self._parse_big_number(datas.get("heading"))
-        self.pitch: float = self._parse_big_number(datas.get("pitch"))
+        self.heading: float = gu.big_number_to_float(datas.get("heading"))
+        self.pitch: float = gu.big_number_to_float(datas.get("pitch"))
         self.zoom: int = gu.int_or_none(datas.get("zoom"))
 
-    def _parse_big_number(self, value: Any) -> float:
-        """Parse Big Number format or regular number."""
-        if isinstance(value, dict) and value.get("type") == "Big Number":
-            return float(str(value.get("value", "0")).replace("n", ""))
-        elif isinstance(value, (int, float)):
-            return float(value)
-        return 0.0
-
 
 class GeoguessrDuelProgressChange(GeoguessrStr):
     """Represents a player's progression."""
 
+    __slots__ = (
+        "xpAtStart",
+        "xpAtEnd",
+        "awardedXp",
+        "medal",
+        "competitiveProgress",
+        "rankedSystemProgress",
+        "rankedTeamDuelsProgress",
+        "quickplayDuelsProgress",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.xpAtStart: GeoguessrDuelXpProgression = (
             GeoguessrDuelXpProgression(datas.get("xpProgressions", [])[0]) if datas.get("xpProgressions", []) else None
@@ -1140,6 +1923,8 @@ class GeoguessrDuelProgressChange(GeoguessrStr):
 class GeoguessrDuelXpProgression(GeoguessrStr):
     """Represents XP progression."""
 
+    __slots__ = ("xp", "currentLevel", "nextLevel", "currentTitle")
+
     def __init__(self, datas: dict) -> None:
         self.xp: int = gu.int_or_none(datas.get("xp"))
         self.currentLevel: GeoguessrLevel = GeoguessrLevel(datas.get("currentLevel"))
@@ -1150,6 +1935,8 @@ class GeoguessrDuelXpProgression(GeoguessrStr):
 class GeoguessrDuelAwardedXp(GeoguessrStr):
     """Represents awarded XP."""
 
+    __slots__ = ("totalAwardedXp", "xpAwards")
+
     def __init__(self, datas: dict) -> None:
         self.totalAwardedXp: int = gu.int_or_none(datas.get("totalAwardedXp"))
         self.xpAwards: list[GeoguessrDuelXpAward] = [GeoguessrDuelXpAward(award) for award in datas.get("xpAwards", [])]
@@ -1158,6 +1945,8 @@ class GeoguessrDuelAwardedXp(GeoguessrStr):
 class GeoguessrDuelXpAward(GeoguessrStr):
     """Represents an XP reward."""
 
+    __slots__ = ("xp", "reason", "count")
+
     def __init__(self, datas: dict) -> None:
         self.xp: int = gu.int_or_none(datas.get("xp"))
         self.reason: str = gu.str_or_none(datas.get("reason"))
@@ -1167,6 +1956,26 @@ class GeoguessrDuelXpAward(GeoguessrStr):
 class GeoguessrDuelRankedSystemProgress(GeoguessrStr):
     """Represents ranked system progression."""
 
+    __slots__ = (
+        "points",
+        "totalWeeklyPoints",
+        "weeklyCap",
+        "gamesPlayedWithinWeeklyCap",
+        "positionBefore",
+        "positionAfter",
+        "ratingBefore",
+        "ratingAfter",
+        "winStreak",
+        "bucketSortedBy",
+        "gameMode",
+        "gameModeRatingBefore",
+        "gameModeRatingAfter",
+        "gameModeGamesPlayed",
+        "gameModeGamesRequired",
+        "placementGamesPlayed",
+        "placementGamesRequired",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.points: dict = datas.get("points", {})
         self.totalWeeklyPoints: int = gu.int_or_none(datas.get("totalWeeklyPoints"))
@@ -1190,6 +1999,43 @@ class GeoguessrDuelRankedSystemProgress(GeoguessrStr):
 class GeoguessrDuelOptions(GeoguessrStr):
     """Represents duel options."""
 
+    __slots__ = (
+        "initialHealth",
+        "individualInitialHealth",
+        "initialHealthTeamOne",
+        "initialHealthTeamTwo",
+        "roundTime",
+        "maxRoundTime",
+        "gracePeriodTime",
+        "gameTimeOut",
+        "maxNumberOfRounds",
+        "healingRounds",
+        "movementOptions",
+        "mapSlug",
+        "isRated",
+        "map",
+        "duelRoundOptions",
+        "roundsWithoutDamageMultiplier",
+        "disableMultipliers",
+        "multiplierIncrement",
+        "disableHealing",
+        "isTeamDuels",
+        "gameContext",
+        "roundStartingBehavior",
+        "flashbackRounds",
+        "competitiveGameMode",
+        "countAllGuesses",
+        "masterControlAutoStartRounds",
+        "consumedLocationsIdentifier",
+        "useCuratedLocations",
+        "extraWaitTimeBetweenRounds",
+        "roundCountdownDelay",
+        "guessMapType",
+        "botBehaviors",
+        "activeMultiplier",
+        "roundWinMultiplierIncrement",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.initialHealth: int = gu.int_or_none(datas.get("initialHealth"))
         self.individualInitialHealth: bool = gu.bool_or_none(datas.get("individualInitialHealth"))
@@ -1230,6 +2076,8 @@ class GeoguessrDuelOptions(GeoguessrStr):
 class GeoguessrMovementOptions(GeoguessrStr):
     """Represents movement options."""
 
+    __slots__ = ("forbidMoving", "forbidZooming", "forbidRotating")
+
     def __init__(self, datas: dict) -> None:
         self.forbidMoving: bool = gu.bool_or_none(datas.get("forbidMoving"))
         self.forbidZooming: bool = gu.bool_or_none(datas.get("forbidZooming"))
@@ -1239,6 +2087,8 @@ class GeoguessrMovementOptions(GeoguessrStr):
 class GeoguessrDuelMap(GeoguessrStr):
     """Represents duel map."""
 
+    __slots__ = ("name", "slug", "bounds", "maxErrorDistance")
+
     def __init__(self, datas: dict) -> None:
         self.name: str = gu.str_or_none(datas.get("name"))
         self.slug: str = gu.str_or_none(datas.get("slug"))
@@ -1249,6 +2099,8 @@ class GeoguessrDuelMap(GeoguessrStr):
 class GeoguessrDuelMapBounds(GeoguessrStr):
     """Represents map bounds."""
 
+    __slots__ = ("min", "max")
+
     def __init__(self, datas: dict) -> None:
         self.min: GeoguessrDuelCoordinate = GeoguessrDuelCoordinate(datas.get("min", {}))
         self.max: GeoguessrDuelCoordinate = GeoguessrDuelCoordinate(datas.get("max", {}))
@@ -1257,22 +2109,18 @@ class GeoguessrDuelMapBounds(GeoguessrStr):
 class GeoguessrDuelCoordinate(GeoguessrStr):
     """Represents a geographic coordinate."""
 
-    def __init__(self, datas: dict) -> None:
-        self.lat: float = self._parse_big_number(datas.get("lat"))
-        self.lng: float = self._parse_big_number(datas.get("lng"))
+    __slots__ = ("lat", "lng")
 
-    def _parse_big_number(self, value: Any) -> float:
-        """Parse Big Number format or regular number."""
-        if isinstance(value, dict) and value.get("type") == "Big Number":
-            return float(str(value.get("value", "0")).replace("n", ""))
-        elif isinstance(value, (int, float)):
-            return float(value)
-        return 0.0
+    def __init__(self, datas: dict) -> None:
+        self.lat: float = gu.big_number_to_float(datas.get("lat"))
+        self.lng: float = gu.big_number_to_float(datas.get("lng"))
 
 
 class GeoguessrDuelGameContext(GeoguessrStr):
     """Represents game context."""
 
+    __slots__ = ("type", "id")
+
     def __init__(self, datas: dict) -> None:
         self.type: str = gu.str_or_none(datas.get("type"))
         self.id: str = gu.str_or_none(datas.get("id"))
@@ -1281,6 +2129,8 @@ class GeoguessrDuelGameContext(GeoguessrStr):
 class GeoguessrDuelResult(GeoguessrStr):
     """Represents duel result."""
 
+    __slots__ = ("isDraw", "winningTeamId", "winnerStyle")
+
     def __init__(self, datas: dict) -> None:
         self.isDraw: bool = gu.bool_or_none(datas.get("isDraw"))
         self.winningTeamId: str = gu.str_or_none(datas.get("winningTeamId"))
@@ -1290,6 +2140,18 @@ class GeoguessrDuelResult(GeoguessrStr):
 class GeoguessrStatsParty(GeoguessrStr):
     """Represents party statistics."""
 
+    __slots__ = (
+        "total",
+        "duels",
+        "teamDuels",
+        "battleRoyaleCountries",
+        "battleRoyaleDistance",
+        "cityStreaks",
+        "liveChallenges",
+        "bullseye",
+        "quizzes",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.total: int = gu.int_or_none(datas.get("total"))
         self.duels: int = gu.int_or_none(datas.get("duels"))
@@ -1305,6 +2167,25 @@ class GeoguessrStatsParty(GeoguessrStr):
 class GeoguessrClub(GeoguessrStr):
     """Represents a Geoguessr club."""
 
+    __slots__ = (
+        "clubId",
+        "name",
+        "members",
+        "joinRule",
+        "tag",
+        "description",
+        "createdAt",
+        "language",
+        "memberCount",
+        "maxMemberCount",
+        "level",
+        "xp",
+        "labels",
+        "logo",
+        "stats",
+        "backgroundUrl",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.clubId: str = gu.str_or_none(datas.get("clubId"))
         self.name: str = gu.str_or_none(datas.get("name"))
@@ -1312,11 +2193,7 @@ class GeoguessrClub(GeoguessrStr):
         self.joinRule: int = gu.int_or_none(datas.get("joinRule"))
         self.tag: str = gu.str_or_none(datas.get("tag"))
         self.description: Optional[str] = gu.str_or_none(datas.get("description"))
-        self.createdAt: datetime = (
-            datetime.strptime(datas.get("createdAt").split(".")[0], "%Y-%m-%dT%H:%M:%S")
-            if datas.get("createdAt")
-            else None
-        )
+        self.createdAt: Optional[datetime] = gu.datetime_or_none(datas.get("createdAt"))
         self.language: str = gu.str_or_none(datas.get("language"))
         self.memberCount: int = gu.int_or_none(datas.get("memberCount"))
         self.maxMemberCount: int = gu.int_or_none(datas.get("maxMemberCount"))
@@ -1331,6 +2208,23 @@ class GeoguessrClub(GeoguessrStr):
 class GeoguessrClubMember(GeoguessrStr):
     """Represents user information for a club member."""
 
+    __slots__ = (
+        "userId",
+        "nick",
+        "avatar",
+        "fullbodyAvatar",
+        "borderUrl",
+        "isVerified",
+        "flair",
+        "countryCode",
+        "tierId",
+        "clubUserType",
+        "role",
+        "joinedAt",
+        "xp",
+        "weeklyXp",
+    )
+
     class Role(Enum):
         ADMIN = 1
         MEMBER = 2
@@ -1355,6 +2249,18 @@ class GeoguessrClubMember(GeoguessrStr):
 class GeoguessrClubLogo(GeoguessrStr):
     """Represents a Geoguessr club logo."""
 
+    __slots__ = (
+        "logoIconId",
+        "logoIconSize",
+        "logoIconOpacity",
+        "logoIconColorId",
+        "backgroundIconId",
+        "backgroundIconSize",
+        "backgroundIconOpacity",
+        "backgroundIconColorId",
+        "backgroundColorId",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.logoIconId: int = gu.int_or_none(datas.get("logoIconId"))
         self.logoIconSize: int = gu.int_or_none(datas.get("logoIconSize"))
@@ -1370,6 +2276,21 @@ class GeoguessrClubLogo(GeoguessrStr):
 class GeoguessrClubStats(GeoguessrStr):
     """Represents Geoguessr club statistics."""
 
+    __slots__ = (
+        "clubId",
+        "totalXp",
+        "changePercentXp",
+        "totalGamesPlayed",
+        "changePercentGamesPlayed",
+        "totalWins",
+        "changePercentWins",
+        "totalPerfectGuesses",
+        "changePercentPerfectGuesses",
+        "globalXpRank",
+        "totalClubs",
+        "averageDivision",
+    )
+
     def __init__(self, datas: dict) -> None:
         self.clubId: str = gu.str_or_none(datas.get("clubId"))
         self.totalXp: int = gu.int_or_none(datas.get("totalXp"))
@@ -1388,6 +2309,8 @@ class GeoguessrClubStats(GeoguessrStr):
 class GeoguessrClubDivision(GeoguessrStr):
     """Represents a club's average division."""
 
+    __slots__ = ("number", "name", "tier")
+
     def __init__(self, datas: dict) -> None:
         self.number: int = gu.int_or_none(datas.get("number"))
         self.name: str = gu.str_or_none(datas.get("name"))
@@ -0,0 +1,245 @@
+import functools
+import inspect
+import logging
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+import aiohttp
+
+from geoguessr_async.cache import ResponseCache
+from geoguessr_async.exceptions import GeoguessrAuthError
+from geoguessr_async.geoguessr import Geoguessr
+from geoguessr_async.ratelimit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class GeoguessrToken:
+    """One account of a GeoguessrPool, with its client and health.
+
+    Attributes:
+        client (Geoguessr): The client authenticated with the token.
+        inFlight (int): The number of calls running on the token.
+        requests (int): The number of calls dispatched to the token.
+        failures (int): The number of calls that raised an error on the token.
+        healthy (bool): Whether the token is in rotation.
+    """
+
+    def __init__(self, client: Geoguessr) -> None:
+        self.client: Geoguessr = client
+        self.inFlight: int = 0
+        self.requests: int = 0
+        self.failures: int = 0
+        self.healthy: bool = True
+
+    def __repr__(self) -> str:
+        return (
+            f"GeoguessrToken(healthy={self.healthy}, inFlight={self.inFlight}, "
+            f"requests={self.requests}, failures={self.failures})"
+        )
+
+
+class GeoguessrPool:
+    """Spreads the API calls over several accounts to scale past the rate limits of a single one.
+
+    The pool exposes the coroutine methods of Geoguessr, such as `get_user_infos` or
+    `get_challenge_score`. Each call runs on one token chosen round-robin or by least load. Every
+    token has its own client, so its own rate limiter, while all clients share one connection pool.
+    When a call sees a 401 or 403, the token is checked against the profile endpoint; if it is
+    rejected, the token is taken out of rotation and the call is retried on another token.
+
+    Methods tied to an account, such as `get_all_my_infos` or `play_challenge`, run on whichever
+    token is picked and are best called on a client directly.
+
+    Attributes:
+        tokens (list[GeoguessrToken]): The accounts of the pool.
+        strategy (str): 'round_robin' or 'least_loaded'.
+    """
+
+    STRATEGIES = ("round_robin", "least_loaded")
+
+    def __init__(
+        self,
+        ncfas: Iterable[str],
+        strategy: str = "round_robin",
+        rates: Optional[dict[str, float]] = None,
+        cache: Optional[ResponseCache] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        **clientOptions: Any,
+    ) -> None:
+        """Initialize GeoguessrPool.
+
+        Args:
+            ncfas (Iterable[str]): The `_ncfa` cookies of the accounts.
+            strategy (str): How tokens are picked, 'round_robin' or 'least_loaded'. Defaults to 'round_robin'.
+            rates (Optional[dict[str, float]]): Requests per second per host allowed for each token,
+                merged over RateLimiter.DEFAULT_RATES. Defaults to None.
+            cache (Optional[ResponseCache]): A response cache shared by all tokens, disabled if None. Defaults to None.
+            connector (Optional[aiohttp.BaseConnector]): A connector owned by the caller, shared by all tokens.
+                Defaults to None (the pool creates one and closes it in `close`).
+            **clientOptions: Other options given to each Geoguessr client, such as `retryPolicy` or `timeout`.
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"strategy must be one of {self.STRATEGIES}, got {strategy!r}")
+        self.strategy: str = strategy
+        self._connector = connector
+        self._ownsConnector = connector is None
+        self._connectorOptions = {
+            key: clientOptions.pop(key)
+            for key in ("connectionLimit", "connectionLimitPerHost", "keepaliveTimeout", "dnsCacheTtl")
+            if key in clientOptions
+        }
+        self.tokens: list[GeoguessrToken] = [
+            GeoguessrToken(
+                Geoguessr(
+                    ncfa,
+                    cache=cache,
+                    rateLimiter=RateLimiter(rates),
+                    connector=connector,
+                    **self._connectorOptions,
+                    **clientOptions,
+                )
+            )
+            for ncfa in ncfas
+        ]
+        if not self.tokens:
+            raise ValueError("GeoguessrPool needs at least one NCFA token")
+        self._next = 0
+
+    @property
+    def healthyTokens(self) -> list[GeoguessrToken]:
+        """The tokens in rotation."""
+        return [token for token in self.tokens if token.healthy]
+
+    def _ensure_connector(self) -> None:
+        # The connector is created on first use, as it needs a running event loop
+        if self._connector is None:
+            options = self.tokens[0].client._connectorOptions
+            self._connector = aiohttp.TCPConnector(**options)
+            for token in self.tokens:
+                token.client._connector = self._connector
+
+    def pick(self) -> GeoguessrToken:
+        """Choose the token of the next call.
+
+        Returns:
+            GeoguessrToken: A healthy token.
+
+        Raises:
+            RuntimeError: If every token was taken out of rotation.
+        """
+        healthy = self.healthyTokens
+        if not healthy:
+            raise RuntimeError("No healthy NCFA token left in the pool")
+        if self.strategy == "least_loaded":
+            return min(healthy, key=lambda token: (token.inFlight, token.requests))
+        token = healthy[self._next % len(healthy)]
+        self._next += 1
+        return token
+
+    async def _check_auth(self, token: GeoguessrToken, authFailures: int, error: Optional[Exception]) -> bool:
+        """Take a token out of rotation if a call saw an auth error and the API now rejects it.
+
+        Returns:
+            bool: True if the token was taken out of rotation.
+        """
+        if token.client.authFailures == authFailures and not isinstance(error, GeoguessrAuthError):
+            return False
+        if not token.healthy:
+            return False
+        # A 401/403 can be specific to the resource, so only the profile endpoint decides
+        try:
+            if await token.client.is_authenticated():
+                return False
+        except Exception:  # The probe failing says nothing about the token, the call keeps its own error
+            logger.warning("Could not check NCFA token %d", self.tokens.index(token), exc_info=True)
+            return False
+        token.healthy = False
+        logger.warning("NCFA token %d rejected by the API, removed from the pool", self.tokens.index(token))
+        return True
+
+    async def call(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        """Run a coroutine method of Geoguessr on a token of the pool.
+
+        Args:
+            name (str): The name of the method.
+            *args: The positional arguments of the method.
+            **kwargs: The keyword arguments of the method.
+
+        Raises:
+            RuntimeError: If every token was already taken out of rotation.
+            Exception: The error of the method, such as GeoguessrAuthError when its token was rejected and
+                no other token is left to retry on.
+
+        Returns:
+            Any: The result of the method.
+        """
+        self._ensure_connector()
+        while True:
+            token = self.pick()
+            authFailures = token.client.authFailures
+            token.inFlight += 1
+            token.requests += 1
+            error = None
+            try:
+                result = await getattr(token.client, name)(*args, **kwargs)
+            except Exception as e:
+                token.failures += 1
+                error = e
+            finally:
+                token.inFlight -= 1
+            # Retry on another token, unless the rejected one was the last: the call then keeps its own outcome
+            if await self._check_auth(token, authFailures, error) and self.healthyTokens:
+                continue
+            if error is not None:
+                raise error
+            return result
+
+    async def iterate(self, name: str, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        """Run an async generator method of Geoguessr on a token of the pool.
+
+        The iteration is not retried on another token once it started, but a rejected token is
+        still taken out of rotation.
+
+        Args:
+            name (str): The name of the method.
+            *args: The positional arguments of the method.
+            **kwargs: The keyword arguments of the method.
+
+        Yields:
+            Any: The items of the method.
+        """
+        self._ensure_connector()
+        token = self.pick()
+        authFailures = token.client.authFailures
+        token.inFlight += 1
+        token.requests += 1
+        error = None
+        try:
+            async for item in getattr(token.client, name)(*args, **kwargs):
+                yield item
+        except Exception as e:
+            token.failures += 1
+            error = e
+            raise
+        finally:
+            token.inFlight -= 1
+            if error is not None or token.client.authFailures != authFailures:
+                await self._check_auth(token, authFailures, error)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(Geoguessr, name, None)
+        if name.startswith("_") or method is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        if inspect.isasyncgenfunction(method):
+            return functools.partial(self.iterate, name)
+        if inspect.iscoroutinefunction(method):
+            return functools.partial(self.call, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    async def close(self) -> None:
+        """Close the clients of the pool, and the connector if the pool created it."""
+        for token in self.tokens:
+            await token.client.close()
+        if self._ownsConnector and self._connector is not None:
+            await self._connector.close()
+            self._connector = None
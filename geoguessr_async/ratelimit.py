@@ -0,0 +1,185 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib import parse
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` requests per second on average, with bursts up to `capacity`.
+
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """Initialize TokenBucket.
+
+        Args:
+            rate (float): The number of tokens added per second.
+            capacity (Optional[float]): The maximum number of tokens stored. Defaults to None (`rate`, at least 1).
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate: float = rate
+        self.capacity: float = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens: float = self.capacity
+        self._updatedAt: float = time.monotonic()
+        self._blockedUntil: float = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updatedAt) * self.rate)
+        self._updatedAt = now
+
+    async def acquire(self) -> float:
+        """Wait until a token is available and take it.
+
+        Returns:
+            float: The time spent waiting, in seconds.
+        """
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blockedUntil:
+                    await asyncio.sleep(self._blockedUntil - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return time.monotonic() - start
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def block_for(self, delay: float) -> None:
+        """Hold every request of the bucket for `delay` seconds, such as when the server sends Retry-After."""
+        self._blockedUntil = max(self._blockedUntil, time.monotonic() + delay)
+        self._tokens = 0.0
+
+
+class RateLimiter:
+    """Rate limits requests with one token bucket per host.
+
+    Attributes:
+        rates (dict[str, float]): Requests per second allowed per host.
+        defaultRate (float): Requests per second allowed for the hosts not listed in `rates`.
+    """
+
+    DEFAULT_RATES: dict[str, float] = {
+        "www.geoguessr.com": 10.0,
+        "geoguessr.com": 10.0,
+        "game-server.geoguessr.com": 20.0,
+    }
+
+    def __init__(self, rates: Optional[dict[str, float]] = None, defaultRate: float = 10.0) -> None:
+        """Initialize RateLimiter.
+
+        Args:
+            rates (Optional[dict[str, float]]): Requests per second per host, merged over DEFAULT_RATES.
+            defaultRate (float): Requests per second for the other hosts. Defaults to 10.
+        """
+        self.rates: dict[str, float] = {**self.DEFAULT_RATES, **(rates or {})}
+        self.defaultRate: float = defaultRate
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Get the token bucket of the host of a URL."""
+        host = parse.urlsplit(url).hostname or ""
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rates.get(host, self.defaultRate))
+        return self._buckets[host]
+
+    async def acquire(self, url: str) -> float:
+        """Wait for the right to send a request to a URL.
+
+        Returns:
+            float: The time spent waiting, in seconds.
+        """
+        return await self.bucket(url).acquire()
+
+
+class RetryPolicy:
+    """Decides which failed requests are retried and how long to wait before each retry.
+
+    Rate limited requests (429) are always retried, since the server did not process them. Server
+    errors and connection failures are only retried for idempotent methods. The delay is the
+    Retry-After header of the response when present, else an exponential backoff with jitter.
+
+    Attributes:
+        maxRetries (int): The maximum number of retries of a request.
+        baseDelay (float): The delay before the first retry, in seconds.
+        maxDelay (float): The maximum delay between two attempts, in seconds.
+        retryStatuses (tuple[int, ...]): The server error statuses that are retried.
+    """
+
+    IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(
+        self,
+        maxRetries: int = 4,
+        baseDelay: float = 0.5,
+        maxDelay: float = 30.0,
+        retryStatuses: tuple[int, ...] = (500, 502, 503, 504),
+    ) -> None:
+        self.maxRetries: int = maxRetries
+        self.baseDelay: float = baseDelay
+        self.maxDelay: float = maxDelay
+        self.retryStatuses: tuple[int, ...] = retryStatuses
+
+    def should_retry(self, method: str, attempt: int, status: Optional[int] = None) -> bool:
+        """Whether to retry a request.
+
+        Args:
+            method (str): The HTTP method of the request.
+            attempt (int): The number of retries already made.
+            status (Optional[int]): The status of the response, or None if the request failed to complete.
+
+        Returns:
+            bool: True if the request should be sent again.
+        """
+        if attempt >= self.maxRetries:
+            return False
+        if status == 429:
+            return True
+        return method.upper() in self.IDEMPOTENT_METHODS and (status is None or status in self.retryStatuses)
+
+    def delay(self, attempt: int, retryAfter: Optional[str] = None) -> float:
+        """Get the delay before a retry.
+
+        Args:
+            attempt (int): The number of retries already made.
+            retryAfter (Optional[str]): The Retry-After header of the response, if any.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        serverDelay = parse_retry_after(retryAfter)
+        if serverDelay is not None:
+            return min(serverDelay, self.maxDelay)
+        backoff = min(self.maxDelay, self.baseDelay * 2**attempt)
+        return random.uniform(backoff / 2, backoff)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header, given either in seconds or as an HTTP date.
+
+    Args:
+        value (Optional[str]): The header value.
+
+    Returns:
+        Optional[float]: The delay in seconds, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retryAt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retryAt.tzinfo is None:
+        retryAt = retryAt.replace(tzinfo=timezone.utc)
+    return max(0.0, (retryAt - datetime.now(timezone.utc)).total_seconds())
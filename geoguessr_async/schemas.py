@@ -0,0 +1,261 @@
+"""Typed schemas of the duel replay responses, decoded with msgspec.
+
+An opt-in alternative to building the replay models from decoded dicts: the JSON shape of every
+replay step is declared once as a msgspec Struct, so a response is validated and decoded straight
+from its bytes in C, without intermediate dicts, `dict.get` chains or the Big Number walk. The
+result is the same GeoguessrDuelReplay (or GeoguessrDuelReplayColumns) as the constructors give,
+with the same field names, types and None semantics.
+
+msgspec is an optional dependency: `pip install geoguessr_async[typed]`.
+"""
+
+import math
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional, Union
+
+import geoguessr_async.geo_utils as gu
+from geoguessr_async.models import (
+    REPLAY_PAYLOAD_TYPES,
+    GeoguessrDuelReplay,
+    GeoguessrDuelReplayColumns,
+    GeoguessrDuelReplayStep,
+)
+
+try:
+    import msgspec
+except ImportError:  # msgspec is optional, the models are then only built from dicts
+    msgspec = None
+
+
+if msgspec is not None:
+
+    class BigNumber(msgspec.Struct):
+        """A number in the {"type": "Big Number", "value": "..."} format of the game server."""
+
+        value: Union[str, int, float] = "0"
+
+    Number = Union[int, float, BigNumber, None]
+
+    class PanoPositionPayload(msgspec.Struct):
+        lat: Number = None
+        lng: Number = None
+        panoId: Optional[str] = None
+
+    class PanoPovPayload(msgspec.Struct):
+        heading: Number = None
+        pitch: Number = None
+
+    class ZoomPayload(msgspec.Struct):
+        zoom: Number = None
+
+    class LatLngPayload(msgspec.Struct):
+        lat: Number = None
+        lng: Number = None
+
+    class TimerPayload(msgspec.Struct):
+        time: Number = None
+
+    class MapDisplayPayload(msgspec.Struct):
+        isActive: Optional[bool] = None
+        isSticky: Optional[bool] = None
+        size: Number = None
+
+    class ReplayStep(msgspec.Struct, tag_field="type"):
+        time: Union[int, float]
+
+    class PanoPositionStep(ReplayStep, tag="PanoPosition"):
+        payload: Optional[PanoPositionPayload] = None
+
+    class PanoPovStep(ReplayStep, tag="PanoPov"):
+        payload: Optional[PanoPovPayload] = None
+
+    class PanoZoomStep(ReplayStep, tag="PanoZoom"):
+        payload: Optional[ZoomPayload] = None
+
+    class MapZoomStep(ReplayStep, tag="MapZoom"):
+        payload: Optional[ZoomPayload] = None
+
+    class MapPositionStep(ReplayStep, tag="MapPosition"):
+        payload: Optional[LatLngPayload] = None
+
+    class GuessWithLatLngStep(ReplayStep, tag="GuessWithLatLng"):
+        payload: Optional[LatLngPayload] = None
+
+    class PinPositionStep(ReplayStep, tag="PinPosition"):
+        payload: Optional[LatLngPayload] = None
+
+    class TimerStep(ReplayStep, tag="Timer"):
+        payload: Optional[TimerPayload] = None
+
+    class MapDisplayStep(ReplayStep, tag="MapDisplay"):
+        payload: Optional[MapDisplayPayload] = None
+
+    Replay = list[
+        Union[
+            PanoPositionStep,
+            PanoPovStep,
+            PanoZoomStep,
+            MapZoomStep,
+            MapPositionStep,
+            GuessWithLatLngStep,
+            PinPositionStep,
+            TimerStep,
+            MapDisplayStep,
+        ]
+    ]
+    """The schema of a replay response."""
+
+    _replayDecoder = msgspec.json.Decoder(Replay)
+
+
+def _raw(value: Any) -> Any:
+    if type(value) is BigNumber:
+        return float(str(value.value).replace("n", ""))
+    return value
+
+
+def _float(value: Any) -> Optional[float]:
+    if type(value) is float:
+        return value
+    return gu.float_or_none(_raw(value))
+
+
+def _int(value: Any) -> Optional[int]:
+    if type(value) is int:
+        return value
+    return gu.int_or_none(_raw(value))
+
+
+def _float_or_nan(value: Any) -> float:
+    if type(value) is float:
+        return value
+    value = gu.float_or_none(_raw(value))
+    return math.nan if value is None else value
+
+
+# How each payload model converts the fields of its schema, as its constructor does
+_PAYLOAD_FIELDS: dict[GeoguessrDuelReplay.Type, tuple[tuple[str, Callable[[Any], Any]], ...]] = {
+    GeoguessrDuelReplay.Type.PANOPOSITION: (("lat", _raw), ("lng", _raw), ("panoId", gu.str_or_none)),
+    GeoguessrDuelReplay.Type.PANOPOV: (("heading", _float), ("pitch", _float)),
+    GeoguessrDuelReplay.Type.PANOZOOM: (("zoom", _float),),
+    GeoguessrDuelReplay.Type.MAPZOOM: (("zoom", _int),),
+    GeoguessrDuelReplay.Type.MAPPOSITION: (("lat", _float), ("lng", _float)),
+    GeoguessrDuelReplay.Type.GUESSWITHLATLNG: (("lat", _float), ("lng", _float)),
+    GeoguessrDuelReplay.Type.PINPOSITION: (("lat", _float), ("lng", _float)),
+    GeoguessrDuelReplay.Type.TIMER: (("time", _int),),
+    GeoguessrDuelReplay.Type.MAPDISPLAY: (("isActive", gu.bool_or_none), ("isSticky", gu.bool_or_none), ("size", _int)),
+}
+
+_STEP_TYPES: dict[type, GeoguessrDuelReplay.Type] = {}
+_PAYLOADS_WITH: dict[str, frozenset[type]] = {}
+if msgspec is not None:
+    _STEP_TYPES = {
+        stepType: GeoguessrDuelReplay.Type(stepType.__struct_config__.tag) for stepType in Replay.__args__[0].__args__
+    }
+    _PAYLOADS_WITH = {
+        field: frozenset(
+            payloadType
+            for payloadType in (
+                PanoPositionPayload,
+                PanoPovPayload,
+                ZoomPayload,
+                LatLngPayload,
+                TimerPayload,
+                MapDisplayPayload,
+            )
+            if field in payloadType.__struct_fields__
+        )
+        for field in ("lat", "lng", "heading", "pitch", "zoom", "time", "size")
+    }
+
+
+def decode_replay_steps(data: Union[bytes, str, list]) -> list:
+    """Decode and validate a replay against its schema.
+
+    Args:
+        data (Union[bytes, str, list]): The raw JSON body of a replay response, or the body already decoded.
+
+    Raises:
+        ImportError: If msgspec is not installed.
+        ValueError: If the replay does not match the schema, for example with an unknown step type.
+
+    Returns:
+        list: The steps, as ReplayStep structs.
+    """
+    if msgspec is None:
+        raise ImportError("msgspec is required for typed decoding, install geoguessr_async[typed]")
+    try:
+        if isinstance(data, (bytes, bytearray, memoryview, str)):
+            return _replayDecoder.decode(data)
+        return msgspec.convert(data, Replay)
+    except (msgspec.DecodeError, msgspec.ValidationError) as e:
+        raise ValueError(f"Invalid replay: {e}") from e
+
+
+def decode_replay(data: Union[bytes, str, list]) -> GeoguessrDuelReplay:
+    """Build a GeoguessrDuelReplay from a replay response through its schema.
+
+    Args:
+        data (Union[bytes, str, list]): The raw JSON body of a replay response, or the body already decoded.
+
+    Returns:
+        GeoguessrDuelReplay: The same replay as `GeoguessrDuelReplay(json.loads(data))`.
+    """
+    replay = GeoguessrDuelReplay.__new__(GeoguessrDuelReplay)
+    replay.datas = [_build_step(step) for step in decode_replay_steps(data)]
+    return replay
+
+
+def decode_replay_columns(data: Union[bytes, str, list]) -> GeoguessrDuelReplayColumns:
+    """Build a GeoguessrDuelReplayColumns from a replay response through its schema.
+
+    Args:
+        data (Union[bytes, str, list]): The raw JSON body of a replay response, or the body already decoded.
+
+    Returns:
+        GeoguessrDuelReplayColumns: The same columns as `GeoguessrDuelReplayColumns(json.loads(data))`.
+    """
+    steps = decode_replay_steps(data)
+    codes = GeoguessrDuelReplayColumns.TYPE_CODES
+    columns = GeoguessrDuelReplayColumns([])
+    columns.times = array("q", [int(float(step.time)) for step in steps])
+    columns.types = array("b", [codes[_STEP_TYPES[type(step)]] for step in steps])
+    # Each column is filled in one pass, with NaN for the steps whose payload has no such field
+    for column, field in (
+        ("lat", "lat"),
+        ("lng", "lng"),
+        ("heading", "heading"),
+        ("pitch", "pitch"),
+        ("zoom", "zoom"),
+        ("timer", "time"),
+        ("size", "size"),
+    ):
+        payloadTypes = _PAYLOADS_WITH[field]
+        values = [
+            _float_or_nan(getattr(step.payload, field)) if type(step.payload) in payloadTypes else math.nan
+            for step in steps
+        ]
+        setattr(columns, column, array("d", values))
+    for field in ("isActive", "isSticky"):
+        setattr(
+            columns,
+            field,
+            array(
+                "b", [type(step.payload) is MapDisplayPayload and bool(getattr(step.payload, field)) for step in steps]
+            ),
+        )
+    columns.panoIds = [step.payload.panoId if type(step.payload) is PanoPositionPayload else None for step in steps]
+    return columns
+
+
+def _build_step(step: Any) -> GeoguessrDuelReplayStep:
+    stepType = _STEP_TYPES[type(step)]
+    built = GeoguessrDuelReplayStep.__new__(GeoguessrDuelReplayStep)
+    built.time = datetime.fromtimestamp(float(step.time) / 1000, tz=timezone.utc)
+    built.type = stepType
+    payload = REPLAY_PAYLOAD_TYPES[stepType].__new__(REPLAY_PAYLOAD_TYPES[stepType])
+    for name, convert in _PAYLOAD_FIELDS[stepType]:
+        setattr(payload, name, convert(getattr(step.payload, name, None)))
+    built.payload = payload
+    return built
@@ -0,0 +1,429 @@
+import math
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Iterable, Optional, Union
+
+from geoguessr_async.models import GeoguessrDuelData, GeoguessrDuelReplay, GeoguessrDuelReplayColumns
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS duels (
+    game_id TEXT PRIMARY KEY,
+    status TEXT,
+    version INTEGER,
+    round_count INTEGER,
+    initial_health INTEGER,
+    max_rounds INTEGER,
+    map_slug TEXT,
+    map_name TEXT,
+    competitive_game_mode TEXT,
+    is_rated INTEGER,
+    is_draw INTEGER,
+    winning_team_id TEXT,
+    winner_style TEXT,
+    tournament_id TEXT,
+    start_time TEXT,
+    stored_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_id TEXT NOT NULL REFERENCES duels (game_id) ON DELETE CASCADE,
+    player_id TEXT NOT NULL,
+    team_id TEXT,
+    team_name TEXT,
+    country_code TEXT,
+    rating INTEGER,
+    health_at_end INTEGER,
+    is_winner INTEGER,
+    PRIMARY KEY (game_id, player_id)
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    game_id TEXT NOT NULL REFERENCES duels (game_id) ON DELETE CASCADE,
+    round_number INTEGER NOT NULL,
+    pano_id TEXT,
+    lat REAL,
+    lng REAL,
+    country_code TEXT,
+    heading REAL,
+    pitch REAL,
+    zoom INTEGER,
+    multiplier REAL,
+    damage_multiplier REAL,
+    is_healing_round INTEGER,
+    start_time TEXT,
+    end_time TEXT,
+    PRIMARY KEY (game_id, round_number)
+);
+CREATE TABLE IF NOT EXISTS guesses (
+    game_id TEXT NOT NULL REFERENCES duels (game_id) ON DELETE CASCADE,
+    player_id TEXT NOT NULL,
+    round_number INTEGER NOT NULL,
+    team_id TEXT,
+    lat REAL,
+    lng REAL,
+    distance REAL,
+    score INTEGER,
+    is_teams_best_guess INTEGER,
+    created TEXT,
+    PRIMARY KEY (game_id, player_id, round_number)
+);
+CREATE TABLE IF NOT EXISTS replay_steps (
+    game_id TEXT NOT NULL REFERENCES duels (game_id) ON DELETE CASCADE,
+    player_id TEXT NOT NULL,
+    round_number INTEGER NOT NULL,
+    step INTEGER NOT NULL,
+    time INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    lat REAL,
+    lng REAL,
+    heading REAL,
+    pitch REAL,
+    zoom REAL,
+    timer REAL,
+    size REAL,
+    is_active INTEGER,
+    is_sticky INTEGER,
+    pano_id TEXT,
+    PRIMARY KEY (game_id, player_id, round_number, step)
+);
+CREATE INDEX IF NOT EXISTS duels_start_time ON duels (start_time);
+CREATE INDEX IF NOT EXISTS players_player_id ON players (player_id);
+CREATE INDEX IF NOT EXISTS players_country_code ON players (country_code);
+CREATE INDEX IF NOT EXISTS rounds_country_code ON rounds (country_code);
+CREATE INDEX IF NOT EXISTS rounds_start_time ON rounds (start_time);
+CREATE INDEX IF NOT EXISTS guesses_player_id ON guesses (player_id, created);
+CREATE INDEX IF NOT EXISTS replay_steps_player_id ON replay_steps (player_id, time);
+"""
+"""The tables and indexes of a DuelStore."""
+
+
+class DuelStore:
+    """Local SQLite store of duels, with their players, rounds, guesses and replay steps in normalized tables.
+
+    Duels are upserted by game id, so a duel fetched again replaces its stored rows. The tables are
+    indexed on the game id, player id, country code and time columns, so analytics can run as
+    local SQL queries instead of fetching and parsing the duels again. Times are stored as ISO 8601
+    text, except replay step times which are milliseconds since the epoch.
+
+    Example:
+        store = DuelStore("duels.sqlite3")
+        store.upsert_duel(await geoguessr.get_duel_info(duelUrl))
+        store.country_stats(playerId)
+    """
+
+    def __init__(self, path: str = "geoguessr_duels.sqlite3") -> None:
+        """Initialize DuelStore.
+
+        Args:
+            path (str): Path of the database file, created if needed. Defaults to 'geoguessr_duels.sqlite3'.
+        """
+        self.path: str = path
+        self._connection = sqlite3.connect(path)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(SCHEMA)
+        self._connection.commit()
+
+    def upsert_duel(self, duel: GeoguessrDuelData) -> None:
+        """Store a duel, replacing the rows stored for its game id.
+
+        The replay steps of a player and round are only replaced when the duel holds that replay,
+        so storing a duel fetched without replays keeps the steps stored before.
+
+        Args:
+            duel (GeoguessrDuelData): The duel, for example from `Geoguessr.get_duel_info`.
+        """
+        with self._connection:
+            self._upsert(duel)
+
+    def upsert_duels(self, duels: Iterable[GeoguessrDuelData]) -> int:
+        """Store several duels in one transaction.
+
+        Args:
+            duels (Iterable[GeoguessrDuelData]): The duels, such as the data of `get_duels_bulk` results.
+
+        Returns:
+            int: The number of stored duels.
+        """
+        count = 0
+        with self._connection:
+            for duel in duels:
+                self._upsert(duel)
+                count += 1
+        return count
+
+    def _upsert(self, duel: GeoguessrDuelData) -> None:
+        gameId = _text(duel.gameId)
+        if gameId is None:
+            raise ValueError("Cannot store a duel without gameId")
+        options = duel.options
+        result = duel.result
+        winningTeamId = _text(result.winningTeamId)
+        self._connection.execute(
+            "INSERT INTO duels VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (game_id) DO UPDATE SET "
+            "status = excluded.status, version = excluded.version, round_count = excluded.round_count, "
+            "initial_health = excluded.initial_health, max_rounds = excluded.max_rounds, "
+            "map_slug = excluded.map_slug, map_name = excluded.map_name, "
+            "competitive_game_mode = excluded.competitive_game_mode, is_rated = excluded.is_rated, "
+            "is_draw = excluded.is_draw, winning_team_id = excluded.winning_team_id, "
+            "winner_style = excluded.winner_style, tournament_id = excluded.tournament_id, "
+            "start_time = excluded.start_time, stored_at = excluded.stored_at",
+            (
+                gameId,
+                _text(duel.status),
+                duel.version,
+                duel.totalRoundCount,
+                duel.initialHealth,
+                duel.maxNumberOfRounds,
+                _text(options.mapSlug) or _text(options.map.slug),
+                _text(options.map.name),
+                _text(options.competitiveGameMode),
+                options.isRated,
+                result.isDraw,
+                winningTeamId,
+                _text(result.winnerStyle),
+                _text(duel.tournamentId),
+                _time(duel.rounds[0].startTime) if duel.rounds else None,
+                time.time(),
+            ),
+        )
+        for table in ("players", "rounds", "guesses"):
+            self._connection.execute(f"DELETE FROM {table} WHERE game_id = ?", (gameId,))
+
+        players = []
+        guesses = []
+        for team in duel.teams:
+            teamId = _text(team.id)
+            for player in team.players:
+                playerId = _text(player.playerId)
+                players.append(
+                    (
+                        gameId,
+                        playerId,
+                        teamId,
+                        _text(team.name),
+                        _text(player.countryCode),
+                        player.rating,
+                        team.healthAtEnd,
+                        None if winningTeamId is None else teamId == winningTeamId,
+                    )
+                )
+                guesses.extend(
+                    (
+                        gameId,
+                        playerId,
+                        guess.roundNumber,
+                        teamId,
+                        guess.lat,
+                        guess.lng,
+                        guess.distance,
+                        guess.score,
+                        guess.isTeamsBestGuessOnRound,
+                        _time(guess.created),
+                    )
+                    for guess in player.guesses
+                )
+        self._connection.executemany("INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?, ?)", players)
+        self._connection.executemany("INSERT OR REPLACE INTO guesses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", guesses)
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO rounds VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    gameId,
+                    round.roundNumber,
+                    _text(round.panorama.panoId),
+                    round.panorama.lat,
+                    round.panorama.lng,
+                    _text(round.panorama.countryCode),
+                    round.panorama.heading,
+                    round.panorama.pitch,
+                    round.panorama.zoom,
+                    round.multiplier,
+                    round.damageMultiplier,
+                    round.isHealingRound,
+                    _time(round.startTime),
+                    _time(round.endTime),
+                )
+                for round in duel.rounds
+            ),
+        )
+
+        for playerId, replays in (duel.replays or {}).items():
+            for roundIndex, replay in enumerate(replays):
+                if replay is None:
+                    continue
+                self._connection.execute(
+                    "DELETE FROM replay_steps WHERE game_id = ? AND player_id = ? AND round_number = ?",
+                    (gameId, playerId, roundIndex + 1),
+                )
+                self._connection.executemany(
+                    "INSERT INTO replay_steps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    _replay_rows(gameId, playerId, roundIndex + 1, replay),
+                )
+
+    def has_duel(self, gameId: str) -> bool:
+        """Whether a duel is stored.
+
+        Args:
+            gameId (str): The game id of the duel.
+
+        Returns:
+            bool: True if the duel is stored.
+        """
+        return self._connection.execute("SELECT 1 FROM duels WHERE game_id = ?", (gameId,)).fetchone() is not None
+
+    def game_ids(self) -> set[str]:
+        """Get the game ids of the stored duels, for example to skip them when fetching."""
+        return {row[0] for row in self._connection.execute("SELECT game_id FROM duels")}
+
+    def query(self, sql: str, parameters: Union[tuple, dict] = ()) -> list[dict[str, Any]]:
+        """Run a SQL query on the store.
+
+        Args:
+            sql (str): The query, over the tables of SCHEMA.
+            parameters (Union[tuple, dict]): The parameters of the query. Defaults to ().
+
+        Returns:
+            list[dict[str, Any]]: The rows, as dicts keyed by column name.
+        """
+        return [dict(row) for row in self._connection.execute(sql, parameters)]
+
+    def player_duels(
+        self, playerId: str, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> list[dict[str, Any]]:
+        """Get the duels of a player, most recent first.
+
+        Args:
+            playerId (str): The player.
+            since (Optional[datetime]): Only the duels started at or after this time. Defaults to None.
+            until (Optional[datetime]): Only the duels started before this time. Defaults to None.
+
+        Returns:
+            list[dict[str, Any]]: The duel rows, with the player's team, rating and whether they won.
+        """
+        sql = (
+            "SELECT duels.*, players.team_id, players.rating, players.country_code, players.is_winner "
+            "FROM players JOIN duels USING (game_id) WHERE players.player_id = ?"
+        )
+        parameters: list[Any] = [playerId]
+        if since is not None:
+            sql += " AND duels.start_time >= ?"
+            parameters.append(_time(since))
+        if until is not None:
+            sql += " AND duels.start_time < ?"
+            parameters.append(_time(until))
+        return self.query(sql + " ORDER BY duels.start_time DESC", tuple(parameters))
+
+    def player_guesses(self, playerId: str, countryCode: Optional[str] = None) -> list[dict[str, Any]]:
+        """Get the guesses of a player with the location of their round, oldest first.
+
+        Args:
+            playerId (str): The player.
+            countryCode (Optional[str]): Only the rounds located in this country. Defaults to None.
+
+        Returns:
+            list[dict[str, Any]]: The guess rows, with the round's `country_code`, `round_lat` and `round_lng`.
+        """
+        sql = (
+            "SELECT guesses.*, rounds.country_code, rounds.lat AS round_lat, rounds.lng AS round_lng "
+            "FROM guesses JOIN rounds USING (game_id, round_number) WHERE guesses.player_id = ?"
+        )
+        parameters: tuple = (playerId,)
+        if countryCode is not None:
+            sql += " AND rounds.country_code = ?"
+            parameters += (countryCode,)
+        return self.query(sql + " ORDER BY guesses.created", parameters)
+
+    def country_stats(self, playerId: Optional[str] = None) -> list[dict[str, Any]]:
+        """Get the number of rounds, mean score and mean distance per country of the round locations.
+
+        Args:
+            playerId (Optional[str]): Only the guesses of this player. Defaults to None (every player).
+
+        Returns:
+            list[dict[str, Any]]: One row per country code, with `guesses`, `mean_score` and `mean_distance`,
+                most guessed first.
+        """
+        sql = (
+            "SELECT rounds.country_code, COUNT(*) AS guesses, AVG(guesses.score) AS mean_score, "
+            "AVG(guesses.distance) AS mean_distance FROM guesses JOIN rounds USING (game_id, round_number)"
+        )
+        parameters: tuple = ()
+        if playerId is not None:
+            sql += " WHERE guesses.player_id = ?"
+            parameters = (playerId,)
+        return self.query(sql + " GROUP BY rounds.country_code ORDER BY guesses DESC", parameters)
+
+    def replay_steps(self, gameId: str, playerId: str, roundNumber: int) -> list[dict[str, Any]]:
+        """Get the replay steps of a player in a round, in order.
+
+        Args:
+            gameId (str): The game id of the duel.
+            playerId (str): The player.
+            roundNumber (int): The round, starting at 1.
+
+        Returns:
+            list[dict[str, Any]]: The step rows.
+        """
+        return self.query(
+            "SELECT * FROM replay_steps WHERE game_id = ? AND player_id = ? AND round_number = ? ORDER BY step",
+            (gameId, playerId, roundNumber),
+        )
+
+    def delete_duel(self, gameId: str) -> bool:
+        """Remove a duel and all its rows.
+
+        Args:
+            gameId (str): The game id of the duel.
+
+        Returns:
+            bool: True if the duel was stored.
+        """
+        with self._connection:
+            cursor = self._connection.execute("DELETE FROM duels WHERE game_id = ?", (gameId,))
+        return cursor.rowcount > 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+
+def _text(value: Optional[str]) -> Optional[str]:
+    # The models turn missing strings into "None"
+    return None if value is None or value == "None" else value
+
+
+def _time(value: Optional[datetime]) -> Optional[str]:
+    return None if value is None else value.isoformat()
+
+
+def _replay_rows(
+    gameId: str, playerId: str, roundNumber: int, replay: Union[GeoguessrDuelReplay, GeoguessrDuelReplayColumns]
+) -> Iterable[tuple]:
+    columns = (
+        replay if isinstance(replay, GeoguessrDuelReplayColumns) else GeoguessrDuelReplayColumns.from_replay(replay)
+    )
+    types = [stepType.value for stepType in columns.TYPES]
+    for step in range(len(columns)):
+        yield (
+            gameId,
+            playerId,
+            roundNumber,
+            step,
+            columns.times[step],
+            types[columns.types[step]],
+            _real(columns.lat[step]),
+            _real(columns.lng[step]),
+            _real(columns.heading[step]),
+            _real(columns.pitch[step]),
+            _real(columns.zoom[step]),
+            _real(columns.timer[step]),
+            _real(columns.size[step]),
+            columns.isActive[step],
+            columns.isSticky[step],
+            columns.panoIds[step],
+        )
+
+
+def _real(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
@@ -0,0 +1,601 @@
+"""Local stand-in of the GeoGuessr API, to exercise the client's network paths offline.
+
+The server answers every endpoint called by Geoguessr with fixtures, generated deterministically
+or loaded from recorded JSON files, and can inject latency, server errors and 429 responses.
+Point a client at it with its `baseUrls` option:
+
+    async with MockGeoguessrServer(latency=0.01, rateLimitRate=0.05) as server:
+        geoguessr = Geoguessr("ncfa", baseUrls=server.base_urls())
+        duel = await geoguessr.get_duel_info("duel-1")
+"""
+
+import asyncio
+import json
+import os
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Union
+
+from aiohttp import web
+
+API_ORIGINS = ("https://www.geoguessr.com", "https://geoguessr.com", "https://game-server.geoguessr.com")
+"""The origins of the API, all served by the mock server."""
+
+STEP_TEMPLATES = [
+    {"type": "PanoPosition", "payload": {"lat": 48.85, "lng": 2.35, "panoId": "pano"}},
+    {"type": "PanoPov", "payload": {"heading": 120.5, "pitch": -3.2}},
+    {"type": "PanoZoom", "payload": {"zoom": 1.5}},
+    {"type": "MapZoom", "payload": {"zoom": 4}},
+    {"type": "MapPosition", "payload": {"lat": 45.1, "lng": 3.2}},
+    {"type": "PinPosition", "payload": {"lat": 45.0, "lng": 3.0}},
+    {"type": "Timer", "payload": {"time": 15}},
+    {"type": "MapDisplay", "payload": {"isActive": True, "isSticky": False, "size": 2}},
+    {"type": "GuessWithLatLng", "payload": {"lat": 45.0, "lng": 3.0}},
+]
+
+COUNTRIES = [("fr", 46.6, 2.2), ("es", 40.4, -3.7), ("br", -14.2, -51.9), ("jp", 36.2, 138.2), ("us", 39.8, -98.6)]
+
+EPOCH = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def iso(value: datetime) -> str:
+    """Format a time like the API does."""
+    return value.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class MockFixtures:
+    """Builds the responses of the mock server, identical for the same arguments.
+
+    Responses found in `recorded` are served as they are, so recorded API responses can replace
+    the generated ones.
+
+    Args:
+        feedEntries (int): Number of entries of the activity feed. Defaults to 250.
+        highscores (int): Number of results of each challenge leaderboard. Defaults to 120.
+        roundCount (int): Number of rounds of the duels and challenges. Defaults to 5.
+        replaySteps (int): Number of steps of each duel replay. Defaults to 200.
+        clubMembers (int): Number of members of each club. Defaults to 50.
+        recorded (Optional[dict[str, Any]]): Responses by URL path, such as '/api/v4/clubs/abc'. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        feedEntries: int = 250,
+        highscores: int = 120,
+        roundCount: int = 5,
+        replaySteps: int = 200,
+        clubMembers: int = 50,
+        recorded: Optional[dict[str, Any]] = None,
+    ) -> None:
+        self.feedEntries = feedEntries
+        self.highscores = highscores
+        self.roundCount = roundCount
+        self.replaySteps = replaySteps
+        self.clubMembers = clubMembers
+        self.recorded: dict[str, Any] = recorded or {}
+
+    @classmethod
+    def from_directory(cls, path: str, **kwargs: Any) -> "MockFixtures":
+        """Load recorded responses from JSON files named after their URL path, such as `api/v4/clubs/abc.json`.
+
+        Args:
+            path (str): The directory of the recorded responses.
+            **kwargs: The options of the generated responses.
+
+        Returns:
+            MockFixtures: The fixtures serving the recorded responses first.
+        """
+        recorded = {}
+        for directory, _, files in os.walk(path):
+            for name in files:
+                if name.endswith(".json"):
+                    filePath = os.path.join(directory, name)
+                    urlPath = "/" + os.path.relpath(filePath, path)[: -len(".json")].replace(os.sep, "/")
+                    with open(filePath, encoding="utf-8") as f:
+                        recorded[urlPath] = json.load(f)
+        return cls(recorded=recorded, **kwargs)
+
+    def user(self, userId: str) -> dict:
+        return {
+            "id": userId,
+            "nick": f"player {userId}",
+            "created": iso(EPOCH - timedelta(days=400)),
+            "isProUser": True,
+            "type": "Pro",
+            "isVerified": False,
+            "pin": {"url": "pin.png", "anchor": "center-center", "isDefault": False},
+            "fullBodyPin": "body.png",
+            "color": 0,
+            "url": f"/user/{userId}",
+            "countryCode": "fr",
+            "br": {"level": 12, "division": 3},
+            "progress": {
+                "level": 42,
+                "xp": 123456,
+                "levelXp": 120000,
+                "nextLevelXp": 130000,
+                "nextLevel": 43,
+                "title": {"id": 120, "tierId": 3},
+                "competitionMedals": {"bronze": 1, "silver": 2, "gold": 3, "platinum": 0},
+            },
+            "competitive": {
+                "elo": 1200,
+                "rating": 1150,
+                "lastRatingChange": 12,
+                "division": {"type": 30, "startRating": 1100, "endRating": 1200},
+                "onLeaderboard": False,
+            },
+            "avatar": {"fullbodypath": "avatar.png"},
+            "isBanned": False,
+            "chatBan": False,
+        }
+
+    def profile(self) -> dict:
+        return {"user": self.user("me"), "email": "me@example.com", "isEmailVerified": True}
+
+    def stats(self, userId: str) -> dict:
+        duels = {"numGamesPlayed": 321, "winRatio": 0.55, "avgScore": 3712, "avgGuessTime": 21.5}
+        return {
+            "duels": duels,
+            "duelsNoMove": duels,
+            "duelsNmpz": duels,
+            "duelsTotal": duels,
+            "duelsMedals": {"bronze": 1, "silver": 2, "gold": 3, "platinum": 4},
+            "unrankedDuels": duels,
+            "battleRoyaleDistance": {"numGamesPlayed": 12, "avgPosition": 3.5, "winRatio": 0.25},
+            "battleRoyaleCountry": {"numGamesPlayed": 8, "avgPosition": 2.5, "winRatio": 0.5},
+            "lifeTimeXpProgression": {
+                "xp": 123456,
+                "currentLevel": {"level": 42, "xpStart": 120000},
+                "nextLevel": {"level": 43, "xpStart": 130000},
+                "currentTitle": {"id": 120, "tierId": 3},
+            },
+            "totalMedals": {"bronze": 5, "silver": 6, "gold": 7, "platinum": 8},
+            "party": {"total": 10, "duels": 4, "teamDuels": 3, "battleRoyaleCountries": 3},
+            "quickplayFlawlessVictories": 2,
+            "perfectRounds": 17,
+        }
+
+    def elo(self, userId: str) -> dict:
+        return {
+            "divisionNumber": 2,
+            "rating": 1150,
+            "gameModeRatings": {"standardDuels": 1200, "noMoveDuels": 1100, "nmpzDuels": 1000},
+            "gameModeGamesPlayed": {"standardDuels": 100, "noMoveDuels": 50, "nmpzDuels": 20},
+        }
+
+    def friends(self) -> dict:
+        return {"friends": [{"userId": f"friend-{i}", "nick": f"friend {i}"} for i in range(10)]}
+
+    def feed_entry(self, index: int) -> dict:
+        time = iso(EPOCH - timedelta(hours=index))
+        if index % 3 == 0:  # A ranked duel
+            payload = {"gameId": f"duel-{index}", "gameMode": "Duels", "competitiveGameMode": "StandardDuels"}
+            return {"type": 6, "time": time, "user": {"id": "me"}, "payload": json.dumps(payload)}
+        if index % 3 == 1:  # Grouped games
+            games = [{"type": 1, "time": time, "payload": {"mapSlug": "world", "points": 20000 + index}}]
+            return {"type": 7, "time": time, "user": {"id": "me"}, "payload": json.dumps(games)}
+        return {"type": 2, "time": time, "user": {"id": "me"}, "payload": json.dumps({"mapSlug": "world"})}
+
+    def feed_page(self, count: int, paginationToken: Optional[str]) -> dict:
+        start = int(paginationToken) if paginationToken else 0
+        end = min(start + count, self.feedEntries)
+        return {
+            "entries": [self.feed_entry(i) for i in range(start, end)],
+            "paginationToken": str(end) if end < self.feedEntries else None,
+        }
+
+    def challenge(self, token: str) -> dict:
+        return {
+            "token": token,
+            "mapSlug": "world",
+            "roundCount": self.roundCount,
+            "timeLimit": 60,
+            "forbidMoving": False,
+            "forbidRotating": False,
+            "forbidZooming": False,
+            "gameMode": "Standard",
+            "challengeType": 0,
+            "challenge": {
+                "token": token,
+                "mapSlug": "world",
+                "roundCount": self.roundCount,
+                "timeLimit": 60,
+                "forbidMoving": False,
+                "forbidRotating": False,
+                "forbidZooming": False,
+            },
+            "map": {"name": "A Diverse World", "slug": "world"},
+        }
+
+    def highscore(self, token: str, rank: int) -> dict:
+        rounds = []
+        guesses = []
+        for i in range(self.roundCount):
+            code, lat, lng = COUNTRIES[(rank + i) % len(COUNTRIES)]
+            rounds.append({"lat": lat, "lng": lng, "panoId": f"pano-{i}", "heading": 0, "pitch": 0, "zoom": 0})
+            guesses.append(
+                {
+                    "lat": lat + 0.5,
+                    "lng": lng - 0.5,
+                    "timedOut": False,
+                    "timedOutWithGuess": False,
+                    "roundScore": {"amount": "4500", "unit": "points", "percentage": 90},
+                    "roundScoreInPercentage": 90,
+                    "roundScoreInPoints": 4500,
+                    "distance": {"meters": {"amount": "70", "unit": "km"}},
+                    "distanceInMeters": 70000,
+                    "time": 30,
+                }
+            )
+        return {
+            "gameToken": f"{token}-game-{rank}",
+            "playerName": f"player {rank}",
+            "userId": f"user-{rank}",
+            "totalScore": 25000 - rank,
+            "game": {
+                "token": f"{token}-game-{rank}",
+                "type": "challenge",
+                "mode": "standard",
+                "state": "finished",
+                "roundCount": self.roundCount,
+                "timeLimit": 60,
+                "map": "world",
+                "mapName": "A Diverse World",
+                "bounds": {"min": {"lat": -65, "lng": -180}, "max": {"lat": 78, "lng": 180}},
+                "rounds": rounds,
+                "player": {
+                    "id": f"user-{rank}",
+                    "nick": f"player {rank}",
+                    "pin": {"url": "pin.png"},
+                    "totalScore": {"amount": str(25000 - rank), "unit": "points", "percentage": 90},
+                    "totalDistance": {"meters": {"amount": "350", "unit": "km"}},
+                    "totalDistanceInMeters": 350000,
+                    "totalTime": 150,
+                    "totalStreak": 0,
+                    "guesses": guesses,
+                    "isLeader": rank == 0,
+                    "countryCode": "fr",
+                },
+                "progressChange": {
+                    "xpProgressions": [
+                        {"xp": 100, "currentLevel": {"level": 10}, "currentTitle": {"id": 1, "tierId": 1}},
+                        {"xp": 200, "currentLevel": {"level": 10}, "currentTitle": {"id": 1, "tierId": 1}},
+                    ]
+                },
+            },
+        }
+
+    def highscores_page(self, token: str, limit: int, paginationToken: Optional[str]) -> dict:
+        start = int(paginationToken) if paginationToken else 0
+        end = min(start + limit, self.highscores)
+        return {
+            "items": [self.highscore(token, rank) for rank in range(start, end)],
+            "paginationToken": str(end) if end < self.highscores else None,
+        }
+
+    def map(self, slug: str) -> dict:
+        return {
+            "id": slug,
+            "name": f"map {slug}",
+            "slug": slug,
+            "description": "A generated map",
+            "url": f"/maps/{slug}",
+            "playUrl": f"/maps/{slug}/play",
+            "published": True,
+            "likes": 1000,
+            "numFinishedGames": 100000,
+            "averageScore": 15000,
+            "created": iso(EPOCH - timedelta(days=1000)),
+            "updated": iso(EPOCH - timedelta(days=10)),
+            "creator": self.user("creator"),
+            "avatar": {"background": "day", "decoration": "none", "ground": "green", "landscape": "grass"},
+            "difficulty": "Medium",
+            "difficultyLevel": 3,
+            "highlighted": False,
+            "free": True,
+            "inExplorerMode": False,
+            "maxErrorDistance": 14916862,
+            "bounds": {"min": {"lat": -65, "lng": -180}, "max": {"lat": 78, "lng": 180}},
+            "tags": ["world"],
+        }
+
+    def map_search(self, query: str) -> list:
+        return [{"id": query, "name": f"map {query}", "coordinateCount": "50K+"}]
+
+    def duel_players(self, gameId: str) -> list[str]:
+        return [f"{gameId}-p1", f"{gameId}-p2"]
+
+    def duel(self, gameId: str) -> dict:
+        players = self.duel_players(gameId)
+        rounds = []
+        teamGuesses: list[list[dict]] = [[], []]
+        for i in range(self.roundCount):
+            code, lat, lng = COUNTRIES[i % len(COUNTRIES)]
+            start = EPOCH + timedelta(minutes=2 * i)
+            rounds.append(
+                {
+                    "roundNumber": i + 1,
+                    "panorama": {
+                        "panoId": f"pano-{i}",
+                        "lat": lat,
+                        "lng": lng,
+                        "countryCode": code,
+                        "heading": 90.0,
+                        "pitch": 0.0,
+                        "zoom": 0,
+                    },
+                    "hasProcessedRoundTimeout": True,
+                    "isHealingRound": False,
+                    "multiplier": 1 + i * 0.5,
+                    "damageMultiplier": 1,
+                    "startTime": iso(start),
+                    "endTime": iso(start + timedelta(seconds=45)),
+                    "timerStartTime": iso(start + timedelta(seconds=15)),
+                }
+            )
+            for team in range(2):
+                teamGuesses[team].append(
+                    {
+                        "roundNumber": i + 1,
+                        "lat": {"type": "Big Number", "value": f"{lat + team}n"},
+                        "lng": lng - team,
+                        "distance": 111000.0 * (team + 1),
+                        "created": iso(start + timedelta(seconds=20 + team)),
+                        "isTeamsBestGuessOnRound": True,
+                        "score": 4800 - 500 * team,
+                    }
+                )
+        teams = [
+            {
+                "id": f"team-{team}",
+                "name": ["red", "blue"][team],
+                "health": 6000 - 2000 * team,
+                "players": [
+                    {
+                        "playerId": players[team],
+                        "guesses": teamGuesses[team],
+                        "rating": 1200 - 50 * team,
+                        "countryCode": "fr",
+                        "progressChange": {
+                            "xpProgressions": [],
+                            "rankedSystemProgress": {"ratingBefore": 1190, "ratingAfter": 1200},
+                        },
+                    }
+                ],
+                "roundResults": [
+                    {
+                        "roundNumber": i + 1,
+                        "score": guess["score"],
+                        "healthBefore": 6000,
+                        "healthAfter": 6000,
+                        "bestGuess": guess,
+                        "damageDealt": 500,
+                        "multiplier": 1,
+                    }
+                    for i, guess in enumerate(teamGuesses[team])
+                ],
+                "isMultiplierActive": False,
+                "currentMultiplier": 1,
+            }
+            for team in range(2)
+        ]
+        return {
+            "gameId": gameId,
+            "teams": teams,
+            "rounds": rounds,
+            "currentRoundNumber": self.roundCount,
+            "status": "Finished",
+            "version": 42,
+            "initialHealth": 6000,
+            "maxNumberOfRounds": 0,
+            "options": {
+                "initialHealth": 6000,
+                "roundTime": 15,
+                "maxRoundTime": 0,
+                "mapSlug": "world",
+                "isRated": True,
+                "map": {"name": "A Diverse World", "slug": "world", "maxErrorDistance": 14916862},
+                "movementOptions": {"forbidMoving": False, "forbidZooming": False, "forbidRotating": False},
+                "competitiveGameMode": "StandardDuels",
+            },
+            "result": {"isDraw": False, "winningTeamId": "team-0", "winnerStyle": "Victory"},
+            "isPaused": False,
+        }
+
+    def replay(self, playerId: str, gameId: str, roundNumber: int) -> list:
+        start = int((EPOCH + timedelta(minutes=2 * (roundNumber - 1))).timestamp() * 1000)
+        return [{"time": start + 250 * i, **STEP_TEMPLATES[i % len(STEP_TEMPLATES)]} for i in range(self.replaySteps)]
+
+    def club(self, clubId: str) -> dict:
+        return {
+            "clubId": clubId,
+            "name": f"club {clubId}",
+            "description": "A generated club",
+            "tag": "GEN",
+            "language": "en",
+            "joinRule": 0,
+            "logo": {"logoIconId": 1, "logoIconSize": 1.0, "backgroundIconId": 2},
+            "labels": ["friendly"],
+            "stats": {"duels": 10, "teamDuels": 5},
+            "level": 5,
+            "xp": 50000,
+            "memberCount": self.clubMembers,
+            "maxMemberCount": 100,
+            "createdAt": iso(EPOCH - timedelta(days=100)),
+            "members": [
+                {
+                    "user": {"userId": f"{clubId}-member-{i}", "nick": f"member {i}", "countryCode": "fr"},
+                    "role": 2 if i else 1,
+                    "joinedAt": iso(EPOCH - timedelta(days=i)),
+                    "xp": 1000 * i,
+                    "weeklyXp": 10 * i,
+                    "isOnline": i % 2 == 0,
+                }
+                for i in range(self.clubMembers)
+            ],
+        }
+
+
+class MockGeoguessrServer:
+    """An aiohttp server answering the API endpoints called by Geoguessr with MockFixtures.
+
+    Attributes:
+        fixtures (MockFixtures): The responses of the server.
+        latency (Union[float, tuple[float, float]]): Delay before each response, fixed or uniform in a range,
+            in seconds.
+        errorRate (float): Probability that a request is answered with HTTP 500.
+        rateLimitRate (float): Probability that a request is answered with HTTP 429.
+        retryAfter (str): The Retry-After header of the 429 responses.
+        requests (list[tuple[str, str]]): The method and path with query of every request received.
+        statuses (Counter): The number of responses per status.
+    """
+
+    def __init__(
+        self,
+        fixtures: Optional[MockFixtures] = None,
+        latency: Union[float, tuple[float, float]] = 0.0,
+        errorRate: float = 0.0,
+        rateLimitRate: float = 0.0,
+        retryAfter: str = "0",
+        seed: Optional[int] = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.fixtures = fixtures or MockFixtures()
+        self.latency = latency
+        self.errorRate = errorRate
+        self.rateLimitRate = rateLimitRate
+        self.retryAfter = retryAfter
+        self.requests: list[tuple[str, str]] = []
+        self.statuses: Counter = Counter()
+        self._random = random.Random(seed)
+        self._injected: list[tuple[str, int, Optional[dict[str, str]]]] = []
+        self._host = host
+        self._port = port
+        self._runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application of the server."""
+        app = web.Application(middlewares=[self._faults])
+        f = self.fixtures
+        routes = [
+            ("GET", "/api/v3/profiles/", lambda r: f.profile()),
+            ("GET", "/api/v3/users/{userId}", lambda r: f.user(r.match_info["userId"])),
+            ("GET", "/api/v4/stats/users/{userId}", lambda r: f.stats(r.match_info["userId"])),
+            ("GET", "/api/v4/ranked-system/progress/{userId}", lambda r: f.elo(r.match_info["userId"])),
+            ("GET", "/api/v3/social/friends/summary", lambda r: f.friends()),
+            (
+                "GET",
+                "/api/v4/feed/private",
+                lambda r: f.feed_page(int(r.query.get("count", 10)), r.query.get("paginationToken")),
+            ),
+            ("GET", "/api/v3/challenges/{token}", lambda r: f.challenge(r.match_info["token"])),
+            ("POST", "/api/v3/challenges/{token}", lambda r: {"token": f"{r.match_info['token']}-game"}),
+            ("POST", "/api/v3/challenges", lambda r: {"token": f"challenge-{len(self.requests)}"}),
+            ("POST", "/api/v3/games/{token}", lambda r: {"token": r.match_info["token"]}),
+            ("GET", "/api/v3/games/{token}", lambda r: {"token": r.match_info["token"]}),
+            ("GET", "/api/v3/results/highscores/{token}", self._highscores),
+            ("GET", "/api/maps/{slug}", lambda r: f.map(r.match_info["slug"])),
+            ("GET", "/api/v3/search/map", lambda r: f.map_search(r.query.get("q", ""))),
+            ("GET", "/api/duels/{gameId}", lambda r: f.duel(r.match_info["gameId"])),
+            (
+                "GET",
+                "/api/replays/{playerId}/{gameId}/{roundNumber}",
+                lambda r: f.replay(r.match_info["playerId"], r.match_info["gameId"], int(r.match_info["roundNumber"])),
+            ),
+            ("GET", "/api/v4/clubs/{clubId}", lambda r: f.club(r.match_info["clubId"])),
+        ]
+        for method, path, build in routes:
+            app.router.add_route(method, path, self._handler(build))
+        return app
+
+    def _handler(self, build):
+        async def handle(request: web.Request) -> web.Response:
+            if request.path in self.fixtures.recorded:
+                return web.json_response(self.fixtures.recorded[request.path])
+            result = build(request)
+            return result if isinstance(result, web.Response) else web.json_response(result)
+
+        return handle
+
+    def _highscores(self, request: web.Request) -> Union[dict, web.Response]:
+        limit = int(request.query.get("limit", 26))
+        if limit > 100:  # The API refuses large pages
+            return web.json_response({"message": "limit too large"}, status=400)
+        return self.fixtures.highscores_page(request.match_info["token"], limit, request.query.get("paginationToken"))
+
+    @web.middleware
+    async def _faults(self, request: web.Request, handler) -> web.StreamResponse:
+        self.requests.append((request.method, request.path_qs))
+        if self.latency:
+            low, high = self.latency if isinstance(self.latency, tuple) else (self.latency, self.latency)
+            await asyncio.sleep(self._random.uniform(low, high))
+        response = self._injected_response(request.path)
+        if response is None:
+            draw = self._random.random()
+            if draw < self.rateLimitRate:
+                response = web.json_response(
+                    {"message": "Too many requests"}, status=429, headers={"Retry-After": self.retryAfter}
+                )
+            elif draw < self.rateLimitRate + self.errorRate:
+                response = web.json_response({"message": "Internal error"}, status=500)
+            else:
+                response = await handler(request)
+        self.statuses[response.status] += 1
+        return response
+
+    def _injected_response(self, path: str) -> Optional[web.Response]:
+        for i, (prefix, status, headers) in enumerate(self._injected):
+            if path.startswith(prefix):
+                del self._injected[i]
+                return web.json_response({"message": f"Injected HTTP {status}"}, status=status, headers=headers)
+        return None
+
+    def inject(self, pathPrefix: str, status: int, times: int = 1, retryAfter: Optional[str] = None) -> None:
+        """Answer the next requests of a path with an error status.
+
+        Args:
+            pathPrefix (str): The start of the URL paths to fail, such as '/api/duels/'.
+            status (int): The status of the responses, such as 429, 500 or 401.
+            times (int): The number of requests to fail. Defaults to 1.
+            retryAfter (Optional[str]): The Retry-After header of the responses. Defaults to None.
+        """
+        headers = None if retryAfter is None else {"Retry-After": retryAfter}
+        self._injected.extend((pathPrefix, status, headers) for _ in range(times))
+
+    def base_urls(self) -> dict[str, str]:
+        """The `baseUrls` option sending every API request of a Geoguessr client to this server."""
+        if self.url is None:
+            raise RuntimeError("The mock server is not started")
+        return {origin: self.url for origin in API_ORIGINS}
+
+    async def start(self) -> str:
+        """Start the server.
+
+        Returns:
+            str: The base URL of the server.
+        """
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self.url = None
+
+    async def __aenter__(self) -> "MockGeoguessrServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
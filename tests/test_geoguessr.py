@@ -2,13 +2,111 @@
 Tests for the geoguessr_async package.
 """
 
+import asyncio
+import io
+import json
+import math
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+
 import pytest
 import aiohttp
 
-from geoguessr_async import Geoguessr
-from geoguessr_async.models import GeoguessrStats
+from geoguessr_async import Geoguessr, json_backend, schemas
+from geoguessr_async.feed import GeoguessrFeedCursor
+from geoguessr_async.analytics import replay_metrics
+from geoguessr_async.cache import MISSING, MemoryCache, ResponseCache, SQLiteCache
+from geoguessr_async.exceptions import GeoguessrAuthError, GeoguessrRateLimitError
+from geoguessr_async.fetcher import Endpoint, fetch_all, session_fetcher
+from geoguessr_async.instrumentation import (
+    Histogram,
+    HistogramExporter,
+    OpenTelemetryExporter,
+    PrometheusExporter,
+    RequestEvent,
+)
+from geoguessr_async.models import (
+    GeoguessrActivities,
+    GeoguessrChallengeRound,
+    GeoguessrDuelData,
+    GeoguessrDuelReplay,
+    GeoguessrDuelReplayColumns,
+    GeoguessrDuelRound,
+    GeoguessrStats,
+    GeoguessrTime,
+)
+from geoguessr_async.pool import GeoguessrPool
+from geoguessr_async.ratelimit import RateLimiter, RetryPolicy, TokenBucket, parse_retry_after
+from geoguessr_async.store import DuelStore
 import geoguessr_async.geo_utils as gu
 
+from .mock_server import MockFixtures, MockGeoguessrServer
+
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response."""
+
+    def __init__(self, status, data, headers=None):
+        self.status = status
+        self._data = data
+        self.headers = {"Content-Type": "application/json; charset=utf-8", **(headers or {})}
+
+    async def __aenter__(self):
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+    async def json(self):
+        return self._data
+
+    async def read(self):
+        return json.dumps(self._data).encode()
+
+
+class FakeSession:
+    """Minimal stand-in for an aiohttp session serving canned responses by URL.
+
+    A route maps to a (status, data) or (status, data, headers) tuple, or to a list of those
+    served one after the other.
+    """
+
+    closed = False
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        route = self.routes.get(url, (404, None))
+        if isinstance(route, list):
+            route = route.pop(0) if len(route) > 1 else route[0]
+        return FakeResponse(*route)
+
+    def request(self, method, url, **kwargs):
+        return self.get(url, **kwargs)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeProfile:
+    """Stand-in for GeoguessrProfile built from partial data."""
+
+    def __init__(self, datas):
+        self.id = datas["id"]
+        self.stats = None
+
+    def add_stats(self, stats):
+        self.stats = stats
+
 
 class TestGeoUtils:
     """Test utility functions."""
@@ -33,6 +131,79 @@ class TestGeoUtils:
         expected = {"aBCD": 1, "e": 2}
         assert result == expected
 
+    def test_datetime_or_none_keeps_precision_and_timezone(self):
+        """API timestamps keep their fraction and time zone, invalid values give None."""
+        parsed = gu.datetime_or_none("2024-05-01T12:30:00.1234567Z")
+
+        assert parsed == datetime(2024, 5, 1, 12, 30, 0, 123456, tzinfo=timezone.utc)
+        assert gu.datetime_or_none("2024-05-01T12:30:00.5+02:00").utcoffset() == timedelta(hours=2)
+        assert gu._normalize_iso("2024-05-01T12:30:00.5Z") == "2024-05-01T12:30:00.500000+00:00"
+        assert gu.datetime_or_none(None) is None
+        assert gu.datetime_or_none("yesterday") is None
+
+    def test_decode_big_numbers(self):
+        """Big Number objects are replaced by floats anywhere in a document, in place."""
+        big = {"type": "Big Number", "value": "48.5n"}
+        document = {"rounds": [{"panorama": {"lat": dict(big), "lng": 2}}], "guess": {"lat": dict(big)}}
+
+        assert gu.decode_big_numbers(document) is document
+        assert document == {"rounds": [{"panorama": {"lat": 48.5, "lng": 2}}], "guess": {"lat": 48.5}}
+        assert gu.decode_big_numbers(dict(big)) == 48.5
+        assert gu.big_number_to_float(big) == 48.5
+        assert gu.big_number_to_float(None) == 0.0
+
+    def test_haversine_and_score(self):
+        """Distances are great-circle distances in meters, scores decay exponentially with them."""
+        assert gu.haversine(48.8566, 2.3522, 51.5074, -0.1278) == pytest.approx(343_557, rel=1e-4)
+        assert gu.geoguessr_score(0, 14916862) == 5000
+        assert gu.geoguessr_score(14916862, 14916862) == round(5000 * math.exp(-10))
+        assert gu.geoguessr_score(float("nan"), 14916862) == 0
+
+    def test_coordinates_of(self):
+        """Models with lat/long or lat/lng, dicts and pairs are accepted."""
+        round_ = GeoguessrChallengeRound({"lat": 1, "lng": 2, "startTime": "2024-01-01T00:00:00.000Z"}, 1)
+
+        assert gu.coordinates_of(round_) == (1.0, 2.0)
+        assert gu.coordinates_of({"lat": 3, "lng": 4}) == (3.0, 4.0)
+        assert gu.coordinates_of((5, 6)) == (5.0, 6.0)
+        assert all(math.isnan(value) for value in gu.coordinates_of({"lat": None}))
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_score_batch(self, vectorized):
+        """Guesses are scored pair by pair, a missing guess scores 0."""
+        if vectorized:
+            pytest.importorskip("numpy")
+        guesses = [{"lat": 51.5074, "lng": -0.1278}, {"lat": 10, "lng": 10}, {"lat": None, "lng": None}]
+        locations = [(48.8566, 2.3522), (10, 10), (0, 0)]
+
+        distances = gu.haversine_batch(guesses, locations, vectorized)
+        assert distances[:2] == pytest.approx([343_557, 0], rel=1e-4, abs=1e-6)
+        assert math.isnan(distances[2])
+        assert gu.score_batch(guesses, locations, 14916862, vectorized) == [3971, 5000, 0]
+        with pytest.raises(ValueError):
+            gu.haversine_batch(guesses, locations[:1], vectorized)
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_score_batch_from_arrays(self, vectorized):
+        """(n, 2) arrays and (lats, lngs) columns score like the per-point objects."""
+        np = pytest.importorskip("numpy")
+        guesses = np.array([[51.5074, -0.1278], [10, 10]])
+        locations = (array("d", [48.8566, 10]), array("d", [2.3522, 10]))
+
+        assert gu.score_batch(guesses, locations, 14916862, vectorized) == [3971, 5000]
+        assert gu.score_batch(locations, guesses, 14916862, vectorized) == [3971, 5000]
+        with pytest.raises(ValueError):
+            gu.haversine_batch(np.zeros((2, 3)), locations, vectorized)
+
+    @pytest.mark.parametrize("maxErrorDistance", [0, -1, float("nan")])
+    def test_score_rejects_invalid_max_error_distance(self, maxErrorDistance):
+        """A map without a positive maxErrorDistance cannot be scored."""
+        with pytest.raises(ValueError):
+            gu.geoguessr_score(10, maxErrorDistance)
+        for vectorized in (False, True) if gu.np is not None else (False,):
+            with pytest.raises(ValueError):
+                gu.score_batch([(0, 0)], [(1, 1)], maxErrorDistance, vectorized)
+
 
 class TestGeoguessrInit:
     """Test Geoguessr class initialization."""
@@ -54,6 +225,69 @@ class TestGeoguessrInit:
         assert geoguessr.meId is None
         assert geoguessr.meElo is None
 
+    @pytest.mark.asyncio
+    async def test_geoguessr_connection_options(self):
+        """The session created by the client uses the connection options."""
+        geoguessr = Geoguessr("test_ncfa_token", connectionLimit=7, connectionLimitPerHost=3, timeout=12)
+        session = await geoguessr.session
+
+        assert session.connector.limit == 7
+        assert session.connector.limit_per_host == 3
+        assert session.timeout.total == 12
+        await geoguessr.close()
+        assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_geoguessr_shared_connector_and_session(self):
+        """Clients never close a connector or a session owned by the caller."""
+        connector = aiohttp.TCPConnector()
+        first = Geoguessr("first", connector=connector)
+        second = Geoguessr("second", connector=connector)
+        assert (await first.session).connector is (await second.session).connector
+        await first.close()
+        assert not connector.closed
+
+        session = aiohttp.ClientSession(connector=connector, connector_owner=False)
+        external = Geoguessr("external", session=session)
+        assert await external.session is session
+        await external.close()
+        del external
+        assert not session.closed
+
+        await second.close()
+        await session.close()
+        await connector.close()
+
+    @pytest.mark.asyncio
+    async def test_get_all_my_infos_fetches_stats_once(self, monkeypatch):
+        """The sub-requests run once the user ID is known, stats are fetched once, and parts can be skipped."""
+        monkeypatch.setattr("geoguessr_async.geoguessr.GeoguessrProfile", FakeProfile)
+        monkeypatch.setattr("geoguessr_async.geoguessr.GeoguessrStats", dict)
+        monkeypatch.setattr("geoguessr_async.geoguessr.GeoguessrUserELO", dict)
+        stats = "https://www.geoguessr.com/api/v4/stats/users/me"
+        geoguessr = Geoguessr("test_ncfa_token")
+        geoguessr._session = FakeSession(
+            {
+                "https://www.geoguessr.com/api/v3/profiles/": (200, {"user": {"id": "me"}}),
+                "https://www.geoguessr.com/api/v3/users/me": (200, {"id": "me"}),
+                stats: (200, {"duels": {}}),
+                "https://www.geoguessr.com/api/v3/social/friends/summary?page=0&fast=true": (
+                    200,
+                    {"friends": [{"nick": "Friend", "userId": "friend"}]},
+                ),
+                "https://www.geoguessr.com/api/v4/ranked-system/progress/me": (200, {"rating": 1000}),
+            }
+        )
+
+        await geoguessr.get_all_my_infos(withActivities=False)
+
+        assert geoguessr._session.requested.count(stats) == 1
+        assert geoguessr.me.stats is geoguessr.meStats == {"duels": {}}
+        assert geoguessr.friends == {"Friend": "friend"}
+        assert geoguessr.meElo == {"rating": 1000}
+        assert geoguessr.activities is None
+        assert not any("feed" in url for url in geoguessr._session.requested)
+
 
 class TestGeoguessrStats:
     """Test GeoguessrStats model."""
@@ -61,30 +295,1208 @@ class TestGeoguessrStats:
     def test_geoguessr_stats_init_with_data(self):
         """Test GeoguessrStats initialization with data."""
         testData = {
-            "battleRoyaleRank": {
-                "rank": 100,
-                "rating": 1500,
-                "gamesLeftBeforeRanked": 5
-            },
-            "duels": {
-                "numGamesPlayed": 10
-            }
+            "battleRoyaleDistance": {"numGamesPlayed": 100, "avgPosition": 2.5, "numWins": 5},
+            "duels": {"numGamesPlayed": 10},
         }
 
         stats = GeoguessrStats(testData)
 
-        assert stats.battleRoyaleRankRank == 100
-        assert stats.battleRoyaleRankRating == 1500
-        assert stats.battleRoyaleRankGamesleftbeforeranked == 5
-        assert stats.duelsNumgamesplayed == 10
+        assert stats.battleRoyaleDistance.numGamesPlayed == 100
+        assert stats.battleRoyaleDistance.avgPosition == 2.5
+        assert stats.battleRoyaleDistance.numWins == 5
+        assert stats.duels.numGamesPlayed == 10
 
     def test_geoguessr_stats_init_empty(self):
         """Test GeoguessrStats initialization with empty data."""
         stats = GeoguessrStats({})
 
-        assert stats.battleRoyaleRankRank is None
-        assert stats.battleRoyaleRankRating is None
-        assert stats.duelsNumgamesplayed is None
+        assert stats.battleRoyaleDistance.numGamesPlayed is None
+        assert stats.battleRoyaleDistance.avgPosition is None
+        assert stats.duels.numGamesPlayed is None
+
+    def test_sub_objects_are_built_lazily(self):
+        """Sub-objects are built on first access from the raw data, then cached."""
+        stats = GeoguessrStats({"duels": {"numGamesPlayed": 10}, "perfectRounds": 3})
+
+        assert stats._lazy == {}
+        assert stats.perfectRounds == 3
+        duels = stats.duels
+        assert duels.numGamesPlayed == 10
+        assert stats.duels is duels
+        assert list(stats._lazy) == ["duels"]
+        assert stats.party.total is None
+
+    def test_lazy_sub_objects_in_tree(self):
+        """to_tree lists the lazy sub-objects first, in declaration order, like the former attributes."""
+        stats = GeoguessrStats({"lifeTimeXpProgression": {"currentLevel": {}, "nextLevel": {}, "currentTitle": {}}})
+
+        names = [name for name, _ in stats._iter_fields() if not name.startswith("_")]
+        assert names[:2] == ["rankedTeamDuelsStandard", "rankedTeamDuelsNoMove"]
+        assert names[-3:] == ["party", "quickplayFlawlessVictories", "perfectRounds"]
+        assert len(names) == 25
+        assert "duels (GeoguessrStatsDuels):" in stats.to_tree()
+
+
+class TestModelSlots:
+    """Test the slotted model classes."""
+
+    def test_models_have_no_instance_dict(self):
+        """Every model declares its attributes in __slots__."""
+        step = GeoguessrDuelReplay([{"time": 1700000000000, "type": "PanoPov", "payload": {"heading": 1}}]).datas[0]
+
+        assert not hasattr(step, "__dict__")
+        assert not hasattr(step.payload, "__dict__")
+        with pytest.raises(AttributeError):
+            step.unknown = 1
+
+    def test_to_tree_walks_slots_in_order(self):
+        """to_tree lists the attributes in declaration order and skips the unset ones."""
+        assert GeoguessrTime(90).to_tree() == "seconds (int) = 90\nminutes (float) = 1.5\nhours (float) = 0.025"
+        assert GeoguessrTime().to_tree() == ""
+        assert "_indexedCount" not in GeoguessrActivities([]).to_tree()
+
+
+class TestTreeSerialization:
+    """Test the streaming tree output and the dict/JSON export of the models."""
+
+    def duel(self):
+        duel = GeoguessrDuelData(
+            {
+                "gameId": "g",
+                "currentRoundNumber": 1,
+                "teams": [{"id": "t1", "players": [{"playerId": "p1"}], "roundResults": []}],
+                "context": {"a": [1, 2]},
+            }
+        )
+        step = {"time": 1700000000000, "type": "PanoZoom", "payload": {"zoom": 1.5}}
+        duel.replays = {"p1": [GeoguessrDuelReplay([step, step]), None]}
+        return duel
+
+    def test_write_tree_matches_to_tree(self):
+        """The streamed tree is the same text as to_tree, empty lists and empty models included."""
+        duel = self.duel()
+        stats = GeoguessrStats({})
+        stats.party = GeoguessrTime()
+
+        for model in (duel, stats, GeoguessrTime()):
+            output = io.StringIO()
+            model.write_tree(output)
+            assert output.getvalue() == model.to_tree()
+        assert "roundResults" not in duel.to_tree()
+
+    def test_to_dict_and_json(self):
+        """to_dict gives JSON types in one walk and to_json encodes it."""
+        duel = self.duel()
+        tree = duel.to_dict()
+
+        step = tree["replays"]["p1"][0]["datas"][0]
+        assert step["type"] == "PanoZoom"
+        assert step["time"] == datetime.fromtimestamp(1700000000, tz=timezone.utc).isoformat()
+        assert step["payload"] == {"zoom": 1.5}
+        assert tree["replays"]["p1"][1] is None
+        assert tree["teams"][0]["players"][0]["playerId"] == "p1"
+        assert json.loads(duel.to_json()) == tree
+
+
+class TestFetchAll:
+    """Test the bounded-concurrency fetch engine."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_keeps_order_and_bounds_concurrency(self):
+        """Results come back in input order and never exceed the concurrency limit."""
+        inFlight = 0
+        maxInFlight = 0
+
+        async def fetcher(url):
+            nonlocal inFlight, maxInFlight
+            inFlight += 1
+            maxInFlight = max(maxInFlight, inFlight)
+            await asyncio.sleep(0.01 if url == "0" else 0)
+            inFlight -= 1
+            return int(url)
+
+        results = await fetch_all([str(i) for i in range(10)], fetcher, concurrency=3)
+
+        assert [result.data for result in results] == list(range(10))
+        assert maxInFlight == 3
+        assert all(result.ok and result.elapsed >= 0 for result in results)
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_captures_errors(self):
+        """A failing request is reported without affecting the others."""
+
+        async def fetcher(url):
+            if url == "bad":
+                raise ValueError("broken")
+            return url
+
+        results = await fetch_all(["a", "bad", "b"], fetcher)
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert isinstance(results[1].error, ValueError)
+        assert results[1].data is None
+
+
+class TestGeoguessrDuelReplays:
+    """Test concurrent replay fetching on GeoguessrDuelData."""
+
+    @pytest.mark.asyncio
+    async def test_set_replays_round_order_and_failures(self):
+        """Replays are stored per player in round order, with None for failed rounds."""
+        duel = GeoguessrDuelData(
+            {
+                "gameId": "game",
+                "currentRoundNumber": 2,
+                "teams": [{"players": [{"playerId": "p1"}]}, {"players": [{"playerId": "p2"}]}],
+            }
+        )
+        step = {"time": 1700000000000, "type": "PanoZoom", "payload": {"zoom": 1}}
+        base = "https://game-server.geoguessr.com/api/replays"
+        session = FakeSession(
+            {
+                f"{base}/p1/game/1": (200, [step]),
+                f"{base}/p1/game/2": (200, [step, step]),
+                f"{base}/p2/game/1": (500, None),
+                f"{base}/p2/game/2": (200, []),
+            }
+        )
+
+        results = await duel.set_replays(session, concurrency=2)
+
+        assert len(results) == 4
+        assert [len(replay.datas) for replay in duel.replays["p1"]] == [1, 2]
+        assert duel.replays["p2"][0] is None
+        assert duel.replays["p2"][1].datas == []
+        assert not results[2].ok
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("columnar", [False, True])
+    async def test_set_replays_isolates_malformed_replay(self, columnar):
+        """A replay that cannot be parsed only loses its round, and its error is kept on its result."""
+        duel = GeoguessrDuelData(
+            {"gameId": "game", "currentRoundNumber": 2, "teams": [{"players": [{"playerId": "p1"}]}]}
+        )
+        step = {"time": 1700000000000, "type": "PanoZoom", "payload": {"zoom": 1}}
+        base = "https://game-server.geoguessr.com/api/replays"
+        session = FakeSession(
+            {
+                f"{base}/p1/game/1": (200, [step, {"time": 1700000000250, "type": "NewThing", "payload": {}}]),
+                f"{base}/p1/game/2": (200, [step]),
+            }
+        )
+
+        results = await duel.set_replays(session, columnar=columnar)
+
+        assert duel.replays["p1"][0] is None
+        replay = duel.replays["p1"][1]
+        assert len(replay if columnar else replay.datas) == 1
+        assert not results[0].ok and isinstance(results[0].error, ValueError)
+        assert results[1].ok
+
+    def test_replay_step_time_is_utc(self):
+        """Replay step times are UTC like the round times, so they can be compared and subtracted."""
+        duelRound = GeoguessrDuelRound({"roundNumber": 1, "startTime": "2023-11-14T22:13:10.000Z"})
+        datas = [{"time": 1700000000000, "type": "PanoZoom", "payload": {"zoom": 1}}]
+
+        steps = [GeoguessrDuelReplay(datas).datas[0], GeoguessrDuelReplayColumns(datas)[0]]
+        if schemas.msgspec is not None:
+            steps.append(schemas.decode_replay(datas).datas[0])
+        for step in steps:
+            assert step.time.tzinfo is not None
+            assert (step.time - duelRound.startTime).total_seconds() == 10
+
+    def test_columnar_replay_matches_objects(self):
+        """The columnar replay rebuilds the same steps as GeoguessrDuelReplay."""
+        datas = [
+            {"time": 1700000000000, "type": "PanoPosition", "payload": {"lat": 48.5, "lng": 2.25, "panoId": "pano"}},
+            {"time": 1700000000250, "type": "PanoPov", "payload": {"heading": 120.5, "pitch": -3.0}},
+            {"time": 1700000000500, "type": "MapZoom", "payload": {"zoom": 4}},
+            {"time": 1700000000750, "type": "MapDisplay", "payload": {"isActive": True, "isSticky": False, "size": 2}},
+            {"time": 1700000001000, "type": "GuessWithLatLng", "payload": {"lat": 45.0, "lng": 3.0}},
+        ]
+        replay = GeoguessrDuelReplay(datas)
+        columns = GeoguessrDuelReplayColumns(datas)
+
+        assert len(columns) == 5
+        assert columns.type_at(2) is GeoguessrDuelReplay.Type.MAPZOOM
+        assert math.isnan(columns.heading[0]) and columns.heading[1] == 120.5
+        assert columns[-1].payload.lat == 45.0
+        assert columns.to_tree() == replay.to_tree()
+
+    @pytest.mark.asyncio
+    async def test_set_replays_columnar(self):
+        """set_replays can store the replays in columns."""
+        duel = GeoguessrDuelData(
+            {"gameId": "game", "currentRoundNumber": 1, "teams": [{"players": [{"playerId": "p1"}]}]}
+        )
+        step = {"time": 1700000000000, "type": "PanoZoom", "payload": {"zoom": 1}}
+        session = FakeSession({"https://game-server.geoguessr.com/api/replays/p1/game/1": (200, [step, step])})
+
+        await duel.set_replays(session, columnar=True)
+
+        assert isinstance(duel.replays["p1"][0], GeoguessrDuelReplayColumns)
+        assert list(duel.replays["p1"][0].zoom) == [1.0, 1.0]
+
+    def test_typed_replay_matches_constructors(self):
+        """Replays decoded through the msgspec schemas equal those built by the constructors."""
+        pytest.importorskip("msgspec")
+        big = {"type": "Big Number", "value": "48.5n"}
+        datas = [
+            {"time": 1700000000000, "type": "PanoPosition", "payload": {"lat": big, "lng": 2, "panoId": "pano"}},
+            {"time": 1700000000250, "type": "PanoPov", "payload": {"heading": 120.5, "pitch": -3}},
+            {"time": 1700000000500, "type": "PanoZoom", "payload": {"zoom": 1.5}},
+            {"time": 1700000000750, "type": "MapZoom", "payload": {"zoom": 4.7}},
+            {"time": 1700000001000, "type": "MapPosition", "payload": {"lat": 45.1, "lng": 3.2}},
+            {"time": 1700000001250, "type": "PinPosition", "payload": {"lat": 45.0, "lng": None}},
+            {"time": 1700000001500, "type": "Timer", "payload": {"time": 15}},
+            {"time": 1700000001750, "type": "MapDisplay", "payload": {"isActive": True, "size": 2}},
+            {"time": 1700000002000, "type": "GuessWithLatLng", "payload": {"lat": 45.0, "lng": 3.0}},
+        ]
+        body = json.dumps(datas).encode()
+
+        expected = GeoguessrDuelReplay(gu.decode_big_numbers(json.loads(body)))
+        assert schemas.decode_replay(body).to_tree() == expected.to_tree()
+        assert schemas.decode_replay(json.loads(body)).to_tree() == expected.to_tree()
+        expectedColumns = GeoguessrDuelReplayColumns(json.loads(body))
+        columns = schemas.decode_replay_columns(body)
+        for field in GeoguessrDuelReplayColumns.__slots__:
+            assert repr(getattr(columns, field)) == repr(getattr(expectedColumns, field))
+
+        with pytest.raises(ValueError):
+            schemas.decode_replay(b'[{"time": 1, "type": "Teleport", "payload": {}}]')
+
+    def test_typed_replay_parity_on_partial_payloads(self):
+        """Null payloads and fields foreign to a step type decode the same through both paths."""
+        pytest.importorskip("msgspec")
+        datas = [
+            {"time": 1700000000000, "type": "PanoPosition", "payload": None},
+            {"time": 1700000000250, "type": "PanoPov", "payload": {"heading": 90, "panoId": "stray", "lat": 1.5}},
+            {"time": 1700000000500, "type": "MapZoom"},
+            {"time": 1700000000750, "type": "MapDisplay", "payload": {"size": 2}},
+            {"time": 1700000001000, "type": "PanoPosition", "payload": {"lat": 48.5, "lng": 2.25, "panoId": "pano"}},
+        ]
+        body = json.dumps(datas).encode()
+
+        replay = GeoguessrDuelReplay(gu.decode_big_numbers(json.loads(body)))
+        assert replay.datas[0].payload.lat is None
+        assert schemas.decode_replay(body).to_tree() == replay.to_tree()
+        columns = GeoguessrDuelReplayColumns(json.loads(body))
+        typedColumns = schemas.decode_replay_columns(body)
+        assert columns.panoIds == typedColumns.panoIds == [None, None, None, None, "pano"]
+        for field in GeoguessrDuelReplayColumns.__slots__:
+            assert repr(getattr(typedColumns, field)) == repr(getattr(columns, field))
+        assert columns.to_tree() == replay.to_tree()
+
+    @pytest.mark.asyncio
+    async def test_set_replays_typed(self):
+        """set_replays can decode the raw replay bodies through the schemas."""
+        pytest.importorskip("msgspec")
+        duel = GeoguessrDuelData(
+            {"gameId": "game", "currentRoundNumber": 1, "teams": [{"players": [{"playerId": "p1"}]}]}
+        )
+        step = {"time": 1700000000000, "type": "PanoZoom", "payload": {"zoom": 1}}
+        session = FakeSession({"https://game-server.geoguessr.com/api/replays/p1/game/1": (200, [step, step])})
+
+        await duel.set_replays(session, typed=True)
+
+        assert isinstance(duel.replays["p1"][0], GeoguessrDuelReplay)
+        assert [step.payload.zoom for step in duel.replays["p1"][0].datas] == [1.0, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_client_typed_replays_decode_raw_bodies(self):
+        """A client with typedReplays hands the replay bytes to the schemas, and caches the decoded JSON."""
+        pytest.importorskip("msgspec")
+        decoded = []
+
+        def loads(body):
+            decoded.append(body)
+            return json_backend.loads(body)
+
+        async with MockGeoguessrServer(MockFixtures(roundCount=2, replaySteps=20)) as server:
+            plain = Geoguessr("test_ncfa_token", baseUrls=server.base_urls())
+            typed = Geoguessr("test_ncfa_token", baseUrls=server.base_urls(), jsonLoads=loads, typedReplays=True)
+            expected = await plain.get_duel_info("duel-1")
+            duel = await typed.get_duel_info("duel-1")
+            assert len(decoded) == 1  # Only the duel document, not its 4 replays
+
+            typed.cache = ResponseCache()
+            await typed.get_duel_info("duel-1")
+            cachedReplays = [key for key in typed.cache.backend._entries if "/api/replays/" in key]
+            fromCache = await typed.get_duel_info("duel-1")
+            await plain.close()
+            await typed.close()
+
+        assert len(cachedReplays) == 4
+        for result in (duel, fromCache):
+            assert result.replays["duel-1-p1"][1].to_tree() == expected.replays["duel-1-p1"][1].to_tree()
+
+    @pytest.mark.asyncio
+    async def test_get_duel_info_decodes_big_numbers_once(self):
+        """Big Numbers of the duel and its replays are decoded before the models are built and cached."""
+        big = {"type": "Big Number", "value": "1.5"}
+        duel = {
+            "gameId": "g",
+            "status": "Finished",
+            "currentRoundNumber": 1,
+            "teams": [{"players": [{"playerId": "p1", "guesses": [{"lat": big, "lng": 2}]}]}],
+            "rounds": [{"roundNumber": 1, "panorama": {"lat": big, "lng": big}}],
+        }
+        step = {"time": 1700000000000, "type": "PanoPosition", "payload": {"lat": big, "lng": 2, "panoId": "p"}}
+        geoguessr = Geoguessr("test_ncfa_token", cache=ResponseCache())
+        geoguessr._session = FakeSession(
+            {
+                "https://game-server.geoguessr.com/api/duels/g": (200, duel),
+                "https://game-server.geoguessr.com/api/replays/p1/g/1": (200, [step]),
+            }
+        )
+
+        data = await geoguessr.get_duel_info("g", columnarReplays=True)
+
+        assert data.teams[0].players[0].guesses[0].lat == 1.5
+        assert data.rounds[0].panorama.lng == 1.5
+        assert data.replays["p1"][0].lat[0] == 1.5
+        cached = geoguessr.cache.get(Endpoint.DUEL, "https://game-server.geoguessr.com/api/duels/g")
+        assert cached["rounds"][0]["panorama"]["lat"] == 1.5
+
+
+class TestReplayAnalytics:
+    """Test the replay metrics."""
+
+    def duel(self):
+        """Build a two-player duel with columnar, object and missing replays."""
+        duel = GeoguessrDuelData(
+            {
+                "gameId": "game",
+                "currentRoundNumber": 2,
+                "teams": [{"players": [{"playerId": "p1"}]}, {"players": [{"playerId": "p2"}]}],
+            }
+        )
+        steps = [
+            {"time": 1000, "type": "PanoPosition", "payload": {"lat": 0.0, "lng": 0.0, "panoId": "a"}},
+            {"time": 2000, "type": "PanoPov", "payload": {"heading": 10, "pitch": 0}},
+            {"time": 3000, "type": "PanoPosition", "payload": {"lat": 0.0, "lng": 1.0, "panoId": "b"}},
+            {"time": 4000, "type": "MapZoom", "payload": {"zoom": 3}},
+            {"time": 5000, "type": "MapZoom", "payload": {"zoom": 5}},
+            {"time": 6000, "type": "PanoZoom", "payload": {"zoom": 1.5}},
+            {"time": 8500, "type": "GuessWithLatLng", "payload": {"lat": 1.0, "lng": 1.0}},
+        ]
+        duel.replays = {
+            "p1": [GeoguessrDuelReplayColumns(steps), None],
+            "p2": [GeoguessrDuelReplay(steps[:2]), GeoguessrDuelReplayColumns([])],
+        }
+        return duel
+
+    def test_replay_metrics_python(self):
+        """The pure Python path computes the metrics of every fetched replay."""
+        metrics = replay_metrics(self.duel(), vectorized=False)
+
+        assert [(m.playerId, m.roundNumber) for m in metrics] == [("p1", 1), ("p2", 1), ("p2", 2)]
+        first = metrics[0]
+        assert first.movementDistance == pytest.approx(111195, rel=1e-3)
+        assert first.timeToGuess == 7.5
+        assert (first.panCount, first.zoomCount, first.mapZoomCount) == (1, 1, 2)
+        assert (first.maxMapZoom, first.meanMapZoom) == (5, 4)
+        assert metrics[1].timeToGuess is None and metrics[1].maxMapZoom is None
+        assert metrics[2].steps == 0
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_time_to_guess_from_round_start(self, vectorized):
+        """timeToGuess counts from the start time of the round, before the first step of the replay."""
+        if vectorized:
+            pytest.importorskip("numpy")
+        duel = self.duel()
+        duel.rounds = [GeoguessrDuelRound({"roundNumber": 1, "startTime": "1970-01-01T00:00:00.000Z"})]
+
+        metrics = replay_metrics(duel, vectorized=vectorized)
+
+        assert metrics[0].timeToGuess == 8.5  # Round start at 0 ms, first step at 1000 ms, guess at 8500 ms
+        assert metrics[2].timeToGuess is None
+
+    def test_replay_metrics_vectorized_matches_python(self):
+        """The numpy path gives the same metrics as the pure Python one."""
+        pytest.importorskip("numpy")
+        duel = self.duel()
+
+        for vectorized, python in zip(replay_metrics(duel, vectorized=True), replay_metrics(duel, vectorized=False)):
+            assert vectorized.movementDistance == pytest.approx(python.movementDistance)
+            vectorized.movementDistance = python.movementDistance
+            assert vectorized.to_tree() == python.to_tree()
+
+
+class TestGeoguessrDuelsBulk:
+    """Test bulk duel ingestion."""
+
+    @pytest.mark.asyncio
+    async def test_get_duels_bulk_streams_results_and_errors(self):
+        """Every duel is yielded once, with an error object for the ones that failed."""
+        duel = {"gameId": "ok", "currentRoundNumber": 1, "teams": [{"players": [{"playerId": "p1"}]}]}
+        geoguessr = Geoguessr("test_ncfa_token")
+        geoguessr._session = FakeSession(
+            {
+                "https://game-server.geoguessr.com/api/duels/ok": (200, duel),
+                "https://game-server.geoguessr.com/api/replays/p1/ok/1": (200, []),
+            }
+        )
+
+        results = [
+            result
+            async for result in geoguessr.get_duels_bulk(
+                ["https://www.geoguessr.com/duels/ok/summary", "missing"], concurrency=2
+            )
+        ]
+
+        byUrl = {result.duelUrl: result for result in results}
+        assert len(results) == 2
+        assert byUrl["https://www.geoguessr.com/duels/ok/summary"].data.gameId == "ok"
+        assert len(byUrl["https://www.geoguessr.com/duels/ok/summary"].replayResults) == 1
+        assert not byUrl["missing"].ok
+        assert byUrl["missing"].data is None
+
+
+class TestResponseCache:
+    """Test the response cache and its backends."""
+
+    def test_memory_cache_evicts_least_recently_used(self):
+        """The memory backend drops the least recently used value when full."""
+        cache = MemoryCache(maxSize=2)
+        cache.set("a", 1, None)
+        cache.set("b", 2, None)
+        assert cache.get("a") == 1
+        cache.set("c", 3, None)
+
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_memory_cache_expires_values(self, monkeypatch):
+        """Values are dropped once their time to live has elapsed."""
+        now = 1000.0
+        monkeypatch.setattr("geoguessr_async.cache.time.monotonic", lambda: now)
+        cache = MemoryCache()
+        cache.set("a", 1, 10)
+        assert cache.get("a") == 1
+        now = 1010.0
+        assert cache.get("a") is MISSING
+
+    def test_sqlite_cache_persists(self, tmp_path):
+        """Values stored on disk are found by a new backend on the same file."""
+        path = str(tmp_path / "cache.sqlite3")
+        cache = SQLiteCache(path)
+        cache.set("duel", {"gameId": "abc", "rounds": [1, 2]}, None)
+        cache.close()
+
+        assert SQLiteCache(path).get("duel") == {"gameId": "abc", "rounds": [1, 2]}
+
+    def test_sqlite_cache_batches_commits(self, tmp_path):
+        """Writes are seen by lookups at once, but only committed to the file once a batch is full."""
+        path = str(tmp_path / "cache.sqlite3")
+        cache = SQLiteCache(path, batchSize=3, flushInterval=3600)
+        reader = SQLiteCache(path)
+        cache.set("a", 1, None)
+        cache.set("b", 2, None)
+
+        assert cache.get("a") == 1
+        assert reader.get("a") is MISSING
+        cache.set("c", 3, None)
+        assert [reader.get(key) for key in "abc"] == [1, 2, 3]
+        cache.set("d", 4, None)
+        cache.close()
+        assert reader.get("d") == 4
+        reader.close()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_cache_keeps_the_loop_responsive(self, tmp_path):
+        """The client runs the SQLite lookups and writes off the event loop."""
+
+        class SlowSQLiteCache(SQLiteCache):
+            def get(self, key):
+                time.sleep(0.1)
+                return super().get(key)
+
+            def set(self, key, value, ttl):
+                time.sleep(0.1)
+                super().set(key, value, ttl)
+
+        backend = SlowSQLiteCache(str(tmp_path / "cache.sqlite3"))
+        geoguessr = Geoguessr("test_ncfa_token", cache=ResponseCache(backend))
+        url = "https://game-server.geoguessr.com/api/duels/done"
+        geoguessr._session = FakeSession(
+            {url: (200, {"gameId": "done", "status": "Finished", "currentRoundNumber": 0})}
+        )
+        gaps = []
+
+        async def ticker():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0.01)
+        try:
+            for _ in range(3):
+                await geoguessr.get_duel_info("done")
+            await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+        backend.close()
+
+        assert geoguessr._session.requested.count(url) == 1
+        assert geoguessr.cache.hits == 2
+        assert len(gaps) > 10 and max(gaps) < 0.05
+
+    def test_response_cache_counters_and_ttls(self):
+        """Only endpoints with a time to live are cached, and lookups are counted."""
+        cache = ResponseCache(ttls={Endpoint.USER: 0})
+        cache.set(Endpoint.USER, "user-url", {"id": 1})
+        cache.set(Endpoint.MAP, "map-url", {"id": 2})
+
+        assert cache.get(Endpoint.USER, "user-url") is MISSING
+        assert cache.get(Endpoint.MAP, "map-url") == {"id": 2}
+        assert cache.get(Endpoint.MAP, "other-map-url") is MISSING
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.endpointStats[Endpoint.MAP] == {"hits": 1, "misses": 1}
+        assert cache.hitRatio == 0.5
+
+    @pytest.mark.asyncio
+    async def test_client_caches_finished_duels_only(self):
+        """Finished duels are served from the cache, ongoing ones are fetched again."""
+        base = "https://game-server.geoguessr.com/api/duels"
+        geoguessr = Geoguessr("test_ncfa_token", cache=ResponseCache())
+        geoguessr._session = FakeSession(
+            {
+                f"{base}/done": (200, {"gameId": "done", "status": "Finished", "currentRoundNumber": 0}),
+                f"{base}/live": (200, {"gameId": "live", "status": "Ongoing", "currentRoundNumber": 0}),
+            }
+        )
+
+        for _ in range(2):
+            await geoguessr.get_duel_info("done")
+            await geoguessr.get_duel_info("live")
+
+        assert geoguessr._session.requested.count(f"{base}/done") == 1
+        assert geoguessr._session.requested.count(f"{base}/live") == 2
+        assert geoguessr.cache.hits == 1
+
+
+class TestDuelStore:
+    """Test the local SQLite store of duels."""
+
+    def duel(self, score=4000, replays=True):
+        duel = GeoguessrDuelData(
+            {
+                "gameId": "g1",
+                "status": "Finished",
+                "currentRoundNumber": 2,
+                "options": {"mapSlug": "world"},
+                "result": {"winningTeamId": "t1"},
+                "teams": [
+                    {
+                        "id": "t1",
+                        "players": [
+                            {
+                                "playerId": "p1",
+                                "countryCode": "fr",
+                                "guesses": [
+                                    {"roundNumber": 1, "lat": 48.8, "lng": 2.3, "score": score, "distance": 1200},
+                                    {"roundNumber": 2, "lat": 40.4, "lng": -3.7, "score": 3000, "distance": 9000},
+                                ],
+                            }
+                        ],
+                    },
+                    {"id": "t2", "players": [{"playerId": "p2", "guesses": []}]},
+                ],
+                "rounds": [
+                    {
+                        "roundNumber": 1,
+                        "panorama": {"lat": 48.9, "lng": 2.4, "countryCode": "fr"},
+                        "startTime": "2024-05-01T12:30:00.000Z",
+                    },
+                    {"roundNumber": 2, "panorama": {"lat": 40.5, "lng": -3.6, "countryCode": "es"}},
+                ],
+            }
+        )
+        if replays:
+            steps = [
+                {"time": 1700000000000, "type": "PanoPosition", "payload": {"lat": 48.9, "lng": 2.4, "panoId": "a"}},
+                {"time": 1700000000500, "type": "PanoZoom", "payload": {"zoom": 1.5}},
+            ]
+            duel.replays = {"p1": [GeoguessrDuelReplay(steps), GeoguessrDuelReplayColumns(steps[:1])], "p2": []}
+        return duel
+
+    def test_upsert_and_query(self, tmp_path):
+        """A duel is stored in the normalized tables and queried through the helpers."""
+        store = DuelStore(str(tmp_path / "duels.sqlite3"))
+        store.upsert_duel(self.duel())
+
+        assert store.has_duel("g1") and store.game_ids() == {"g1"}
+        duels = store.player_duels("p1", since=datetime(2024, 1, 1, tzinfo=timezone.utc))
+        assert [(duel["game_id"], duel["map_slug"], duel["is_winner"]) for duel in duels] == [("g1", "world", 1)]
+        assert store.player_duels("p2")[0]["is_winner"] == 0
+        assert [guess["country_code"] for guess in store.player_guesses("p1")] == ["fr", "es"]
+        assert store.player_guesses("p1", countryCode="es")[0]["score"] == 3000
+        stats = {row["country_code"]: row for row in store.country_stats("p1")}
+        assert stats["fr"]["mean_score"] == 4000 and stats["fr"]["guesses"] == 1
+        steps = store.replay_steps("g1", "p1", 1)
+        assert [(step["type"], step["lat"], step["zoom"]) for step in steps] == [
+            ("PanoPosition", 48.9, None),
+            ("PanoZoom", None, 1.5),
+        ]
+        assert len(store.replay_steps("g1", "p1", 2)) == 1
+        store.close()
+
+    def test_upsert_replaces_by_game_id(self, tmp_path):
+        """Storing a duel again replaces its rows but keeps the replays it does not hold."""
+        store = DuelStore(str(tmp_path / "duels.sqlite3"))
+        store.upsert_duel(self.duel())
+        assert store.upsert_duels([self.duel(score=5000, replays=False)]) == 1
+
+        assert store.query("SELECT COUNT(*) AS count FROM guesses")[0]["count"] == 2
+        assert store.player_guesses("p1")[0]["score"] == 5000
+        assert len(store.replay_steps("g1", "p1", 1)) == 2
+
+        assert store.delete_duel("g1")
+        assert store.query("SELECT COUNT(*) AS count FROM replay_steps")[0]["count"] == 0
+        assert not store.has_duel("g1")
+        store.close()
+
+
+class TestRequestCoalescing:
+    """Test the single-flight deduplication of concurrent GET requests."""
+
+    clubs = "https://www.geoguessr.com/api/v4/clubs/"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_request(self):
+        """Concurrent calls for the same URL send one request, later calls send a new one."""
+        geoguessr = Geoguessr("test_ncfa_token")
+        geoguessr._session = FakeSession({f"{self.clubs}club": (200, {"name": "Club"})})
+
+        clubs = await asyncio.gather(*(geoguessr.get_club_info("club") for _ in range(5)))
+        assert [club.name for club in clubs] == ["Club"] * 5
+        assert geoguessr._session.requested == [f"{self.clubs}club"]
+        assert geoguessr.coalescedRequests == 4
+        assert not geoguessr._inFlight
+
+        await geoguessr.get_club_info("club")
+        assert len(geoguessr._session.requested) == 2
+
+    @pytest.mark.asyncio
+    async def test_coalescing_can_be_disabled(self):
+        """Without coalescing, every call sends its own request."""
+        geoguessr = Geoguessr("test_ncfa_token", coalesceRequests=False)
+        geoguessr._session = FakeSession({f"{self.clubs}club": (200, {"name": "Club"})})
+
+        await asyncio.gather(*(geoguessr.get_club_info("club") for _ in range(3)))
+        assert len(geoguessr._session.requested) == 3
+
+
+class TestJsonBackend:
+    """Test the pluggable JSON decoding of response bodies."""
+
+    clubs = "https://www.geoguessr.com/api/v4/clubs/"
+
+    @pytest.mark.parametrize("backend", json_backend.available_backends())
+    def test_backends_decode_bytes(self, backend):
+        """Every installed backend decodes bytes and str, and raises ValueError on invalid JSON."""
+        loads = json_backend.get_loads(backend)
+
+        assert loads(b'{"name": "Club", "score": [1, 2.5]}') == {"name": "Club", "score": [1, 2.5]}
+        assert loads('{"a": null}') == {"a": None}
+        with pytest.raises(ValueError):
+            loads(b"{not json")
+
+    def test_unknown_backend(self):
+        """An unknown backend name is rejected."""
+        with pytest.raises(ValueError):
+            json_backend.get_loads("simplejson")
+
+    @pytest.mark.asyncio
+    async def test_client_uses_custom_loads(self):
+        """The client decodes response bytes with its jsonLoads function."""
+        decoded = []
+
+        def loads(body):
+            decoded.append(body)
+            return json.loads(body)
+
+        geoguessr = Geoguessr("test_ncfa_token", jsonLoads=loads)
+        geoguessr._session = FakeSession({f"{self.clubs}club": (200, {"name": "Club"})})
+
+        assert (await geoguessr.get_club_info("club")).name == "Club"
+        assert decoded == [b'{"name": "Club"}']
+
+    @pytest.mark.asyncio
+    async def test_client_stdlib_backend(self):
+        """The stdlib backend can be chosen by name."""
+        geoguessr = Geoguessr("test_ncfa_token", jsonLoads="json")
+        geoguessr._session = FakeSession({f"{self.clubs}club": (200, {"name": "Club"})})
+
+        assert geoguessr.jsonLoads is json.loads
+        assert (await geoguessr.get_club_info("club")).name == "Club"
+
+
+def highscore_item(playerId):
+    """Build a minimal highscores entry for a player."""
+    return {
+        "game": {
+            "player": {
+                "id": playerId,
+                "pin": {},
+                "totalScore": {"amount": 100},
+                "totalDistance": {"meters": {"amount": 1, "unit": "km"}},
+                "guesses": [],
+            },
+            "progressChange": {
+                "xpProgressions": [
+                    {"xp": 10, "currentLevel": {}, "currentTitle": {}},
+                    {"xp": 20, "currentLevel": {}, "currentTitle": {}},
+                ]
+            },
+            "bounds": {},
+            "rounds": [],
+        }
+    }
+
+
+class TestGeoguessrChallengeScore:
+    """Test highscores pagination."""
+
+    base = "https://geoguessr.com/api/v3/results/highscores/token?friends=false"
+    challenge = {
+        "roundCount": 5,
+        "challenge": {"timeLimit": 60, "forbidMoving": False, "forbidRotating": False, "forbidZooming": False},
+    }
+
+    def make_client(self, limit=26):
+        geoguessr = Geoguessr("test_ncfa_token")
+        geoguessr._session = FakeSession(
+            {
+                "https://www.geoguessr.com/api/v3/challenges/token": (200, self.challenge),
+                f"{self.base}&limit={limit}&minRounds=5": (
+                    200,
+                    {"items": [highscore_item("a"), highscore_item("b")], "paginationToken": "next=="},
+                ),
+                f"{self.base}&limit={limit}&minRounds=5&paginationToken=next%3D%3D": (
+                    200,
+                    {"items": [highscore_item("c")], "paginationToken": None},
+                ),
+            }
+        )
+        return geoguessr
+
+    @pytest.mark.asyncio
+    async def test_get_challenge_score_follows_pagination(self):
+        """Every page is fetched and the results keep leaderboard order."""
+        results = await self.make_client().get_challenge_score("https://www.geoguessr.com/challenge/token")
+
+        assert [result.player.id for result in results] == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_iter_challenge_score_page_size_and_limit(self):
+        """A custom page size is used, and no page is requested past the limit."""
+        geoguessr = self.make_client(limit=100)
+
+        results = [result async for result in geoguessr.iter_challenge_score("token", pageSize=100, limit=2)]
+
+        assert [result.player.id for result in results] == ["a", "b"]
+        assert not any("paginationToken" in url for url in geoguessr._session.requested)
+
+
+class TestGeoguessrFeedSync:
+    """Test streaming and incremental sync of the activity feed."""
+
+    feed = "https://geoguessr.com/api/v4/feed/private?count=2"
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync_only_yields_new_entries(self, tmp_path):
+        """A second sync with a saved cursor stops at the newest entry of the first one."""
+        entries = [{"time": f"2024-01-0{day}T12:00:00.000Z", "type": 1} for day in (3, 2, 1)]
+        geoguessr = Geoguessr("test_ncfa_token")
+        geoguessr._session = FakeSession(
+            {
+                self.feed: (200, {"entries": entries[:2], "paginationToken": "older"}),
+                f"{self.feed}&paginationToken=older": (200, {"entries": entries[2:], "paginationToken": None}),
+            }
+        )
+        path = str(tmp_path / "cursor.json")
+
+        first = [entry async for entry in geoguessr.iter_activities(GeoguessrFeedCursor.load(path), pageSize=2)]
+
+        newEntry = {"time": "2024-01-04T12:00:00.000Z", "type": 1}
+        geoguessr._session.routes[self.feed] = (200, {"entries": [newEntry, entries[0]], "paginationToken": "older"})
+        cursor = GeoguessrFeedCursor.load(path)
+        second = [entry async for entry in geoguessr.iter_activities(cursor, pageSize=2)]
+
+        assert first == entries
+        assert second == [newEntry]
+        assert cursor.newestTime == "2024-01-04T12:00:00.000Z"
+        assert cursor.paginationToken is None
+
+
+class TestGeoguessrActivities:
+    """Test the parsed activity index."""
+
+    entries = [
+        {"type": 6, "time": "2024-01-02T10:00:00.000Z", "payload": json.dumps({"gameMode": "Duels", "gameId": "d1"})},
+        {
+            "type": 7,
+            "time": "2024-01-01T10:00:00.000Z",
+            "payload": json.dumps(
+                [
+                    {"type": 6, "time": "2024-01-01T10:00:00.000Z", "payload": {"gameMode": "Duels", "gameId": "d2"}},
+                    {
+                        "type": 6,
+                        "time": "2024-01-01T09:00:00.000Z",
+                        "payload": {"gameMode": "TeamDuels", "gameId": "t"},
+                    },
+                    {"type": 2, "time": "2024-01-01T08:00:00.000Z", "payload": {"mapSlug": "world"}},
+                ]
+            ),
+        },
+        {"type": 1, "time": "2024-01-01T07:00:00.000Z"},
+    ]
+
+    def test_filter_by_type_and_game_mode(self):
+        """Grouped entries are split per game and bucketed by type and game mode."""
+        activities = GeoguessrActivities(list(self.entries))
+
+        assert [activity.gameId for activity in activities.ranked_duels()] == ["d1", "d2"]
+        assert [activity.gameId for activity in activities.filter(activityType=6)] == ["d1", "d2", "t"]
+        assert [activity.gameId for activity in activities.filter(gameMode="TeamDuels")] == ["t"]
+        assert len(activities.activities) == 5
+        assert activities.ranked_duels()[0].time.hour == 10
+
+    def test_entries_are_decoded_once(self, monkeypatch):
+        """Entries already indexed are not decoded again, and new entries are picked up."""
+        activities = GeoguessrActivities(list(self.entries[:1]))
+        activities.ranked_duels()
+        calls = []
+        original = GeoguessrActivities._parse_entry
+        monkeypatch.setattr(GeoguessrActivities, "_parse_entry", staticmethod(lambda e: calls.append(e) or original(e)))
+
+        activities.entries.append(self.entries[1])
+        assert len(activities.ranked_duels()) == 2
+        assert len(activities.ranked_duels()) == 2
+        assert calls == [self.entries[1]]
+
+    @pytest.mark.asyncio
+    async def test_get_ranked_duel_activity(self):
+        """The deprecated ranked duels call keeps its historical string format."""
+        geoguessr = Geoguessr("test_ncfa_token")
+        geoguessr.activities = GeoguessrActivities(list(self.entries))
+
+        with pytest.warns(DeprecationWarning):
+            activity = await geoguessr.get_ranked_duel_activity()
+        assert activity == [
+            ("02-01-2024 10:00:00", "https://www.geoguessr.com/duels/d1/summary"),
+            ("01-01-2024 10:00:00", "https://www.geoguessr.com/duels/d2/summary"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_ranked_duel_activities(self):
+        """Ranked duels are the indexed activities, with datetimes."""
+        geoguessr = Geoguessr("test_ncfa_token")
+        geoguessr.activities = GeoguessrActivities(list(self.entries))
+
+        duels = await geoguessr.get_ranked_duel_activities()
+        assert [duel.gameId for duel in duels] == ["d1", "d2"]
+        assert duels[0].time == datetime(2024, 1, 2, 10, tzinfo=timezone.utc)
+        assert duels[0] is (await geoguessr.get_ranked_duel_activities())[0]
+
+
+class TestRateLimitAndRetry:
+    """Test the rate limiter and the retry scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_throttles(self):
+        """Requests beyond the burst capacity wait for new tokens."""
+        bucket = TokenBucket(rate=100, capacity=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(5):
+            await bucket.acquire()
+
+        assert loop.time() - start >= 0.035
+
+    def test_rate_limiter_uses_one_bucket_per_host(self):
+        """Each host gets its own bucket and configured rate."""
+        limiter = RateLimiter({"game-server.geoguessr.com": 5})
+
+        assert limiter.bucket("https://game-server.geoguessr.com/api/duels/x").rate == 5
+        assert limiter.bucket("https://www.geoguessr.com/api/v3/users/x").rate == 10
+        assert limiter.bucket("https://www.geoguessr.com/a") is limiter.bucket("https://www.geoguessr.com/b")
+
+    def test_retry_policy(self):
+        """429 is always retried, server errors only for idempotent methods, Retry-After wins over backoff."""
+        policy = RetryPolicy(maxRetries=2, baseDelay=1, maxDelay=4)
+
+        assert policy.should_retry("POST", 0, 429)
+        assert policy.should_retry("GET", 1, 503)
+        assert not policy.should_retry("POST", 0, 503)
+        assert not policy.should_retry("GET", 0, 404)
+        assert not policy.should_retry("GET", 2, 429)
+        assert policy.delay(0, "3") == 3
+        assert 2 <= policy.delay(2) <= 4
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert parse_retry_after("soon") is None
+
+    @pytest.mark.asyncio
+    async def test_client_retries_rate_limited_requests(self):
+        """A 429 response is retried, and a request still rate limited raises a clear error."""
+        geoguessr = Geoguessr("test_ncfa_token", retryPolicy=RetryPolicy(maxRetries=2, baseDelay=0))
+        clubs = "https://www.geoguessr.com/api/v4/clubs/"
+        geoguessr._session = FakeSession(
+            {
+                f"{clubs}ok": [(429, None, {"Retry-After": "0"}), (200, {"name": "Club"})],
+                f"{clubs}busy": [(429, None, {"Retry-After": "0"})],
+            }
+        )
+
+        assert (await geoguessr.get_club_info("ok")).name == "Club"
+        with pytest.raises(GeoguessrRateLimitError):
+            await geoguessr.get_club_info("busy")
+        assert geoguessr._session.requested.count(f"{clubs}busy") == 3
+
+    @pytest.mark.asyncio
+    async def test_client_without_retry_policy_returns_error_responses(self):
+        """By default, error responses are neither retried nor raised, and the calls return None as before."""
+        geoguessr = Geoguessr("test_ncfa_token")
+        users = "https://www.geoguessr.com/api/v3/users/"
+        geoguessr._session = FakeSession({f"{users}busy": (429, None), f"{users}down": (503, None)})
+
+        assert await geoguessr.get_user_infos("busy", withStats=False) is None
+        assert await geoguessr.get_user_infos("down", withStats=False) is None
+        assert geoguessr._session.requested == [f"{users}busy", f"{users}down"]
+
+
+class TestGeoguessrPool:
+    """Test the multi-account token pool."""
+
+    clubs = "https://www.geoguessr.com/api/v4/clubs/"
+    profile = "https://www.geoguessr.com/api/v3/profiles/"
+
+    @pytest.mark.asyncio
+    async def test_pool_round_robin(self):
+        """Calls are spread over the tokens in turn."""
+        pool = GeoguessrPool(["a", "b"])
+        for token in pool.tokens:
+            token.client._session = FakeSession({f"{self.clubs}club": (200, {"name": "Club"})})
+
+        for _ in range(4):
+            assert (await pool.get_club_info("club")).name == "Club"
+
+        assert [token.requests for token in pool.tokens] == [2, 2]
+        assert all(token.inFlight == 0 for token in pool.tokens)
+        await pool.close()
+
+    def test_pool_least_loaded(self):
+        """The least loaded strategy picks the token with the fewest calls running."""
+        pool = GeoguessrPool(["a", "b", "c"], strategy="least_loaded")
+        pool.tokens[0].inFlight = 2
+        pool.tokens[1].inFlight = 1
+        pool.tokens[2].inFlight = 1
+        pool.tokens[2].requests = 5
+
+        assert pool.pick() is pool.tokens[1]
+        with pytest.raises(ValueError):
+            GeoguessrPool(["a"], strategy="random")
+
+    @pytest.mark.asyncio
+    async def test_pool_removes_rejected_token(self):
+        """A token rejected by the API leaves the rotation and the call is retried on another token."""
+        pool = GeoguessrPool(["expired", "valid"])
+        pool.tokens[0].client._session = FakeSession({f"{self.clubs}club": (401, None), self.profile: (401, None)})
+        pool.tokens[1].client._session = FakeSession({f"{self.clubs}club": (200, {"name": "Club"})})
+
+        assert (await pool.get_club_info("club")).name == "Club"
+        assert not pool.tokens[0].healthy
+        assert pool.healthyTokens == [pool.tokens[1]]
+
+        pool.tokens[1].healthy = False
+        with pytest.raises(RuntimeError):
+            await pool.get_club_info("club")
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_pool_keeps_call_error_when_probe_fails(self):
+        """If the auth probe itself fails, the token stays in rotation and the call raises its own error."""
+        pool = GeoguessrPool(["a"], retryPolicy=RetryPolicy(maxRetries=0))
+        duel = "https://game-server.geoguessr.com/api/duels/g"
+        pool.tokens[0].client._session = FakeSession({duel: (401, None), self.profile: (503, None)})
+
+        with pytest.raises(GeoguessrAuthError):
+            await pool.call("_get_json", duel, Endpoint.DUEL)
+        assert pool.tokens[0].healthy
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_pool_keeps_call_error_when_last_token_is_rejected(self):
+        """When the rejected token was the last healthy one, the call raises its own auth error."""
+        pool = GeoguessrPool(["expired"])
+        duel = "https://game-server.geoguessr.com/api/duels/g"
+        pool.tokens[0].client._session = FakeSession({duel: (401, None), self.profile: (401, None)})
+
+        with pytest.raises(GeoguessrAuthError):
+            await pool.call("_get_json", duel, Endpoint.DUEL)
+        assert not pool.tokens[0].healthy
+        with pytest.raises(RuntimeError):
+            await pool.call("_get_json", duel, Endpoint.DUEL)
+        await pool.close()
+
+
+class TestMockServer:
+    """End-to-end tests of the client against the local mock API server."""
+
+    @pytest.mark.asyncio
+    async def test_client_against_mock_server(self):
+        """Every public call works over HTTP against the fixtures of the mock server."""
+        async with MockGeoguessrServer(MockFixtures(feedEntries=30, highscores=60, replaySteps=20)) as server:
+            geoguessr = Geoguessr("test_ncfa_token", baseUrls=server.base_urls())
+
+            assert await geoguessr.is_authenticated()
+            assert (await geoguessr.get_user_infos("user", withStats=False)).nick == "player user"
+            assert len(await geoguessr.get_challenge_score("https://www.geoguessr.com/challenge/abc")) == 60
+            assert (await geoguessr.get_club_info("club")).memberCount == 50
+            assert len(await geoguessr.get_ranked_duel_activities()) == 10
+            duel = await geoguessr.get_duel_info("duel-1")
+            assert [len(replay.datas) for replay in duel.replays["duel-1-p1"]] == [20] * 5
+            await geoguessr.close()
+
+        assert ("GET", "/api/v4/feed/private?count=1000") in server.requests
+        assert set(server.statuses) == {200}
+
+    @pytest.mark.asyncio
+    async def test_mock_server_faults_are_retried(self):
+        """Injected 429 and 500 responses reach the client, which retries them."""
+        async with MockGeoguessrServer() as server:
+            geoguessr = Geoguessr(
+                "test_ncfa_token", baseUrls=server.base_urls(), retryPolicy=RetryPolicy(maxRetries=2, baseDelay=0)
+            )
+            server.inject("/api/v4/clubs/", 429, retryAfter="0")
+            server.inject("/api/v4/clubs/", 500)
+            assert (await geoguessr.get_club_info("club")).name == "club club"
+            assert server.statuses == {429: 1, 500: 1, 200: 1}
+
+            server.inject("/api/v4/clubs/", 429, times=3, retryAfter="0")
+            with pytest.raises(GeoguessrRateLimitError):
+                await geoguessr.get_club_info("other")
+            await geoguessr.close()
+
+    @pytest.mark.asyncio
+    async def test_mock_server_recorded_fixtures(self, tmp_path):
+        """Recorded responses replace the generated ones."""
+        (tmp_path / "api" / "v4" / "clubs").mkdir(parents=True)
+        (tmp_path / "api" / "v4" / "clubs" / "recorded.json").write_text(json.dumps({"name": "Recorded"}))
+
+        async with MockGeoguessrServer(MockFixtures.from_directory(str(tmp_path))) as server:
+            geoguessr = Geoguessr("test_ncfa_token", baseUrls=server.base_urls())
+            assert (await geoguessr.get_club_info("recorded")).name == "Recorded"
+            assert (await geoguessr.get_club_info("generated")).name == "club generated"
+            await geoguessr.close()
+
+
+class TestInstrumentation:
+    """Test the request hooks and the metrics exporters."""
+
+    def test_histogram_quantiles(self):
+        """Quantiles are interpolated inside the buckets and never exceed the largest value."""
+        histogram = Histogram((0.1, 0.2, 0.5))
+        for value in [0.05] * 50 + [0.15] * 45 + [0.3] * 4 + [2.0]:
+            histogram.observe(value)
+
+        assert histogram.counts == [50, 45, 4, 1]
+        assert histogram.quantile(0.5) == pytest.approx(0.1)
+        assert 0.1 < histogram.quantile(0.95) <= 0.2
+        assert histogram.quantile(1) == 2.0
+        assert math.isnan(Histogram().quantile(0.5))
+
+    @pytest.mark.asyncio
+    async def test_client_reports_every_request(self):
+        """Each call reports its endpoint, status, size, retries and cache hits. A failing hook is ignored."""
+        events = []
+        exporter = HistogramExporter()
+
+        def failing_hook(event):
+            raise RuntimeError("broken hook")
+
+        async with MockGeoguessrServer(MockFixtures(replaySteps=10)) as server:
+            geoguessr = Geoguessr(
+                "test_ncfa_token",
+                cache=ResponseCache(),
+                retryPolicy=RetryPolicy(maxRetries=2, baseDelay=0),
+                baseUrls=server.base_urls(),
+                requestHooks=[events.append, exporter, failing_hook],
+            )
+            server.inject("/api/v4/clubs/", 429, retryAfter="0")
+            await geoguessr.get_club_info("club")
+            await geoguessr.get_club_info("club")
+            await geoguessr.get_duel_info("duel-1")
+            await geoguessr.close()
+
+        club, cachedClub = events[:2]
+        assert (club.endpoint, club.status, club.retries, club.cacheHit) == (Endpoint.CLUB, 200, 1, False)
+        assert club.responseBytes > 0 and club.latency > 0
+        assert cachedClub.cacheHit and cachedClub.responseBytes == 0
+        assert [event.endpoint for event in events[2:]] == [Endpoint.DUEL] + [Endpoint.REPLAY] * 10
+
+        rows = {row["endpoint"]: row for row in exporter.summary()}
+        assert rows[Endpoint.CLUB]["requests"] == 1
+        assert rows[Endpoint.CLUB]["cacheHits"] == 1
+        assert rows[Endpoint.CLUB]["retries"] == 1
+        assert rows[Endpoint.REPLAY]["statuses"] == {200: 10}
+        assert rows[Endpoint.REPLAY]["p50"] <= rows[Endpoint.REPLAY]["p99"] <= rows[Endpoint.REPLAY]["max"]
+        assert Endpoint.REPLAY in exporter.report()
+
+    @pytest.mark.asyncio
+    async def test_session_fetcher_reports_requests(self):
+        """The replay fetcher used without a client reports to its hooks, failed requests included."""
+        events = []
+        async with MockGeoguessrServer() as server, aiohttp.ClientSession() as session:
+            fetch = session_fetcher(session, hooks=[events.append], endpoint=Endpoint.REPLAY)
+            server.inject("/api/replays/", 500)
+            with pytest.raises(aiohttp.ClientResponseError):
+                await fetch(f"{server.url}/api/replays/p1/duel/1")
+            assert len(await fetch(f"{server.url}/api/replays/p1/duel/1")) == 200
+
+        assert [(event.endpoint, event.status, event.error is None) for event in events] == [
+            (Endpoint.REPLAY, 500, False),
+            (Endpoint.REPLAY, 200, True),
+        ]
+
+    def test_prometheus_exporter(self):
+        """Requests are recorded as Prometheus histograms and counters."""
+        prometheus_client = pytest.importorskip("prometheus_client")
+        registry = prometheus_client.CollectorRegistry()
+        exporter = PrometheusExporter(registry)
+        exporter(RequestEvent("GET", "url", Endpoint.CLUB, 200, 1024, 0.2, retries=2))
+        exporter(RequestEvent("GET", "url", Endpoint.CLUB, 200, cacheHit=True))
+
+        labels = {"method": "GET", "endpoint": Endpoint.CLUB, "status": "200"}
+        assert registry.get_sample_value("geoguessr_request_duration_seconds_count", labels) == 1
+        assert registry.get_sample_value("geoguessr_response_bytes_total", labels) == 1024
+        assert registry.get_sample_value("geoguessr_request_retries_total", labels) == 2
+        cacheLabels = {"method": "GET", "endpoint": Endpoint.CLUB}
+        assert registry.get_sample_value("geoguessr_cache_hits_total", cacheLabels) == 1
+
+    def test_opentelemetry_exporter(self):
+        """Requests are recorded on the instruments of the given meter provider."""
+        sdk = pytest.importorskip("opentelemetry.sdk.metrics")
+        export = pytest.importorskip("opentelemetry.sdk.metrics.export")
+        reader = export.InMemoryMetricReader()
+        exporter = OpenTelemetryExporter(sdk.MeterProvider(metric_readers=[reader]))
+        exporter(RequestEvent("GET", "url", Endpoint.CLUB, 200, 1024, 0.2))
+
+        metrics = {
+            metric.name: metric
+            for resource in reader.get_metrics_data().resource_metrics
+            for scope in resource.scope_metrics
+            for metric in scope.metrics
+        }
+        assert metrics["geoguessr.request.duration"].data.data_points[0].count == 1
+        assert metrics["geoguessr.response.size"].data.data_points[0].value == 1024
 
 
 if __name__ == "__main__":